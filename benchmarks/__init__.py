@@ -0,0 +1 @@
+"""Benchmarks for PostPal. Run them from the repository root with ``python -m benchmarks.<name>``."""
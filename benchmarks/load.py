@@ -0,0 +1,190 @@
+"""Offline load test of the generator crews against local stubs.
+
+    python -m benchmarks.load --sessions 4 --runs 2 -o benchmarks/results/baseline.json
+    python -m benchmarks.load --sessions 4 --runs 2 -o after.json --baseline benchmarks/results/baseline.json
+
+Starts the stub OpenAI, Serper and static-site server from
+``benchmarks.stubs``, points PostPal at it through ``OPENAI_BASE_URL`` and
+``POSTPAL_SERPER_URL``, and then, one platform at a time, runs ``--runs``
+generations in each of ``--sessions`` concurrent simulated sessions. Caches
+live in a throwaway directory and every run gets its own topic, so each
+generation does the full amount of work.
+
+Per platform it reports end-to-end latency (p50/p95/max), throughput, and
+per-run LLM round trips, prompt and completion tokens, searches, scrapes,
+images and 429s as counted by the stubs, plus the rate-limit scheduler's
+queueing statistics. Results are written as sorted,
+indented JSON so two runs can be compared with ``--baseline`` or plain
+``diff``.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.stubs import Counters, StubConfig, StubServer
+
+DEFAULT_PLATFORMS = ("blog", "linkedin", "twitter", "instagram")
+# Lower is better for everything except throughput.
+HIGHER_IS_BETTER = {"throughput_per_min"}
+
+
+def _configure_environment(stub_url, cache_dir):
+    # Must happen before postpal.settings is imported.
+    os.environ.update({
+        "OPENAI_API_KEY": "sk-stub",
+        "SERPER_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "POSTPAL_SERPER_URL": f"{stub_url}/search",
+        "POSTPAL_CACHE_DIR": str(cache_dir),
+        "POSTPAL_PREWARM": "0",
+        # CrewAI ships anonymous telemetry; keep the benchmark fully offline.
+        "OTEL_SDK_DISABLED": "true",
+    })
+
+
+def _run_session(run_platform, platform, session, runs, bypass_cache, mode):
+    from postpal import ratelimit
+
+    timings = []
+    for index in range(runs):
+        topic = f"benchmark topic {platform} {session}-{index}"
+        started = time.perf_counter()
+        try:
+            with ratelimit.client(f"bench-{session}"):
+                run_platform(None, platform, topic, bypass_cache, mode=mode)
+        except Exception as e:
+            timings.append({"seconds": time.perf_counter() - started, "error": repr(e)})
+        else:
+            timings.append({"seconds": time.perf_counter() - started})
+    return timings
+
+
+def benchmark_platform(server, platform, sessions, runs, bypass_cache, mode="quality"):
+    from postpal.pipelines import run_platform
+    from postpal.tracing import percentile
+
+    before = server.counters.snapshot()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="postpal-bench") as pool:
+        futures = [
+            pool.submit(_run_session, run_platform, platform, session, runs, bypass_cache, mode)
+            for session in range(sessions)
+        ]
+        timings = [t for future in futures for t in future.result()]
+    wall = time.perf_counter() - started
+    counts = Counters.diff(server.counters.snapshot(), before)
+
+    ok = [t["seconds"] for t in timings if "error" not in t]
+    total = len(timings)
+    result = {
+        "runs": total,
+        "errors": total - len(ok),
+        "wall_s": round(wall, 3),
+        "throughput_per_min": round(len(ok) / wall * 60, 3) if wall else 0.0,
+        "latency_p50_s": round(percentile(ok, 50), 3) if ok else None,
+        "latency_p95_s": round(percentile(ok, 95), 3) if ok else None,
+        "latency_max_s": round(max(ok), 3) if ok else None,
+    }
+    for name in ("llm_requests", "prompt_tokens", "completion_tokens", "searches", "scrapes", "images", "rate_limited"):
+        result[f"{name}_per_run"] = round(counts.get(name, 0) / total, 2)
+    result["llm_requests_by_model"] = {
+        name.split(":", 1)[1]: value for name, value in sorted(counts.items()) if name.startswith("llm_requests:")
+    }
+    errors = sorted({t["error"] for t in timings if "error" in t})
+    if errors:
+        result["error_samples"] = errors[:3]
+    return result
+
+
+def compare(report, baseline):
+    """Print per-metric changes against a previous report."""
+    print(f"\nChanges against baseline ({baseline.get('label') or 'unlabelled'}):")
+    print(f"{'platform':12} {'metric':28} {'baseline':>12} {'now':>12} {'change':>9}")
+    for platform, metrics in report["platforms"].items():
+        old = baseline.get("platforms", {}).get(platform)
+        if not old:
+            continue
+        for name, value in metrics.items():
+            before = old.get(name)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or before == value:
+                continue
+            change = (value - before) / before * 100 if before else float("inf")
+            better = (change > 0) == (name in HIGHER_IS_BETTER)
+            print(f"{platform:12} {name:28} {before:>12} {value:>12} {change:>+8.1f}%{'' if better else ' !'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test of the generator crews.")
+    parser.add_argument("--platforms", default=",".join(DEFAULT_PLATFORMS), help="comma-separated platforms")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent simulated sessions")
+    parser.add_argument("--runs", type=int, default=2, help="generations per session and platform")
+    parser.add_argument("--mode", choices=("quality", "fast"), default="quality", help="pipeline mode to run")
+    parser.add_argument("--use-cache", action="store_true", help="let runs hit the result cache")
+    parser.add_argument("--label", default="", help="free-form label stored with the results")
+    parser.add_argument("-o", "--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous results file")
+    stub = parser.add_argument_group("stub services")
+    stub.add_argument("--llm-latency", type=float, default=0.5, help="seconds before the first token")
+    stub.add_argument("--token-rate", type=float, default=200.0, help="streamed tokens per second")
+    stub.add_argument("--completion-tokens", type=int, default=150, help="words in each final answer")
+    stub.add_argument("--tool-steps", type=int, default=2, help="tool calls per agent that has tools")
+    stub.add_argument("--image-latency", type=float, default=2.0)
+    stub.add_argument("--search-latency", type=float, default=0.3)
+    stub.add_argument("--scrape-latency", type=float, default=0.2)
+    stub.add_argument("--page-words", type=int, default=800, help="article words per scraped page")
+    stub.add_argument("--chat-rpm", type=int, help="answer chat calls beyond this rate with 429s")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        llm_latency=args.llm_latency, token_rate=args.token_rate, completion_tokens=args.completion_tokens,
+        tool_steps=args.tool_steps, image_latency=args.image_latency, search_latency=args.search_latency,
+        scrape_latency=args.scrape_latency, page_words=args.page_words,
+        chat_rpm=args.chat_rpm,
+    )
+    platforms = [p.strip() for p in args.platforms.split(",") if p.strip()]
+
+    with StubServer(config) as server, tempfile.TemporaryDirectory(prefix="postpal-bench-") as cache_dir:
+        _configure_environment(server.url, cache_dir)
+        report = {
+            "label": args.label,
+            "python": sys.version.split()[0],
+            "sessions": args.sessions,
+            "runs_per_session": args.runs,
+            "bypass_cache": not args.use_cache,
+            "mode": args.mode,
+            "stub": config.as_dict(),
+            "platforms": {},
+        }
+        for platform in platforms:
+            print(f"Benchmarking {platform}: {args.sessions} sessions x {args.runs} runs...", file=sys.stderr)
+            report["platforms"][platform] = benchmark_platform(
+                server, platform, args.sessions, args.runs, not args.use_cache, args.mode,
+            )
+
+        from postpal import ratelimit
+
+        report["ratelimit"] = {s["resource"]: s for s in ratelimit.stats()}
+
+    print(f"{'platform':12} {'p50 (s)':>8} {'p95 (s)':>8} {'runs/min':>9} {'LLM calls':>10} {'prompt tok':>11} {'errors':>7}")
+    for platform, r in report["platforms"].items():
+        print(
+            f"{platform:12} {r['latency_p50_s'] or 0:>8.2f} {r['latency_p95_s'] or 0:>8.2f} "
+            f"{r['throughput_per_min']:>9.2f} {r['llm_requests_per_run']:>10.1f} "
+            f"{r['prompt_tokens_per_run']:>11.0f} {r['errors']:>7}"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    if args.baseline:
+        compare(report, json.loads(args.baseline.read_text()))
+    return 1 if any(r["errors"] for r in report["platforms"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Startup benchmark: import cost of the heavy stack and time to first render per page.
+
+    python -m benchmarks.startup --runs 3 --json startup.json --max-render 2.0
+
+Every measurement runs in a fresh interpreter so module caches from one
+measurement never flatter the next. For each page the script is rendered
+with Streamlit's ``AppTest`` (pre-warming disabled) and the benchmark
+checks that CrewAI and LangChain were not imported to draw it. Exits with
+status 1 when a page imports them or renders slower than ``--max-render``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("crewai", "crewai_tools", "langchain_openai", "langchain_core", "openai", "postpal.pipelines")
+
+IMPORT_SNIPPET = """
+import json, sys, time
+started = time.perf_counter()
+try:
+    import {module}
+except Exception as e:
+    print(json.dumps({{"error": repr(e)}}))
+else:
+    print(json.dumps({{"seconds": time.perf_counter() - started}}))
+"""
+
+RENDER_SNIPPET = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+app = AppTest.from_file({path!r}, default_timeout=60).run()
+seconds = time.perf_counter() - started
+heavy = [m for m in {heavy!r} if m in sys.modules]
+errors = [e.value for e in app.exception]
+print(json.dumps({{"seconds": seconds, "heavy_imported": heavy, "exceptions": errors}}))
+"""
+
+
+def _measure(snippet):
+    env = {**os.environ, "POSTPAL_PREWARM": "0"}
+    out = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=ROOT, env=env, capture_output=True, text=True, check=False,
+    )
+    lines = out.stdout.strip().splitlines()
+    if out.returncode != 0 or not lines:
+        return {"error": (out.stderr.strip().splitlines() or ["no output"])[-1]}
+    return json.loads(lines[-1])
+
+
+def import_times(runs):
+    results = {}
+    for module in HEAVY_MODULES:
+        samples = [_measure(IMPORT_SNIPPET.format(module=module)) for _ in range(runs)]
+        seconds = [s["seconds"] for s in samples if "seconds" in s]
+        results[module] = (
+            {"median_s": round(statistics.median(seconds), 3), "runs": len(seconds)}
+            if seconds else {"error": samples[0]["error"]}
+        )
+    return results
+
+
+def render_times(runs):
+    scripts = [ROOT / "streamlit_app.py", *sorted((ROOT / "pages").glob("*.py"))]
+    results = {}
+    for script in scripts:
+        samples = [_measure(RENDER_SNIPPET.format(path=str(script), heavy=HEAVY_MODULES)) for _ in range(runs)]
+        ok = [s for s in samples if "seconds" in s]
+        if not ok:
+            results[script.name] = {"error": samples[0]["error"]}
+            continue
+        results[script.name] = {
+            "median_s": round(statistics.median(s["seconds"] for s in ok), 3),
+            "max_s": round(max(s["seconds"] for s in ok), 3),
+            "heavy_imported": sorted({m for s in ok for m in s["heavy_imported"]}),
+            "exceptions": ok[-1]["exceptions"],
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per measurement")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    parser.add_argument("--max-render", type=float, help="fail when a page's median render exceeds this many seconds")
+    args = parser.parse_args(argv)
+
+    report = {"python": sys.version.split()[0], "imports": import_times(args.runs), "pages": render_times(args.runs)}
+
+    print(f"{'import':40} {'median (s)':>10}")
+    for module, r in report["imports"].items():
+        print(f"{module:40} {r['median_s']:>10.3f}" if "median_s" in r else f"{module:40} {r['error']}")
+    print()
+    print(f"{'page':40} {'median (s)':>10} {'max (s)':>8}  heavy imports")
+    failed = False
+    for page, r in report["pages"].items():
+        if "error" in r:
+            print(f"{page:40} {r['error']}")
+            failed = True
+            continue
+        print(f"{page:40} {r['median_s']:>10.3f} {r['max_s']:>8.3f}  {', '.join(r['heavy_imported']) or '-'}")
+        if r["heavy_imported"] or (args.max_render and r["median_s"] > args.max_render):
+            failed = True
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""Local stand-ins for every external service a generation touches.
+
+One threaded HTTP server answers, on a single port:
+
+- ``POST /v1/chat/completions``: an OpenAI-compatible chat endpoint
+  (streaming and not) that plays a CrewAI agent: it calls each tool offered
+  in the prompt once, search first, then gives a ``Final Answer``.
+- ``POST /v1/images/generations``: returns a URL to ``/images/<n>.png``.
+- ``POST /search``: a Serper-compatible search whose results link to the
+  local static site.
+- ``GET /site/<slug>.html``: article pages wrapped in the usual navigation,
+  cookie banner and footer boilerplate.
+
+Latency, response sizes and an optional chat rate limit (answered with
+429 and ``Retry-After``) are configurable, and every request is counted,
+so a benchmark can report round trips and token volume without touching a
+paid API. Output text is derived from the request, so runs are repeatable.
+"""
+import hashlib
+import json
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "growth platform audience insight data trend market strategy customer signal network brand "
+    "community launch product research model adoption teams workflow future value impact "
+    "story engagement creators reach analysis quality scale privacy open source automation"
+).split()
+
+_TOOL_NAMES = re.compile(r"only one name of \[(.*?)\]")
+# The tool prompt itself contains "Observation: the result of the action".
+_OBSERVATION = re.compile(r"Observation: (?!the result of the action)")
+_URL = re.compile(r"https?://[^\s\"'<>)\]]+")
+
+
+def words(seed, count):
+    """``count`` deterministic filler words derived from ``seed``."""
+    digest = hashlib.sha256(str(seed).encode("utf-8")).digest()
+    return [WORDS[(digest[i % len(digest)] + i * 7) % len(WORDS)] for i in range(count)]
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def _png(size=64, rgb=(70, 130, 180)):
+    """A solid-colour PNG, built by hand so the stub needs no imaging library."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    raw = b"".join(b"\x00" + bytes(rgb) * size for _ in range(size))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+class StubConfig:
+    """Latencies in seconds, sizes in (approximate) tokens or words."""
+
+    def __init__(
+        self,
+        llm_latency=0.5,
+        token_rate=200.0,
+        completion_tokens=150,
+        tool_steps=2,
+        image_latency=2.0,
+        search_latency=0.3,
+        search_results=5,
+        scrape_latency=0.2,
+        page_words=800,
+        chat_rpm=None,
+    ):
+        self.llm_latency = llm_latency
+        self.token_rate = token_rate
+        self.completion_tokens = completion_tokens
+        self.tool_steps = tool_steps
+        self.image_latency = image_latency
+        self.search_latency = search_latency
+        self.search_results = search_results
+        self.scrape_latency = scrape_latency
+        self.page_words = page_words
+        # Answer chat calls beyond this many per minute with a 429, like OpenAI does.
+        self.chat_rpm = chat_rpm
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class Counters:
+    """Thread-safe request and token counters, snapshotted around a benchmark phase."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def add(self, name, amount=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def diff(after, before):
+        return {name: after[name] - before.get(name, 0) for name in after}
+
+
+class StubServer:
+    """Run the stub services on ``127.0.0.1`` in a background thread."""
+
+    def __init__(self, config=None, port=0):
+        self.config = config or StubConfig()
+        self.counters = Counters()
+        self._chat_times = []
+        self._chat_lock = threading.Lock()
+        handler = type("Handler", (_Handler,), {"stub": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="postpal-stubs", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Chat completions ---
+    def over_limit(self):
+        """True when this chat call exceeds ``chat_rpm`` over the last minute."""
+        if not self.config.chat_rpm:
+            return False
+        now = time.monotonic()
+        with self._chat_lock:
+            self._chat_times = [t for t in self._chat_times if t > now - 60]
+            if len(self._chat_times) >= self.config.chat_rpm:
+                self.counters.add("rate_limited")
+                return True
+            self._chat_times.append(now)
+            return False
+
+    def agent_reply(self, prompt):
+        """What a well-behaved CrewAI agent would answer to ``prompt``."""
+        match = _TOOL_NAMES.search(prompt)
+        tools = [name.strip() for name in match.group(1).split(",") if name.strip()] if match else []
+        plan = [name for name in tools if "search" in name.lower()] + [name for name in tools if "website" in name.lower()]
+        plan = (plan or tools[:1])[:self.config.tool_steps]
+        observations = _OBSERVATION.split(prompt)[1:]
+        step = len(observations)
+        last_urls = _URL.findall(observations[-1]) if observations else []
+
+        if step < len(plan):
+            tool = plan[step]
+            if "search" in tool.lower():
+                arguments = {"search_query": " ".join(words(prompt[-200:], 4))}
+            elif "website" in tool.lower():
+                arguments = {"website_url": last_urls[0] if last_urls else f"{self.url}/site/home.html"}
+            else:
+                arguments = {"query": " ".join(words(prompt[-200:], 8))}
+            return f"Thought: I should use {tool}.\nAction: {tool}\nAction Input: {json.dumps(arguments)}"
+
+        body = " ".join(words(prompt, self.config.completion_tokens))
+        if last_urls:
+            body += f" {last_urls[-1]}"
+        return f"Thought: I now can give a great answer\nFinal Answer: {body} #growth #data #future"
+
+    def chat(self, request):
+        prompt = "\n".join(
+            m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+            for m in request.get("messages", [])
+        )
+        model = request.get("model", "gpt-4o")
+        reply = self.agent_reply(prompt)
+        self.counters.add("llm_requests")
+        self.counters.add(f"llm_requests:{model}")
+        self.counters.add("prompt_tokens", estimate_tokens(prompt))
+        self.counters.add("completion_tokens", estimate_tokens(reply))
+        return model, reply, estimate_tokens(prompt)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    stub = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send(self, status, body, content_type="application/json"):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        path = self.path.split("?")[0]
+        if path.endswith("/chat/completions"):
+            return self._chat(self._body())
+        if path.endswith("/images/generations"):
+            return self._image(self._body())
+        if path == "/search":
+            return self._search(self._body())
+        self._send(404, {"error": {"message": f"no stub for {path}"}})
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path.startswith("/images/"):
+            return self._send(200, _png(), "image/png")
+        if path.startswith("/site/"):
+            return self._page(path)
+        self._send(404, {"error": {"message": f"no stub for {path}"}})
+
+    def _chat(self, request):
+        config = self.stub.config
+        if self.stub.over_limit():
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Type", "application/json")
+            body = json.dumps({"error": {"message": "Rate limit reached", "type": "requests"}}).encode("utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        model, reply, prompt_tokens = self.stub.chat(request)
+        time.sleep(config.llm_latency)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        if not request.get("stream"):
+            time.sleep(estimate_tokens(reply) / config.token_rate)
+            return self._send(200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens, "completion_tokens": estimate_tokens(reply),
+                    "total_tokens": prompt_tokens + estimate_tokens(reply),
+                },
+            })
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta, finish_reason=None):
+            chunk = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        event({"role": "assistant", "content": ""})
+        for piece in re.findall(r"\S+\s*|\s+", reply):
+            time.sleep(1 / config.token_rate)
+            event({"content": piece})
+        event({}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _image(self, request):
+        self.stub.counters.add("images")
+        time.sleep(self.stub.config.image_latency)
+        name = hashlib.sha256(request.get("prompt", "").encode("utf-8")).hexdigest()[:16]
+        self._send(200, {
+            "created": int(time.time()),
+            "data": [{"url": f"{self.stub.url}/images/{name}.png", "revised_prompt": request.get("prompt", "")}],
+        })
+
+    def _search(self, request):
+        self.stub.counters.add("searches")
+        time.sleep(self.stub.config.search_latency)
+        query = request.get("q", "")
+        slug = hashlib.sha256(query.encode("utf-8")).hexdigest()[:8]
+        self._send(200, {
+            "searchParameters": {"q": query},
+            "organic": [
+                {
+                    "title": " ".join(words(f"{query}|{i}", 6)).title(),
+                    "link": f"{self.stub.url}/site/{slug}-{i}.html",
+                    "snippet": " ".join(words(f"{query}|snippet|{i}", 25)),
+                    "position": i + 1,
+                }
+                for i in range(self.stub.config.search_results)
+            ],
+        })
+
+    def _page(self, path):
+        self.stub.counters.add("scrapes")
+        time.sleep(self.stub.config.scrape_latency)
+        slug = path.rsplit("/", 1)[-1].removesuffix(".html")
+        paragraphs = [
+            " ".join(words(f"{slug}|{i}", 80))
+            for i in range(max(1, self.stub.config.page_words // 80))
+        ]
+        html = (
+            "<html><head><title>{title}</title></head><body>"
+            "<nav><a href='/'>Home</a> <a href='/about'>About</a> <a href='/blog'>Blog</a> <a href='/contact'>Contact</a></nav>"
+            "<div class='cookie'>We use cookies to improve your experience. Accept all cookies?</div>"
+            "<article><h1>{title}</h1>{body}</article>"
+            "<aside>Subscribe to our newsletter for weekly updates.</aside>"
+            "<footer>Copyright 2024 Example Media. All rights reserved. Privacy policy. Terms of use.</footer>"
+            "</body></html>"
+        ).format(title=" ".join(words(slug, 6)).title(), body="".join(f"<p>{p}</p>" for p in paragraphs))
+        self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
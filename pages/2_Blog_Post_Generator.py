@@ -1,8 +1,6 @@
 import streamlit as st
-from crewai import Agent, Task, Crew
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool
-import os
-from langchain_openai import ChatOpenAI
+from postpal.ui import cache_controls, current_job, mode_controls, poll_job, rerun_controls, run_summary, show_agent_log, show_task_outputs, streaming_controls, submit_generation
+from postpal.warmup import prewarm
 
 # --- Page Config ---
 st.set_page_config(page_title="Blog Post Generator", page_icon="✍️")
@@ -10,98 +8,44 @@ st.set_page_config(page_title="Blog Post Generator", page_icon="✍️")
 st.title("✍️ Blog Post Generator")
 st.markdown("This tool uses a team of AI agents to research, write, and edit a blog post on any topic.")
 
+prewarm()
+
 # --- Streamlit UI ---
 with st.sidebar:
     st.markdown("This tool uses a team of AI agents to research, write, and edit a blog post on any topic")
 
+bypass_cache = cache_controls()
+stream_output = streaming_controls()
+mode = mode_controls()
+
 topic = st.text_input("Enter the topic for your blog post:", placeholder="e.g., The Future of Artificial Intelligence")
 
-if st.button("Generate Blog Post"):
+job = current_job("blog")
+
+if st.button("Generate Blog Post", disabled=bool(job and job.active)):
     if not topic:
         st.error("Please enter a topic for the blog post.")
     else:
-        openai_api_key = st.secrets["openai_api_key"]
-        os.environ['OPENAI_API_KEY'] = openai_api_key
-        serper_api_key = st.secrets["serper_api_key"]
-        os.environ['SERPER_API_KEY'] = serper_api_key
-        llm = ChatOpenAI(model="gpt-4o", temperature=0, api_key=openai_api_key)
-        serper_tool_top5 = SerperDevTool(n_results=2)
-        scrape_tool = ScrapeWebsiteTool()
-
-        with st.spinner("AI agents are crafting your blog post... This may take a moment."):
-            # --- Agents ---
-            planner = Agent(
-                role="Content Planner",
-                goal=f"Plan engaging content on {topic}",
-                backstory=f"You are a content planner focused on {topic}. You gather information to inform the audience. Your plan guides the writer.",
-                tools=[serper_tool_top5, scrape_tool],
-                allow_delegation=False,
-                verbose=True,
-                llm=llm
-            )
-
-            writer = Agent(
-                role="Content Writer",
-                goal=f"Write an opinion piece about {topic}",
-                backstory=f"You are a writer creating an opinion piece on {topic}, based on the content plan. You aim for insightful and balanced writing, distinguishing opinions from facts.",
-                tools=[serper_tool_top5, scrape_tool],
-                allow_delegation=False,
-                verbose=True,
-                llm=llm
-            )
-
-            editor = Agent(
-                role="Editor",
-                goal="Edit a blog post for style and accuracy.",
-                backstory="You are an editor reviewing blog posts for quality, balance, and adherence to guidelines.",
-                allow_delegation=False,
-                verbose=True,
-                llm=llm
-            )
-
-            # --- Tasks ---
-            plan_task = Task(
-                description=(
-                    f"1. Gather key trends, players, and news on {topic}."
-                    "2. Identify the target audience."
-                    "3. Develop a concise content outline (under 100 words)."
-                    "4. Include SEO keywords and relevant data."
-                ),
-                expected_output="A concise content plan with an outline, audience analysis, SEO keywords, and key resources (under 100 words).",
-                agent=planner,
-            )
-
-            write_task = Task(
-                description=(
-                    "Draft a blog post on {topic} using the content plan." # Simplified
-                    "Incorporate SEO keywords."
-                    "Use engaging titles and structure: intro, body, conclusion." # Simplified structure
-                    "Proofread for errors and brand voice."
-                ),
-                expected_output="A well-written blog post in markdown (under 400 words), "
-                    "ready for publication, with distinct sections (e.g., one paragraph per section).", # Simplified section description
-                agent=writer,
-            )
-
-            edit_task = Task(
-                description="Proofread the blog post for grammar, style, and brand voice.",
-                expected_output="A final, proofread blog post in markdown format, ready for publication.",
-                agent=editor,
-            )
-
-            # --- Crew ---
-            crew = Crew(
-                agents=[planner, writer, editor],
-                tasks=[plan_task, write_task, edit_task],
-                verbose=2
-            )
-
-            try:
-                result = crew.kickoff(inputs={"topic": topic})
-
-                st.success("Your blog post has been generated!")
-                st.markdown(result)
-
-            except Exception as e:
-                st.error(f"An error occurred during the kickoff process: {e}")
-
+        job = submit_generation("blog", f"Blog post: {topic}", "run_platform", "blog", topic, bypass_cache, mode=mode) or job
+
+if job:
+    if stream_output:
+        show_task_outputs(job)
+    show_agent_log()
+    poll_job(job)
+    if job.error:
+        st.error(f"An error occurred during the kickoff process: {job.error}")
+    else:
+        if job.result["from_cache"]:
+            st.info("Served from cache. Tick \"Bypass cache\" in the sidebar to regenerate.")
+        st.caption(run_summary(job.result))
+        st.success("Your blog post has been generated!")
+        st.markdown(job.result["result"])
+        rerun = rerun_controls("blog", job.result)
+        if rerun:
+            topic = job.result["topic"]
+            if submit_generation(
+                "blog", f"Blog post ({rerun}): {topic}", "run_platform", "blog", topic, bypass_cache,
+                mode=job.result["mode"], rerun=rerun, previous=job.result,
+            ):
+                st.rerun()
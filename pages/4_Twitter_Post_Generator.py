@@ -1,8 +1,9 @@
 import streamlit as st
-from crewai import Agent, Task, Crew
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool
-import os
-from langchain_openai import ChatOpenAI
+from postpal.ui import (
+    cache_controls, current_job, mode_controls, poll_job, run_summary, show_agent_log, show_task_outputs, show_variants,
+    streaming_controls, submit_generation, variant_controls,
+)
+from postpal.warmup import prewarm
 
 # --- Page Config ---
 st.set_page_config(page_title="Twitter Post Generator", page_icon="🐦")
@@ -10,82 +11,47 @@ st.set_page_config(page_title="Twitter Post Generator", page_icon="🐦")
 st.title("🐦 Twitter Post Generator")
 st.markdown("This tool uses AI agents to generate a tweet on any topic.")
 
+prewarm()
+
 # --- Streamlit UI ---
 with st.sidebar:
     st.markdown("This tool uses AI agents to generate a tweet on any topic")
-   
+
+bypass_cache = cache_controls()
+stream_output = streaming_controls()
+mode = mode_controls()
+variants = variant_controls()
+
 topic = st.text_input("Enter the topic for your tweet:", placeholder="e.g., The latest news on electric cars")
 
-if st.button("Generate Tweet"):
+job = current_job("twitter")
+
+if st.button("Generate Tweet", disabled=bool(job and job.active)):
     if not topic:
         st.error("Please enter a topic for the tweet.")
     else:
-        openai_api_key = st.secrets["openai_api_key"]
-        os.environ['OPENAI_API_KEY'] = openai_api_key
-        serper_api_key = st.secrets["serper_api_key"]
-        os.environ['SERPER_API_KEY'] = serper_api_key
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=openai_api_key)
-        search_tool = SerperDevTool()
-        scrape_tool = ScrapeWebsiteTool()
-
-        with st.spinner("AI agents are crafting your tweet..."):
-            # --- Agents ---
-            tweet_agent = Agent(
-                name='Tweet Strategist',
-                role='Social Media Expert',
-                goal=f"Write concise, punchy tweets on {topic} that resonate with the target audience and encourage high engagement.",
-                backstory=(
-                    f"You are a seasoned Twitter expert creating a tweet on {topic}. "
-                    "You specialize in distilling complex ideas into sharp, witty, or emotionally resonant tweets under 280 characters. "
-                    "You work with the Hashtag Analyst to ensure your tweets are discoverable."
-                ),
-                tools=[search_tool, scrape_tool],
-                allow_delegation=False,
-                llm=llm,
-                verbose=True
-            )
-
-            trend_agent = Agent(
-                name='Hashtag & Trending Topic Analyst',
-                role='Trend Analyst',
-                goal="Identify high-traffic hashtags to enhance the discoverability of tweets created by the Tweet Strategist.",
-                backstory=(
-                    "You're a data-savvy analyst monitoring Twitter trends and hashtag performance. "
-                    "You support the Tweet Strategist by ensuring their content aligns with trending themes and uses hashtags that maximize reach."
-                ),
-                allow_delegation=False,
-                tools=[search_tool, scrape_tool],
-                llm=llm,
-                verbose=True
-            )
-
-            # --- Tasks ---
-            task_tweets = Task(
-                description=f"Generate a concise, impactful tweet on {topic} that hooks readers and aligns with current engagement styles. Attach a relevant, functional link.",
-                agent=tweet_agent,
-                expected_output="A concise and impactful tweet (under 280 characters) with a relevant, functional link."
-            )
-
-            task_trending = Task(
-                description="Analyze Twitter trends for the tweet created by the tweet agent and suggest relevant hashtags and themes.",
-                agent=trend_agent,
-                expected_output="A list of 3-5 relevant hashtags to append to the tweet.",
-                context=[task_tweets]
-            )
-
-            # --- Crew ---
-            twitter_crew = Crew(
-                agents=[tweet_agent, trend_agent],
-                tasks=[task_tweets, task_trending],
-                verbose=2
-            )
-
-            try:
-                result = twitter_crew.kickoff(inputs={"topic": topic})
-                st.success("Your tweet has been generated!")
-                st.markdown("### Final Tweet:")
-                st.markdown(result)
-                
-            except Exception as e:
-                st.error(f"An error occurred during the kickoff process: {e}")
-
+        if variants > 1:
+            job = submit_generation(
+                "twitter", f"Tweet variants: {topic}", "run_variants", "twitter", topic, variants, bypass_cache,
+            ) or job
+        else:
+            job = submit_generation("twitter", f"Tweet: {topic}", "run_platform", "twitter", topic, bypass_cache, mode=mode) or job
+
+if job:
+    if stream_output:
+        show_task_outputs(job)
+    show_agent_log()
+    poll_job(job)
+    if job.error:
+        st.error(f"An error occurred during the kickoff process: {job.error}")
+    else:
+        if job.result["from_cache"]:
+            st.info("Served from cache. Tick \"Bypass cache\" in the sidebar to regenerate.")
+        st.caption(run_summary(job.result))
+        if job.result.get("variants"):
+            st.success(f"{len(job.result['variants'])} tweet variants have been generated!")
+            show_variants(job.result)
+        else:
+            st.success("Your tweet has been generated!")
+            st.markdown("### Final Tweet:")
+            st.markdown(job.result["result"])
@@ -0,0 +1,85 @@
+import streamlit as st
+from postpal.platforms import PLATFORM_LABELS, PLATFORMS
+from postpal.ui import cache_controls, current_job, mode_controls, poll_job, run_summary, show_agent_log, show_image, show_task_outputs, streaming_controls, submit_generation
+from postpal.warmup import prewarm
+
+# --- Page Config ---
+st.set_page_config(page_title="All Platforms Generator", page_icon="🚀")
+
+st.title("🚀 All Platforms Generator")
+st.markdown(
+    "This tool researches a topic once, then writes a blog post, LinkedIn post, tweet and Instagram post "
+    "for it in parallel. Each result appears as soon as it is ready."
+)
+
+prewarm()
+
+# --- Streamlit UI ---
+with st.sidebar:
+    st.markdown("This tool researches a topic once and generates content for every platform in parallel")
+
+bypass_cache = cache_controls()
+stream_output = streaming_controls()
+mode = mode_controls()
+
+topic = st.text_input("Enter the topic for your posts:", placeholder="e.g., The Future of Artificial Intelligence")
+platforms = st.multiselect(
+    "Platforms",
+    options=list(PLATFORMS),
+    default=list(PLATFORMS),
+    format_func=PLATFORM_LABELS.get,
+)
+
+job = current_job("all")
+
+if st.button("Generate for All Platforms", disabled=bool(job and job.active)):
+    if not topic:
+        st.error("Please enter a topic for the posts.")
+    elif not platforms:
+        st.error("Please select at least one platform.")
+    else:
+        job = submit_generation(
+            "all", f"All platforms: {topic}", "run_all_platforms", topic, tuple(platforms), bypass_cache, mode,
+        ) or job
+
+
+def render_output(platform, output):
+    if "error" in output:
+        st.error(f"An error occurred while generating this post: {output['error']}")
+        return
+    st.caption(run_summary(output) + (" · served from cache" if output["from_cache"] else ""))
+    if platform == "instagram":
+        show_image(output)
+        st.markdown(output["caption"])
+    else:
+        st.markdown(output["result"])
+
+
+if job:
+    if job.error:
+        st.error(f"An error occurred during the kickoff process: {job.error}")
+    elif not job.active:
+        st.success("Your posts have been generated!")
+
+    if stream_output:
+        show_task_outputs(job)
+
+    if "research" in job.outputs:
+        source = job.outputs["research"].get("research_reused_from")
+        if source:
+            st.info(
+                f"Reused the research for \"{source['topic']}\" (similarity {source['similarity']:.2f}). "
+                "Tick \"Bypass cache\" in the sidebar to research this topic from scratch."
+            )
+        with st.expander("Shared research notes"):
+            if job.outputs["research"].get("scrape_tokens_saved"):
+                st.caption(f"{job.outputs['research']['scrape_tokens_saved']:,} scraped tokens trimmed")
+            st.markdown(job.outputs["research"]["research"])
+
+    for platform in PLATFORMS:
+        if platform in job.outputs:
+            st.subheader(PLATFORM_LABELS[platform])
+            render_output(platform, job.outputs[platform])
+
+    show_agent_log()
+    poll_job(job)
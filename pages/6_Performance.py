@@ -0,0 +1,98 @@
+import streamlit as st
+import altair as alt
+import pandas as pd
+from datetime import datetime
+from postpal.ratelimit import stats as rate_limit_stats
+from postpal.tracing import prometheus_text, trace_store
+
+# --- Page Config ---
+st.set_page_config(page_title="Performance", page_icon="📈")
+
+st.title("📈 Performance")
+st.markdown("Latency, token usage and cost of past generation runs, and a timeline of where a single run spent its time.")
+
+# --- Streamlit UI ---
+with st.sidebar:
+    st.markdown("Every generation is traced: tasks, agent steps, LLM calls, searches, scrapes and image generations")
+
+store = trace_store()
+
+st.subheader("Per page")
+stats = store.page_stats()
+if not stats:
+    st.info("No runs have been traced yet. Generate something first.")
+    st.stop()
+
+scrapes = {s["page"]: s for s in store.scrape_stats()}
+for s in stats:
+    s["scrape_tokens_saved"] = scrapes[s["page"]]["tokens_raw"] - scrapes[s["page"]]["tokens_kept"] if s["page"] in scrapes else 0
+st.dataframe(
+    pd.DataFrame(stats).drop(columns=["duration_sum_s"]).rename(columns={
+        "page": "Page", "runs": "Runs", "errors": "Errors", "p50_s": "p50 (s)", "p95_s": "p95 (s)",
+        "prompt_tokens": "Prompt tokens", "completion_tokens": "Completion tokens", "cost_usd": "Cost (USD)",
+        "scrape_tokens_saved": "Scrape tokens saved",
+    }),
+    hide_index=True,
+    use_container_width=True,
+)
+
+st.subheader("Rate limits")
+limits = rate_limit_stats()
+if limits:
+    st.caption("OpenAI and Serper calls made by this server process, queued to stay under each model's limits.")
+    st.dataframe(
+        pd.DataFrame(limits).drop(columns=["wait_seconds"]).rename(columns={
+            "resource": "Model / service", "queue_depth": "Waiting now", "granted": "Calls",
+            "rate_limited": "429s", "avg_wait_s": "Avg wait (s)", "max_wait_s": "Max wait (s)",
+        }),
+        hide_index=True,
+        use_container_width=True,
+    )
+else:
+    st.caption("No rate-limited calls have been made by this server process yet.")
+
+st.subheader("Single run")
+runs = store.recent_runs(limit=100)
+run = st.selectbox(
+    "Run",
+    runs,
+    format_func=lambda r: (
+        f"{datetime.fromtimestamp(r['start']):%Y-%m-%d %H:%M:%S} · {r['page']} · {r['topic']} · "
+        f"{r['duration']:.1f}s{' · failed' if r['status'] != 'ok' else ''}"
+    ),
+)
+
+spans = store.spans(run["run_id"])
+scraped = [s["attrs"] for s in spans if s["name"] == "website scrape" and "tokens_raw" in s["attrs"]]
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Duration", f"{run['duration']:.1f}s")
+col2.metric("Tokens", f"{run['prompt_tokens'] + run['completion_tokens']:,}")
+col3.metric("Estimated cost", f"${run['cost_usd']:.4f}")
+col4.metric("Scrape tokens saved", f"{sum(a['tokens_raw'] - a['tokens_kept'] for a in scraped):,}")
+
+waterfall = pd.DataFrame([
+    {
+        "span": f"{i + 1}. {s['kind']}: {s['name']}",
+        "kind": s["kind"],
+        "start_s": s["start"] - run["start"],
+        "end_s": s["end"] - run["start"],
+        "duration_s": round(s["duration"], 3),
+        "tokens": s["attrs"].get("prompt_tokens", 0) + s["attrs"].get("completion_tokens", 0),
+        "order": i,
+    }
+    for i, s in enumerate(spans)
+])
+chart = alt.Chart(waterfall).mark_bar().encode(
+    x=alt.X("start_s:Q", title="Seconds since start"),
+    x2="end_s:Q",
+    y=alt.Y("span:N", sort=alt.EncodingSortField("order"), title=None),
+    color="kind:N",
+    tooltip=["span", "duration_s", "tokens"],
+).properties(height=max(200, 22 * len(waterfall)))
+st.altair_chart(chart, use_container_width=True)
+
+st.subheader("Prometheus export")
+metrics = prometheus_text(store)
+st.download_button("Download metrics", metrics, file_name="postpal.prom", mime="text/plain")
+with st.expander("Preview"):
+    st.code(metrics, language="text")
@@ -0,0 +1,105 @@
+import streamlit as st
+from datetime import datetime, time, timedelta
+from postpal.history import history
+from postpal.platforms import PLATFORM_LABELS, PLATFORMS
+from postpal.settings import HISTORY_PAGE_SIZE
+from postpal.ui import show_image
+
+# --- Page Config ---
+st.set_page_config(page_title="History", page_icon="🗂️")
+
+st.title("🗂️ History")
+st.markdown("Every post generated on the other pages, searchable. Opening one reads it from disk; nothing is regenerated.")
+
+store = history()
+
+# --- Opened entry ---
+entry_id = st.session_state.get("postpal_history_entry") or st.query_params.get("entry")
+entry = None
+if entry_id:
+    try:
+        entry = store.get(int(entry_id))
+    except (ValueError, OverflowError):
+        entry = None
+    if entry is None:
+        # A hand-edited or stale URL: say so and fall back to the list.
+        st.session_state.pop("postpal_history_entry", None)
+        st.query_params.pop("entry", None)
+        st.warning("That history entry was not found.")
+
+if entry is not None:
+    if st.button("← Back to results"):
+        st.session_state.pop("postpal_history_entry", None)
+        st.query_params.pop("entry", None)
+        st.rerun()
+
+    st.subheader(entry["topic"])
+    st.caption(
+        f"{PLATFORM_LABELS.get(entry['platform'], entry['platform'])} · "
+        f"{datetime.fromtimestamp(entry['created_at']):%Y-%m-%d %H:%M} · {entry['model']} · "
+        f"{entry['mode']} mode · {entry['timings'].get('total_s', 0):.1f}s"
+    )
+    if entry["platform"] == "instagram":
+        show_image(entry)
+    st.markdown(entry["text"])
+    st.download_button("Download text", entry["text"], file_name=f"{entry['platform']}-{entry['id']}.md")
+
+    if entry["extra"].get("research"):
+        with st.expander("Shared research"):
+            st.markdown(entry["extra"]["research"])
+    for task in entry["tasks"]:
+        seconds = f" ({task['seconds']:.1f}s)" if task.get("seconds") is not None else ""
+        with st.expander(f"{task['task']}{seconds}"):
+            st.markdown(task["output"])
+    st.stop()
+
+# --- Streamlit UI ---
+with st.sidebar:
+    st.markdown("Filter the history")
+    platforms = st.multiselect("Platforms", PLATFORMS, format_func=PLATFORM_LABELS.get)
+    dates = st.date_input("Created between", value=(), format="YYYY-MM-DD")
+
+query = st.text_input("Search topics and posts:", placeholder="e.g., artificial intelligence")
+
+since = until = None
+if len(dates) >= 1:
+    since = datetime.combine(dates[0], time.min).timestamp()
+if len(dates) == 2:
+    until = datetime.combine(dates[1] + timedelta(days=1), time.min).timestamp()
+filters = {"query": query, "platforms": platforms, "since": since, "until": until}
+
+# Keyset pagination: remember the last id of every page seen so far.
+if st.session_state.get("postpal_history_filters") != filters:
+    st.session_state["postpal_history_filters"] = filters
+    st.session_state["postpal_history_pages"] = [None]
+pages = st.session_state["postpal_history_pages"]
+
+total = store.count(**filters)
+results = store.search(**filters, before=pages[-1], limit=HISTORY_PAGE_SIZE)
+if not results:
+    st.info("Nothing matches these filters." if total else "Nothing has been generated yet.")
+    st.stop()
+
+first = (len(pages) - 1) * HISTORY_PAGE_SIZE + 1
+st.caption(f"Showing {first}–{first + len(results) - 1} of {total:,}")
+
+for result in results:
+    with st.container(border=True):
+        st.caption(
+            f"{datetime.fromtimestamp(result['created_at']):%Y-%m-%d %H:%M} · "
+            f"{PLATFORM_LABELS.get(result['platform'], result['platform'])} · {result['model']}"
+        )
+        st.markdown(f"**{result['topic']}**")
+        st.write(result["preview"] + ("…" if len(result["preview"]) >= 240 else ""))
+        if st.button("Open", key=f"open_{result['id']}"):
+            st.session_state["postpal_history_entry"] = result["id"]
+            st.query_params["entry"] = str(result["id"])
+            st.rerun()
+
+col1, col2 = st.columns(2)
+if col1.button("← Newer", disabled=len(pages) == 1):
+    pages.pop()
+    st.rerun()
+if col2.button("Older →", disabled=first + len(results) - 1 >= total):
+    pages.append(results[-1]["id"])
+    st.rerun()
@@ -0,0 +1 @@
+"""Shared building blocks for the PostPal generator pages."""
@@ -0,0 +1,206 @@
+"""Structured log of what the crews do, written off the generation threads.
+
+Replaces CrewAI's ``verbose`` console output. Task starts and ends, tool
+calls, LLM calls and job failures are logged as records with the session,
+page and task they belong to. What CrewAI and crewai_tools print regardless
+of ``verbose`` (tool results and errors, "Using Tool: ...") is captured
+into the same log by ``capture_crewai_output``. Records go to:
+
+- a ring buffer per session, shown on the pages in an "Agent log" expander;
+- a bounded queue drained by a background thread, which writes JSON lines
+  to a rotating file (and, at ``LOG_CONSOLE_LEVEL``, to stderr). When the
+  queue is full records are dropped and counted, so a generation never
+  waits for log I/O.
+
+Levels: INFO has one line per task, tool call and failure; DEBUG adds
+LLM calls, tool observations and final answers, cut to ``LOG_MAX_CHARS``.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from postpal import events, settings, tracing
+
+logger = logging.getLogger("postpal.agents")
+
+current_session = contextvars.ContextVar("postpal_log_session", default=None)
+
+_COLORS = re.compile(r"\033\[[0-9;]*m")
+
+
+def _clip(text):
+    text = str(text)
+    if len(text) <= settings.LOG_MAX_CHARS:
+        return text
+    return f"{text[:settings.LOG_MAX_CHARS]}… ({len(text) - settings.LOG_MAX_CHARS} more characters)"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SessionBuffers(logging.Handler):
+    """The latest ``lines`` records of each of the ``sessions`` most recently active sessions."""
+
+    def __init__(self, lines, sessions):
+        super().__init__()
+        self.lines = lines
+        self.sessions = sessions
+        self._buffers = OrderedDict()
+
+    def emit(self, record):
+        fields = getattr(record, "fields", {})
+        session = fields.get("session")
+        if session is None:
+            return
+        where = f" [{fields['task']}]" if fields.get("task") else ""
+        line = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname:7}{where} {record.getMessage()}"
+        with self.lock:
+            buffer = self._buffers.get(session)
+            if buffer is None:
+                buffer = self._buffers[session] = deque(maxlen=self.lines)
+                while len(self._buffers) > self.sessions:
+                    self._buffers.popitem(last=False)
+            else:
+                self._buffers.move_to_end(session)
+            buffer.append(line)
+
+    def get(self, session):
+        with self.lock:
+            return list(self._buffers.get(session, ()))
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread, dropping them when its queue is full."""
+
+    def __init__(self, size):
+        super().__init__(queue.Queue(maxsize=size))
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_buffers = None
+_queue_handler = None
+_configure_lock = threading.Lock()
+
+
+def _configure():
+    global _buffers, _queue_handler
+    with _configure_lock:
+        if _buffers is not None:
+            return
+        logger.setLevel(settings.LOG_LEVEL)
+        logger.propagate = False
+
+        settings.LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE, maxBytes=settings.LOG_MAX_BYTES, backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(JsonFormatter())
+        writers = [file_handler]
+        if settings.LOG_CONSOLE_LEVEL != "OFF":
+            console = logging.StreamHandler()
+            console.setLevel(settings.LOG_CONSOLE_LEVEL)
+            console.setFormatter(JsonFormatter())
+            writers.append(console)
+
+        queue_handler = BoundedQueueHandler(settings.LOG_QUEUE_SIZE)
+        listener = logging.handlers.QueueListener(queue_handler.queue, *writers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        buffers = SessionBuffers(settings.LOG_BUFFER_LINES, settings.LOG_BUFFER_SESSIONS)
+        logger.addHandler(buffers)
+        logger.addHandler(queue_handler)
+        _buffers, _queue_handler = buffers, queue_handler
+
+
+def log(level, message, **fields):
+    """Log ``message`` for the calling run; ``fields`` are stored with it."""
+    if _buffers is None:
+        _configure()
+    if not logger.isEnabledFor(level):
+        return
+    trace = tracing.current_trace.get()
+    context = {
+        "session": current_session.get(),
+        "page": trace.page if trace else None,
+        "run_id": trace.run_id if trace else None,
+        "task": events.current_task.get(),
+    }
+    logger.log(level, message, extra={"fields": {**context, **fields}})
+
+
+def session_lines(session):
+    """The buffered log lines of ``session``, oldest first."""
+    if _buffers is None:
+        _configure()
+    return _buffers.get(session)
+
+
+def dropped():
+    """Records dropped because the writer could not keep up."""
+    return _queue_handler.dropped if _queue_handler else 0
+
+
+# --- Crew events ---
+def _on_event(event):
+    if event["type"] == "task_started":
+        log(logging.INFO, "task started", task=event["task"])
+    elif event["type"] == "task_finished":
+        log(logging.INFO, "task finished", task=event["task"])
+        log(logging.DEBUG, f"task output: {_clip(event['output'])}", task=event["task"])
+
+
+events.add_listener(_on_event)
+
+
+def log_step(step_output):
+    """Log an agent step as passed to a crew's ``step_callback``."""
+    if not isinstance(step_output, list):
+        log(logging.DEBUG, f"final answer: {_clip(getattr(step_output, 'return_values', {}).get('output', ''))}")
+        return
+    for action, observation in step_output:
+        tool = getattr(action, "tool", None)
+        if tool is None:
+            continue
+        log(logging.INFO, f"tool {tool}: {_clip(getattr(action, 'tool_input', ''))}", tool=tool)
+        log(logging.DEBUG, f"observation: {_clip(observation)}", tool=tool)
+
+
+def capture_crewai_output():
+    """Log what CrewAI and crewai_tools print to stdout, whatever a crew's ``verbose``."""
+    from crewai.utilities.printer import Printer
+    from crewai_tools.tools import base_tool
+
+    def printer_print(self, content, color=None):
+        # CrewAI prints tool errors in red and everything else in other colours.
+        text = _COLORS.sub("", str(content)).strip()
+        log(logging.INFO if color == "red" else logging.DEBUG, f"crewai: {_clip(text)}")
+
+    def tool_print(*values, **kwargs):
+        log(logging.DEBUG, f"crewai_tools: {_clip(' '.join(map(str, values)))}")
+
+    Printer.print = printer_print
+    # BaseTool.run prints "Using Tool: ..." through the module's global ``print``.
+    base_tool.print = tool_print
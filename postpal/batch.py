@@ -0,0 +1,143 @@
+"""Headless batch runner: a CSV of topics in, a JSONL file of posts out.
+
+Usage::
+
+    OPENAI_API_KEY=... SERPER_API_KEY=... \
+        python -m postpal.batch topics.csv --output posts.jsonl --concurrency 4
+
+The CSV needs a ``topic`` column and may have a ``platforms`` column listing
+any of blog, linkedin, twitter, instagram separated by spaces, commas or
+semicolons (all platforms when empty). Each row runs the same crews as the
+"All platforms" page: research once, then every platform's chain.
+
+Results are appended to the output file as soon as each row finishes, and
+the file doubles as the checkpoint: running the same command again skips
+rows that already succeeded and retries the ones that failed.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from postpal import ratelimit
+from postpal.pipelines import run_all_platforms
+from postpal.platforms import MODES, PLATFORMS
+from postpal.tracing import percentile
+
+
+def read_items(path):
+    items = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            topic = (row.get("topic") or "").strip()
+            if not topic:
+                continue
+            platforms = tuple(p for p in re.split(r"[\s,;|]+", (row.get("platforms") or "").lower()) if p) or PLATFORMS
+            unknown = set(platforms) - set(PLATFORMS)
+            if unknown:
+                raise ValueError(f"Unknown platform(s) {sorted(unknown)} for topic {topic!r}")
+            item_id = hashlib.sha256(f"{topic}|{','.join(platforms)}".encode("utf-8")).hexdigest()[:16]
+            items.append({"id": item_id, "topic": topic, "platforms": platforms})
+    return items
+
+
+def completed_ids(path):
+    """Ids of rows that already succeeded in a previous run of the same output file."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a truncated last line behind; that row simply runs again.
+                continue
+            if record.get("status") == "ok":
+                done.add(record["id"])
+    return done
+
+
+def run_item(item, bypass_cache, mode="quality"):
+    started = time.perf_counter()
+    record = {"id": item["id"], "topic": item["topic"], "platforms": list(item["platforms"])}
+    try:
+        # Batch work yields to interactive page runs at the rate limiter.
+        with ratelimit.client("batch", ratelimit.BATCH):
+            output = run_all_platforms(None, item["topic"], item["platforms"], bypass_cache, mode)
+    except Exception as e:
+        record.update(status="error", error=str(e))
+    else:
+        failed = {p: r["error"] for p, r in output["platforms"].items() if "error" in r}
+        record.update(
+            status="error" if failed else "ok",
+            research=output["research"]["research"] if output["research"] else None,
+            results={p: {k: v for k, v in r.items() if k != "error"} for p, r in output["platforms"].items() if "error" not in r},
+        )
+        if failed:
+            record["error"] = failed
+    record["latency_s"] = round(time.perf_counter() - started, 3)
+    record["finished_at"] = time.time()
+    return record
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate posts for a CSV of topics.")
+    parser.add_argument("csv", help="input CSV with a 'topic' column and an optional 'platforms' column")
+    parser.add_argument("-o", "--output", default="posts.jsonl", help="JSONL file to append results to")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="number of topics to run at once")
+    parser.add_argument("--bypass-cache", action="store_true", help="ignore cached results")
+    parser.add_argument("--mode", choices=MODES, default="quality", help="full crews, or single-pass drafts")
+    args = parser.parse_args(argv)
+
+    for name in ("OPENAI_API_KEY", "SERPER_API_KEY"):
+        if not os.environ.get(name):
+            parser.error(f"{name} must be set in the environment")
+
+    items = read_items(args.csv)
+    done = completed_ids(args.output)
+    pending = [item for item in items if item["id"] not in done]
+    print(f"{len(items)} topics, {len(items) - len(pending)} already done, {len(pending)} to run", file=sys.stderr)
+
+    latencies = []
+    failures = 0
+    started = time.perf_counter()
+    with open(args.output, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        if out.tell() and not _ends_with_newline(args.output):
+            out.write("\n")
+        futures = [pool.submit(run_item, item, args.bypass_cache, args.mode) for item in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            latencies.append(record["latency_s"])
+            failures += record["status"] != "ok"
+            print(f"[{len(latencies)}/{len(pending)}] {record['status']:5} {record['latency_s']:7.1f}s  {record['topic']}", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+
+    if latencies:
+        print(
+            f"\n{len(latencies)} topics in {elapsed:.1f}s ({len(latencies) / elapsed * 60:.2f} items/min), "
+            f"{failures} failed\n"
+            f"latency p50 {percentile(latencies, 50):.1f}s, p95 {percentile(latencies, 95):.1f}s, "
+            f"max {max(latencies):.1f}s",
+            file=sys.stderr,
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Result cache for ``crew.kickoff`` outputs.
+
+A run is identified by the page, the normalized topic, the model settings and
+a fingerprint of the agent/task prompt templates. Lookups go through a small
+in-memory LRU first and fall back to an on-disk SQLite store, so results
+survive restarts and are shared by every session of the process.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from postpal import settings
+from postpal.store import SqliteStore
+
+
+def normalize_topic(topic):
+    """Lower-case, collapse whitespace and drop surrounding punctuation."""
+    topic = " ".join(topic.lower().split())
+    return re.sub(r"^[\W_]+|[\W_]+$", "", topic)
+
+
+def prompt_fingerprint(agents, tasks):
+    """Hash the prompt templates of a crew so prompt edits invalidate old results."""
+    digest = hashlib.sha256()
+    for agent in agents:
+        for text in (agent.role, agent.goal, agent.backstory):
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+    for task in tasks:
+        for text in (task.description, task.expected_output):
+            digest.update((text or "").encode("utf-8"))
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cache_key(page, topic, model, temperature, fingerprint):
+    raw = "|".join([page, normalize_topic(topic), model, repr(float(temperature)), fingerprint])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, store, memory_items=128, ttl=None):
+        self.store = store
+        self.memory_items = memory_items
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                value, expires_at = self._memory[key]
+                if expires_at is None or expires_at > time.time():
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+        entry = self.store.get_entry(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            self.disk_hits += 1
+            self._remember(key, value, expires_at - time.time() if expires_at else None)
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl or self.ttl
+        self.store.set(key, value, ttl=ttl)
+        with self._lock:
+            self._remember(key, value, ttl)
+
+    def invalidate(self, key):
+        self.store.delete(key)
+        with self._lock:
+            self._memory.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def _remember(self, key, value, ttl):
+        self._memory[key] = (value, time.time() + ttl if ttl else None)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def result_cache():
+    """Return the process-wide result cache, creating it on first use."""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            store = SqliteStore(
+                settings.CACHE_DIR / "results.sqlite",
+                table="results",
+                max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+            )
+            _result_cache = ResultCache(
+                store,
+                memory_items=settings.RESULT_CACHE_MEMORY_ITEMS,
+                ttl=settings.RESULT_CACHE_TTL,
+            )
+        return _result_cache
@@ -0,0 +1,107 @@
+"""LangChain callback handlers shared by every ChatOpenAI instance.
+
+The handlers look the calling run up from context rather than holding on
+to one, so a single instance can serve all sessions and jobs.
+"""
+import logging
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from postpal import agentlog, events, tracing
+
+
+class StreamingHandler(BaseCallbackHandler):
+    """Forwards LLM tokens to the event stream of whichever run is calling."""
+
+    def on_llm_new_token(self, token, **kwargs):
+        if token:
+            events.emit("token", task=events.current_task.get(), text=token)
+
+
+class TracingHandler(BaseCallbackHandler):
+    """Records one ``llm`` span per ChatOpenAI call with token usage and cost."""
+
+    def __init__(self):
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        text = "\n".join(
+            m.content for batch in messages for m in batch if isinstance(m.content, str)
+        )
+        self._start(run_id, kwargs, text)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, kwargs, "\n".join(prompts))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            entry = self._spans.pop(run_id, None)
+        if entry is None:
+            return
+        llm_span, prompt = entry
+        model = llm_span.attrs.get("model")
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        completion = "".join(g.text for generations in response.generations for g in generations)
+        # Streaming responses carry no usage block, so fall back to counting locally.
+        prompt_tokens = usage.get("prompt_tokens") or tracing.estimate_tokens(prompt, model)
+        completion_tokens = usage.get("completion_tokens") or tracing.estimate_tokens(completion, model)
+        tracing.end_span(
+            llm_span,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            estimated=not usage,
+            cost_usd=tracing.llm_cost(model, prompt_tokens, completion_tokens),
+        )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            entry = self._spans.pop(run_id, None)
+        if entry is not None:
+            tracing.end_span(entry[0], error=str(error))
+
+    def _start(self, run_id, kwargs, prompt):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model")
+        llm_span = tracing.start_span("llm", model or "llm", model=model)
+        with self._lock:
+            self._spans[run_id] = (llm_span, prompt)
+
+
+class LoggingHandler(BaseCallbackHandler):
+    """Writes one agent log record per ChatOpenAI call, and one per failure."""
+
+    def __init__(self):
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, kwargs)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            entry = self._started.pop(run_id, None)
+        if entry is None:
+            return
+        model, started = entry
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        agentlog.log(
+            logging.DEBUG, f"llm {model} answered in {time.time() - started:.1f}s",
+            model=model, seconds=round(time.time() - started, 3), **usage,
+        )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            entry = self._started.pop(run_id, None)
+        model = entry[0] if entry else None
+        agentlog.log(logging.WARNING, f"llm {model} failed: {error}", model=model)
+
+    def _start(self, run_id, kwargs):
+        params = kwargs.get("invocation_params") or {}
+        with self._lock:
+            self._started[run_id] = (params.get("model_name") or params.get("model"), time.time())
@@ -0,0 +1,87 @@
+"""Deterministic checks on generated posts.
+
+Fast mode skips the editor agent when a draft passes these, so they only
+cover what can be verified without a model: length, hashtags, links and
+markdown structure. Each check returns a list of problems, phrased so they
+can be handed to the editor as instructions.
+"""
+import re
+
+BLOG_MAX_WORDS = 400
+LINKEDIN_MAX_WORDS = 300
+TWEET_MAX_CHARS = 280
+TWEET_HASHTAGS = (3, 5)
+
+_WORD = re.compile(r"[A-Za-z0-9][\w'’-]*")
+# "#1" is a number, not a hashtag.
+_HASHTAG = re.compile(r"(?<![\w#])#(?!\d+\b)\w+")
+_LINK = re.compile(r"https?://\S+")
+# Traces of the agent's ReAct format that must never reach a post.
+_LEFTOVERS = re.compile(r"^\s*(Thought|Action|Action Input|Observation|Final Answer):", re.MULTILINE)
+
+
+def word_count(text):
+    return len(_WORD.findall(_LINK.sub("", text)))
+
+
+def hashtags(text):
+    return _HASHTAG.findall(text)
+
+
+def _common(text):
+    problems = []
+    if not text.strip():
+        problems.append("The post is empty.")
+    if _LEFTOVERS.search(text):
+        problems.append("Remove the agent's working notes (Thought/Action/Final Answer lines).")
+    return problems
+
+
+def check_blog(text):
+    problems = _common(text)
+    words = word_count(text)
+    if words > BLOG_MAX_WORDS:
+        problems.append(f"Shorten it to under {BLOG_MAX_WORDS} words (it has {words}).")
+    lines = [line.strip() for line in text.splitlines()]
+    if not any(line.startswith("# ") for line in lines):
+        problems.append("Start with a title as a markdown '# ' heading.")
+    if sum(line.startswith("## ") for line in lines) < 2:
+        problems.append("Structure the body into at least two sections with '## ' headings.")
+    return problems
+
+
+def check_linkedin(text):
+    problems = _common(text)
+    words = word_count(text)
+    if words > LINKEDIN_MAX_WORDS:
+        problems.append(f"Shorten it to under {LINKEDIN_MAX_WORDS} words (it has {words}).")
+    if not hashtags(text):
+        problems.append("Add relevant hashtags at the end.")
+    if "?" not in text:
+        problems.append("End with a question that invites comments.")
+    return problems
+
+
+def check_tweet(text):
+    problems = _common(text)
+    if len(text.strip()) > TWEET_MAX_CHARS:
+        problems.append(f"Shorten it to {TWEET_MAX_CHARS} characters or fewer (it has {len(text.strip())}).")
+    low, high = TWEET_HASHTAGS
+    count = len(hashtags(text))
+    if not low <= count <= high:
+        problems.append(f"Use {low}-{high} relevant hashtags (it has {count}).")
+    if not _LINK.search(text):
+        problems.append("Include a relevant, functional link.")
+    return problems
+
+
+CHECKS = {
+    "blog": check_blog,
+    "linkedin": check_linkedin,
+    "twitter": check_tweet,
+}
+
+
+def check_post(platform, text):
+    """Return the problems found in ``text`` for ``platform``; empty means it passes."""
+    return CHECKS[platform](str(text))
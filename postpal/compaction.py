@@ -0,0 +1,176 @@
+"""Trim scraped pages to what is relevant before an agent reads them.
+
+A scraped news page is mostly navigation, cookie banners and footers, and
+whatever the agent reads is repeated in every later LLM call of its task.
+So between the scrape and the agent the text is cleaned up and cut down:
+
+1. passages already returned to the same task, or repeated within the page,
+   are dropped, as are fragments too short to be prose;
+2. the rest is split into chunks of about ``SCRAPE_CHUNK_TOKENS``;
+3. chunks are ranked with BM25 against the run's topic and the best ones are
+   kept, in page order, up to ``SCRAPE_TOKEN_BUDGET`` tokens.
+
+Boilerplate markup is removed earlier, when the page is parsed (see
+``tools.CachedScrapeWebsiteTool``). A ``session`` is opened per run; it
+counts the tokens saved by both steps, against the page's full text.
+"""
+import contextvars
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from postpal import events, settings, tracing
+
+MIN_PASSAGE_WORDS = 5
+
+_TERM = re.compile(r"[a-z0-9]+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this to was were what "
+    "when where which who why will with about into over your you our their".split()
+)
+
+current_session = contextvars.ContextVar("postpal_compaction_session", default=None)
+
+
+def terms(text):
+    return [term for term in _TERM.findall(text.lower()) if term not in STOPWORDS]
+
+
+def _fingerprint(passage):
+    return hashlib.sha1(" ".join(_TERM.findall(passage.lower())).encode("utf-8")).hexdigest()
+
+
+def chunk(passages, chunk_tokens):
+    """Group passages into chunks of about ``chunk_tokens``, splitting long ones at sentences.
+
+    Returns ``(text, passage_indexes)`` pairs so callers know which passages
+    each chunk shows.
+    """
+    pieces = []
+    for index, passage in enumerate(passages):
+        if tracing.estimate_tokens(passage) <= chunk_tokens:
+            pieces.append((index, passage))
+        else:
+            pieces.extend((index, sentence) for sentence in _SENTENCE.split(passage) if sentence.strip())
+
+    chunks, current, sources, size = [], [], set(), 0
+    for index, piece in pieces:
+        tokens = tracing.estimate_tokens(piece)
+        if current and size + tokens > chunk_tokens:
+            chunks.append((" ".join(current), sources))
+            current, sources, size = [], set(), 0
+        current.append(piece)
+        sources.add(index)
+        size += tokens
+    if current:
+        chunks.append((" ".join(current), sources))
+    return chunks
+
+
+def bm25_scores(query, documents, k1=1.5, b=0.75):
+    """BM25 score of every document for ``query``, with IDF taken over ``documents``."""
+    query_terms = set(terms(query))
+    tokenized = [terms(document) for document in documents]
+    if not tokenized:
+        return []
+    average = sum(len(tokens) for tokens in tokenized) / len(tokenized) or 1
+    document_frequency = Counter(term for tokens in tokenized for term in set(tokens))
+    scores = []
+    for tokens in tokenized:
+        frequencies = Counter(tokens)
+        score = 0.0
+        for term in query_terms:
+            if term not in frequencies:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(tokenized) - df + 0.5) / (df + 0.5))
+            tf = frequencies[term]
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / average))
+        scores.append(score)
+    return scores
+
+
+class Session:
+    """Compaction state for one run: the topic, passages already handed out, tokens saved."""
+
+    def __init__(self, topic, token_budget=None, chunk_tokens=None):
+        self.topic = topic
+        self.token_budget = token_budget or settings.SCRAPE_TOKEN_BUDGET
+        self.chunk_tokens = chunk_tokens or settings.SCRAPE_CHUNK_TOKENS
+        self.tokens_in = 0
+        self.tokens_out = 0
+        # Passages are only new to the task (agent) that has not seen them yet.
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    @property
+    def tokens_saved(self):
+        return self.tokens_in - self.tokens_out
+
+    def compact(self, text, tokens_raw=None):
+        """Return ``(compacted, tokens_before, tokens_after)`` for the current task.
+
+        ``tokens_raw`` is the size of the page before its boilerplate was
+        removed; it defaults to the size of ``text``.
+        """
+        passages = [p.strip() for p in text.split("\n\n") if len(p.split()) >= MIN_PASSAGE_WORDS]
+        with self._lock:
+            seen = self._seen.setdefault(events.current_task.get(), set())
+            fresh, fingerprints = [], []
+            for passage in passages:
+                fingerprint = _fingerprint(passage)
+                if fingerprint not in seen and fingerprint not in fingerprints:
+                    fresh.append(passage)
+                    fingerprints.append(fingerprint)
+
+        chunks = chunk(fresh, self.chunk_tokens)
+        scores = bm25_scores(self.topic, [chunk_text for chunk_text, _ in chunks])
+        if not any(scores):
+            # Nothing matches the topic literally; keep the page's opening instead.
+            scores = [-index for index in range(len(chunks))]
+        kept, used = set(), 0
+        for index in sorted(range(len(chunks)), key=lambda i: -scores[i]):
+            tokens = tracing.estimate_tokens(chunks[index][0])
+            if used + tokens > self.token_budget:
+                continue
+            kept.add(index)
+            used += tokens
+        compacted = "\n\n".join(chunks[index][0] for index in sorted(kept))
+        if not compacted:
+            compacted = "(Nothing new on this page: its content was already returned by an earlier scrape.)"
+
+        before = tracing.estimate_tokens(text) if tokens_raw is None else tokens_raw
+        after = tracing.estimate_tokens(compacted)
+        with self._lock:
+            # Only what the agent was actually shown counts as seen.
+            seen.update(fingerprints[i] for index in kept for i in chunks[index][1])
+            self.tokens_in += before
+            self.tokens_out += after
+        return compacted, before, after
+
+
+@contextmanager
+def session(topic, **kwargs):
+    """Compact every scrape made in this context for ``topic``."""
+    compaction = Session(topic, **kwargs)
+    token = current_session.set(compaction)
+    try:
+        yield compaction
+    finally:
+        current_session.reset(token)
+
+
+def compact(text, tokens_raw=None):
+    """Compact ``text`` for the current session; returns ``(text, tokens_before, tokens_after)``.
+
+    Outside a session (e.g. a tool used on its own) the text is returned as is.
+    """
+    compaction = current_session.get()
+    if compaction is None:
+        tokens = tracing.estimate_tokens(text)
+        return text, tokens if tokens_raw is None else tokens_raw, tokens
+    return compaction.compact(text, tokens_raw)
@@ -0,0 +1,554 @@
+"""Agent, task and crew definitions for every generator.
+
+The pages, the "All platforms" fan-out and headless callers all build their
+crews here, so a prompt only ever has to be changed in one place. Prompts are
+CrewAI templates: ``{topic}``/``{theme}`` and, for writers fed by the shared
+research phase, ``{research}`` are filled in by ``crew.kickoff(inputs=...)``.
+CrewAI's console output is off unless ``POSTPAL_CREW_VERBOSE=1``; what the
+crews do is recorded by ``postpal.agentlog`` instead.
+"""
+import re
+
+from crewai import Agent, Task, Crew
+
+from postpal import agentlog, settings
+from postpal.tools import generate_image
+
+if not settings.CREW_VERBOSE:
+    agentlog.capture_crewai_output()
+
+BLOG_MODEL = "gpt-4o"
+LINKEDIN_MODEL = "gpt-4o-mini"
+TWITTER_MODEL = "gpt-4o-mini"
+INSTAGRAM_MODEL = "gpt-4o"
+RESEARCH_MODEL = "gpt-4o"
+
+# Appended to the first writing task when research has already been done.
+RESEARCH_NOTES = "\nBase your work on these research notes instead of searching again:\n{research}\n"
+
+# Stage-by-stage runs hand the plan and the draft over as inputs.
+PLAN_NOTES = "\nFollow this content plan:\n{research}\n"
+DRAFT_NOTES = "\nThe draft to edit:\n{draft}\n"
+# Appended to every task of a stage the user asked to regenerate.
+RERUN_NOTES = (
+    "\nThe previous version of this was turned down: produce a noticeably different one, "
+    "with another angle, structure and wording.\n"
+)
+
+# Fast mode: the writer edits its own draft instead of handing it to an editor.
+SELF_EDIT = (
+    "\nBefore giving your final answer, edit your own draft the way a meticulous editor would: "
+    "fix grammar, style and flow, and make sure it meets every requirement above."
+)
+
+
+def _blog_editor(llm):
+    return Agent(
+        role="Editor",
+        goal="Edit a blog post for style and accuracy.",
+        backstory="You are an editor reviewing blog posts for quality, balance, and adherence to guidelines.",
+        allow_delegation=False,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+
+def _linkedin_editor(llm):
+    return Agent(
+        role="Editor",
+        goal="Edit a given blog post to align with the writing style of the organization.",
+        backstory=(
+            "You are an editor reviewing a LinkedIn article. "
+            "Your goal is to ensure it follows best practices, provides balanced viewpoints, and avoids controversy. "
+            "You fix grammar, improve flow, and make the tone natural and engaging. "
+            "You are a meticulous editor, polishing posts to sound professional."
+        ),
+        allow_delegation=False,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+
+def _twitter_editor(llm):
+    return Agent(
+        role="Social Media Editor",
+        goal="Polish tweets on {topic} so they are ready to publish.",
+        backstory=(
+            "You are the editor of a brand's Twitter account. "
+            "You fix tweets that break the rules (too long, the wrong number of hashtags, a missing link) "
+            "while keeping their hook and voice."
+        ),
+        allow_delegation=False,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+
+def research_crew(llm, tools):
+    """A single research pass whose notes feed every platform's writers."""
+    researcher = Agent(
+        role="Research Analyst",
+        goal="Research {topic} thoroughly so writers for every platform can work from the same notes",
+        backstory=(
+            "You are a research analyst preparing a briefing on {topic}. "
+            "Writers for a blog, LinkedIn, Twitter and Instagram rely on your notes, so you focus on "
+            "facts, current news, key players, audience interests and sources they can cite."
+        ),
+        tools=tools,
+        allow_delegation=False,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+    research_task = Task(
+        description=(
+            "1. Gather key trends, players, and news on {topic}.\n"
+            "2. Identify the target audience and their interests and pain points.\n"
+            "3. Collect relevant data points, SEO keywords and 2-3 source links.\n"
+            "4. Suggest a concise outline (introduction, key points, call to action).\n"
+        ),
+        expected_output="Research notes (under 250 words) with trends, audience analysis, data points, keywords, an outline and source links.",
+        agent=researcher,
+    )
+
+    return Crew(agents=[researcher], tasks=[research_task], verbose=settings.CREW_VERBOSE)
+
+
+def _blog_tasks(llm, tools, notes="", chained=True):
+    """``(plan_task, write_task, edit_task)`` of the blog pipeline.
+
+    ``notes`` is appended to the writing task. Unchained tasks do not read
+    each other's output: the edit task takes the ``{draft}`` input instead.
+    """
+    planner = Agent(
+        role="Content Planner",
+        goal="Plan engaging content on {topic}",
+        backstory="You are a content planner focused on {topic}. You gather information to inform the audience. Your plan guides the writer.",
+        tools=tools,
+        allow_delegation=False,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+    writer = Agent(
+        role="Content Writer",
+        goal="Write an opinion piece about {topic}",
+        backstory="You are a writer creating an opinion piece on {topic}, based on the content plan. You aim for insightful and balanced writing, distinguishing opinions from facts.",
+        tools=tools,
+        allow_delegation=False,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+    editor = _blog_editor(llm)
+
+    plan_task = Task(
+        description=(
+            "1. Gather key trends, players, and news on {topic}."
+            "2. Identify the target audience."
+            "3. Develop a concise content outline (under 100 words)."
+            "4. Include SEO keywords and relevant data."
+        ),
+        expected_output="A concise content plan with an outline, audience analysis, SEO keywords, and key resources (under 100 words).",
+        agent=planner,
+    )
+
+    write_task = Task(
+        description=(
+            "Draft a blog post on {topic} using the content plan." # Simplified
+            "Incorporate SEO keywords."
+            "Use engaging titles and structure: intro, body, conclusion." # Simplified structure
+            "Proofread for errors and brand voice."
+        ) + notes,
+        expected_output="A well-written blog post in markdown (under 400 words), "
+            "ready for publication, with distinct sections (e.g., one paragraph per section).", # Simplified section description
+        agent=writer,
+    )
+
+    edit_task = Task(
+        description="Proofread the blog post for grammar, style, and brand voice." + ("" if chained else DRAFT_NOTES),
+        expected_output="A final, proofread blog post in markdown format, ready for publication.",
+        agent=editor,
+    )
+
+    return plan_task, write_task, edit_task
+
+
+def _planned_crew(plan_task, write_task, edit_task, shared_research):
+    tasks = [write_task, edit_task] if shared_research else [plan_task, write_task, edit_task]
+    return Crew(agents=[task.agent for task in tasks], tasks=tasks, verbose=settings.CREW_VERBOSE)
+
+
+def blog_crew(llm, tools, shared_research=False):
+    """Planner -> writer -> editor; without the planner when research is passed in."""
+    return _planned_crew(*_blog_tasks(llm, tools, RESEARCH_NOTES if shared_research else ""), shared_research)
+
+
+def _linkedin_tasks(llm, tools, notes="", chained=True):
+    """``(plan_task, write_task, edit_task)`` of the LinkedIn pipeline; see ``_blog_tasks``."""
+    planner = Agent(
+        role="LinkedIn Content Planner",
+        goal="Plan engaging and factually accurate content for LinkedIn on {topic}",
+        backstory=(
+            "You're planning a concise LinkedIn post about {topic}. "
+            "You collect information that helps the audience learn and make informed decisions. "
+            "Your work is the basis for the Content Writer."
+        ),
+        allow_delegation=False,
+        tools=tools,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+    writer = Agent(
+        role="Content Writer",
+        goal="Write an insightful and factually accurate opinion piece about {topic} for LinkedIn",
+        backstory=(
+            "You're writing a new opinion piece about {topic} for LinkedIn. "
+            "You base your writing on the Content Planner's outline. "
+            "You follow the main objectives, provide impartial insights, and back them up with information. "
+            "You make it engaging, use bullet points, and end with a question to encourage comments. "
+            "Your post must be under 300 words. You are a LinkedIn content expert who can write viral posts."
+        ),
+        tools=tools,
+        allow_delegation=False,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+    editor = _linkedin_editor(llm)
+
+    plan_task = Task(
+        description=(
+            "1. Create a concise content plan for a LinkedIn post on {topic}.\n"
+            "2. Focus on key trends, players, and news.\n"
+            "3. Identify the target audience's interests and pain points.\n"
+            "4. Develop a concise outline (introduction, key points, call to action).\n"
+        ),
+        expected_output="A concise content plan (under 150 words) with an outline, audience analysis, and relevant resources.",
+        agent=planner,
+    )
+
+    write_task = Task(
+        description=(
+            "1. Craft a concise LinkedIn post on {topic} based on the content plan.\n"
+            "2. Ensure the post is engaging, insightful, and factual.\n"
+            "3. Structure with an introduction, body with bullet points, and a conclusion.\n"
+            "4. Keep the content under 300 words and add relevant hashtags.\n"
+        ) + notes,
+        expected_output="A LinkedIn post under 300 words with a hook, insights, call-to-action, and hashtags.",
+        agent=writer,
+        context=[plan_task] if chained and not notes else None
+    )
+
+    edit_task = Task(
+        description="Proofread and refine the LinkedIn post for grammar, flow, tone, and clarity. Ensure it is engaging, professional, and suitable for LinkedIn."
+            + ("" if chained else DRAFT_NOTES),
+        expected_output="A final polished LinkedIn post ready for publication.",
+        agent=editor,
+        context=[write_task] if chained else None
+    )
+
+    return plan_task, write_task, edit_task
+
+
+def linkedin_crew(llm, tools, shared_research=False):
+    """Planner -> writer -> editor; without the planner when research is passed in."""
+    return _planned_crew(*_linkedin_tasks(llm, tools, RESEARCH_NOTES if shared_research else ""), shared_research)
+
+
+def stage_crews(platform, llm, tools, shared_research=False):
+    """Blog or LinkedIn pipeline as one single-task crew per stage: ``{"plan", "write", "edit"}``.
+
+    Stages are kicked off one by one so each output can be cached on its
+    own: the writer gets the plan (or the shared research) as ``{research}``
+    and the editor gets the writer's ``{draft}``.
+    """
+    builders = {"blog": _blog_tasks, "linkedin": _linkedin_tasks}
+    tasks = builders[platform](llm, tools, RESEARCH_NOTES if shared_research else PLAN_NOTES, chained=False)
+    return {
+        stage: Crew(agents=[task.agent], tasks=[task], verbose=settings.CREW_VERBOSE)
+        for stage, task in zip(("plan", "write", "edit"), tasks)
+    }
+
+
+def rerun_crew(crew):
+    """Tell a freshly built ``crew`` to come back with a different version than last time."""
+    for task in crew.tasks:
+        task.description += RERUN_NOTES
+    return crew
+
+
+def twitter_crew(llm, tools, shared_research=False):
+    """A single tweet strategist.
+
+    Hashtags, link checks and the length limit are applied afterwards by
+    ``tweets.finalize`` rather than by a second agent.
+    """
+    tweet_agent = Agent(
+        name='Tweet Strategist',
+        role='Social Media Expert',
+        goal="Write concise, punchy tweets on {topic} that resonate with the target audience and encourage high engagement.",
+        backstory=(
+            "You are a seasoned Twitter expert creating a tweet on {topic}. "
+            "You specialize in distilling complex ideas into sharp, witty, or emotionally resonant tweets under 280 characters."
+        ),
+        tools=tools,
+        allow_delegation=False,
+        llm=llm,
+        verbose=settings.CREW_VERBOSE
+    )
+
+    task_tweets = Task(
+        description="Generate a concise, impactful tweet on {topic} that hooks readers and aligns with current engagement styles. "
+            "Attach a relevant, functional link and 3-5 relevant hashtags."
+            + (RESEARCH_NOTES if shared_research else ""),
+        agent=tweet_agent,
+        expected_output="A concise and impactful tweet (under 280 characters) with a relevant, functional link and 3-5 hashtags."
+    )
+
+    return Crew(agents=[tweet_agent], tasks=[task_tweets], verbose=settings.CREW_VERBOSE)
+
+
+def instagram_crews(llm):
+    """Return ``(image_crew, caption_crew)``, both kicked off with a ``theme`` input.
+
+    The caption task never receives the image as context, so the two crews
+    are independent and can run at the same time.
+    """
+    caption_agent = Agent(
+        name='Caption & Hashtag Strategist',
+        role='Social Media Expert',
+        goal='Create engaging captions and effective hashtag strategies',
+        backstory=(
+            "You're a social media copywriter specializing in Instagram content. "
+            "Your goal is to craft engaging captions that resonate emotionally or humorously with audiences on {theme}, "
+            "while ensuring discoverability through relevant hashtags. "
+            "You analyze trends and write content that aligns with the visual's intent and the creator's brand voice. "
+            "Your work is based on the image generated by the Visual Content Creator."
+        ),
+        allow_delegation=False,
+        verbose=settings.CREW_VERBOSE,
+        llm=llm
+    )
+
+    visual_agent = Agent(
+        name='Visual Content Creator',
+        role='AI Image Generator',
+        goal="Generate visually compelling and on-brand images for Instagram content based on the theme: {theme}",
+        backstory=(
+            "You're an AI-based visual artist creating Instagram-ready images. "
+            "You work with the Caption & Hashtag Strategist, who builds captions around your visuals. "
+            "Your images attract attention, convey mood, and support the messaging. "
+            "You use DALL·E to create realistic, vibrant, and aesthetically pleasing images that don't look AI-generated."
+        ),
+        verbose=settings.CREW_VERBOSE,
+        llm=llm,
+        tools=[generate_image],
+        allow_delegation=False
+    )
+
+    task_captions = Task(
+        description="Generate a catchy Instagram caption and a set of 3-5 trending hashtags for the theme: '{theme}'.",
+        agent=caption_agent,
+        expected_output="A single catchy caption and a list of 3-5 relevant hashtags."
+    )
+
+    task_image = Task(
+        description="Generate a beautiful, natural-looking Instagram-style visual based on the theme: '{theme}'. The image should not look AI-generated.",
+        agent=visual_agent,
+        expected_output='A high-quality image URL matching the theme description and tone.',
+    )
+
+    return (
+        Crew(agents=[visual_agent], tasks=[task_image], verbose=settings.CREW_VERBOSE),
+        Crew(agents=[caption_agent], tasks=[task_captions], verbose=settings.CREW_VERBOSE),
+    )
+
+
+def fast_crew(platform, llm, tools, shared_research=False):
+    """A single agent that researches, drafts and self-edits ``platform``'s post in one task.
+
+    It produces the same output as the quality crew's last task. With shared
+    research the agent gets no tools, so the whole post is one ReAct step.
+    """
+    tools = [] if shared_research else tools
+    research_step = RESEARCH_NOTES if shared_research else "Research key trends, players and news on {topic} and identify the target audience.\n"
+
+    if platform == "blog":
+        writer = Agent(
+            role="Content Writer",
+            goal="Research and write an opinion piece about {topic}",
+            backstory=(
+                "You are a writer creating an opinion piece on {topic}. You gather the facts yourself, "
+                "aim for insightful and balanced writing, distinguish opinions from facts and proofread your own work."
+            ),
+            tools=tools,
+            allow_delegation=False,
+            verbose=settings.CREW_VERBOSE,
+            llm=llm
+        )
+        task = Task(
+            description=research_step + (
+                "Write a blog post on {topic} in markdown: a '# ' title, an introduction, "
+                "at least two '## ' sections and a conclusion. Incorporate SEO keywords. "
+                "Keep it under 400 words."
+            ) + SELF_EDIT,
+            expected_output="A final, proofread blog post in markdown format (under 400 words), ready for publication.",
+            agent=writer,
+        )
+    elif platform == "linkedin":
+        writer = Agent(
+            role="Content Writer",
+            goal="Research and write an insightful and factually accurate opinion piece about {topic} for LinkedIn",
+            backstory=(
+                "You're a LinkedIn content expert who can write viral posts. You research {topic} yourself, "
+                "provide impartial insights backed up with information, use bullet points, "
+                "and end with a question to encourage comments. You polish your posts to sound professional."
+            ),
+            tools=tools,
+            allow_delegation=False,
+            verbose=settings.CREW_VERBOSE,
+            llm=llm
+        )
+        task = Task(
+            description=research_step + (
+                "Write a LinkedIn post on {topic} with a hook, a body with bullet points and a conclusion "
+                "that ends with a question. Keep it under 300 words and add relevant hashtags."
+            ) + SELF_EDIT,
+            expected_output="A final polished LinkedIn post under 300 words with a hook, insights, call-to-action, and hashtags.",
+            agent=writer,
+        )
+    elif platform == "twitter":
+        writer = Agent(
+            role="Social Media Expert",
+            goal="Write concise, punchy tweets on {topic} that resonate with the target audience and encourage high engagement.",
+            backstory=(
+                "You are a seasoned Twitter expert creating a tweet on {topic}. "
+                "You distill complex ideas into sharp tweets under 280 characters and pick the hashtags that maximize reach."
+            ),
+            tools=tools,
+            allow_delegation=False,
+            verbose=settings.CREW_VERBOSE,
+            llm=llm
+        )
+        task = Task(
+            description=research_step + (
+                "Write a concise, impactful tweet on {topic} that hooks readers, with a relevant, functional link "
+                "and 3-5 relevant hashtags. The whole tweet, link and hashtags included, must be 280 characters or fewer."
+            ) + SELF_EDIT,
+            expected_output="A single tweet (280 characters or fewer) with a relevant, functional link and 3-5 hashtags.",
+            agent=writer,
+        )
+    else:
+        raise ValueError(f"Fast mode does not support {platform!r}")
+
+    return Crew(agents=[writer], tasks=[task], verbose=settings.CREW_VERBOSE)
+
+
+def edit_crew(platform, llm):
+    """Fix a fast-mode draft that failed the deterministic checks.
+
+    Kicked off with ``topic``, ``draft`` and ``problems`` inputs.
+    """
+    editors = {"blog": _blog_editor, "linkedin": _linkedin_editor, "twitter": _twitter_editor}
+    outputs = {
+        "blog": "A final, proofread blog post in markdown format, ready for publication.",
+        "linkedin": "A final polished LinkedIn post ready for publication.",
+        "twitter": "A single tweet (280 characters or fewer) with a relevant, functional link and 3-5 hashtags.",
+    }
+    editor = editors[platform](llm)
+    task = Task(
+        description=(
+            "Revise this draft so it fixes the problems below. Keep everything else as it is.\n"
+            "Problems:\n{problems}\n\nDraft:\n{draft}"
+        ),
+        expected_output=outputs[platform],
+        agent=editor,
+    )
+    return Crew(agents=[editor], tasks=[task], verbose=settings.CREW_VERBOSE)
+
+
+# Line that separates the drafts of a variants task.
+VARIANT_SEPARATOR = "=== VARIANT ==="
+
+
+def variants_crew(platform, llm, count):
+    """One task that writes ``count`` distinct drafts in a single answer.
+
+    LinkedIn and Twitter drafts are written from the shared ``{research}``
+    notes without tools; Instagram writes ``count`` captions for ``{theme}``.
+    Drafts are separated by ``VARIANT_SEPARATOR`` lines.
+    """
+    layout = (
+        f"\nWrite {count} distinct variants for A/B testing: each with a different hook, angle or tone, "
+        "each complete and ready to publish on its own. "
+        f"Put a line containing only {VARIANT_SEPARATOR} before each variant and add nothing else."
+    )
+
+    if platform == "linkedin":
+        writer = Agent(
+            role="Content Writer",
+            goal="Write insightful and factually accurate LinkedIn posts about {topic}",
+            backstory=(
+                "You're a LinkedIn content expert who can write viral posts. "
+                "You provide impartial insights backed up with information, use bullet points, "
+                "and end with a question to encourage comments."
+            ),
+            allow_delegation=False,
+            verbose=settings.CREW_VERBOSE,
+            llm=llm
+        )
+        description = (
+            "Write LinkedIn posts on {topic} with a hook, a body with bullet points and a conclusion "
+            "that ends with a question. Keep each under 300 words and add relevant hashtags."
+        ) + RESEARCH_NOTES
+        output = f"{count} LinkedIn posts under 300 words each."
+    elif platform == "twitter":
+        writer = Agent(
+            role="Social Media Expert",
+            goal="Write concise, punchy tweets on {topic} that resonate with the target audience and encourage high engagement.",
+            backstory=(
+                "You are a seasoned Twitter expert. You distill complex ideas into sharp, witty, "
+                "or emotionally resonant tweets under 280 characters."
+            ),
+            allow_delegation=False,
+            verbose=settings.CREW_VERBOSE,
+            llm=llm
+        )
+        description = (
+            "Write tweets on {topic} that hook readers, each with a relevant link from the notes "
+            "and 3-5 relevant hashtags, 280 characters or fewer."
+        ) + RESEARCH_NOTES
+        output = f"{count} tweets of 280 characters or fewer."
+    elif platform == "instagram":
+        writer = Agent(
+            name='Caption & Hashtag Strategist',
+            role='Social Media Expert',
+            goal='Create engaging captions and effective hashtag strategies',
+            backstory=(
+                "You're a social media copywriter specializing in Instagram content. "
+                "You craft engaging captions that resonate emotionally or humorously with audiences on {theme}, "
+                "while ensuring discoverability through relevant hashtags."
+            ),
+            allow_delegation=False,
+            verbose=settings.CREW_VERBOSE,
+            llm=llm
+        )
+        description = "Write catchy Instagram captions, each with 3-5 trending hashtags, for the theme: '{theme}'."
+        output = f"{count} captions, each with 3-5 relevant hashtags."
+    else:
+        raise ValueError(f"Variants are not supported for {platform!r}")
+
+    task = Task(description=description + layout, expected_output=output, agent=writer)
+    return Crew(agents=[writer], tasks=[task], verbose=settings.CREW_VERBOSE)
+
+
+def split_variants(text):
+    """The drafts of a variants task's answer, without separators or "Variant 2:" labels."""
+    parts = str(text).split(VARIANT_SEPARATOR)
+    if len(parts) == 1:
+        # The model ignored the separator but numbered its variants.
+        parts = re.split(r"^\s*(?:\*\*|#+\s*)?Variant\s+\d+\b.*$", str(text), flags=re.MULTILINE | re.IGNORECASE)
+    drafts = [re.sub(r"^\s*(?:\*\*)?Variant\s+\d+\s*[:.)-]?\s*(?:\*\*)?", "", part, flags=re.IGNORECASE).strip() for part in parts]
+    return [draft for draft in drafts if draft]
@@ -0,0 +1,149 @@
+"""Incremental events from a running crew.
+
+Each run gets an EventStream bound to the current context. LLM tokens and
+task completions are pushed into it as they happen, so the UI can render
+output as it is written and headless callers can iterate over the events.
+
+Event dicts always carry ``type`` and ``time``; the types are
+``task_started``, ``token``, ``task_finished``, ``result`` and ``error``.
+"""
+import contextvars
+import threading
+import time
+
+current_stream = contextvars.ContextVar("postpal_event_stream", default=None)
+current_task = contextvars.ContextVar("postpal_current_task", default=None)
+
+# Called with every event, whether or not a stream is bound (used by tracing).
+_listeners = []
+
+
+class EventStream:
+    def __init__(self):
+        self.events = []
+        # Per-task transcript, kept up to date on every event so readers do
+        # not have to fold the whole token list again on each rerun.
+        self.tasks = {}
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def emit(self, type, **data):
+        event = {"type": type, "time": time.time(), **data}
+        with self._cond:
+            self.events.append(event)
+            task = data.get("task")
+            if task is not None:
+                entry = self.tasks.setdefault(task, {"text": "", "output": None, "done": False})
+                if type == "token":
+                    entry["text"] += data["text"]
+                elif type == "task_finished":
+                    entry["output"] = data["output"]
+                    entry["done"] = True
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def __iter__(self):
+        """Yield every event, blocking for new ones until the stream is closed."""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.events) and not self.closed:
+                    self._cond.wait()
+                pending = self.events[index:]
+                closed = self.closed
+            yield from pending
+            index += len(pending)
+            if closed and index >= len(self.events):
+                return
+
+
+def add_listener(listener):
+    _listeners.append(listener)
+
+
+def emit(type, **data):
+    """Emit into the stream bound to the current context, if any."""
+    for listener in _listeners:
+        listener({"type": type, **data})
+    stream = current_stream.get()
+    if stream is not None:
+        stream.emit(type, **data)
+
+
+def submit(pool, fn, *args, **kwargs):
+    """``pool.submit`` that carries the caller's event stream into the worker thread."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class TaskDispatcher:
+    """A crew's ``task_callback``, passing each finished task on to listeners.
+
+    CrewAI sets every ``task.callback`` to the crew's ``task_callback`` at
+    kickoff, so callbacks set on the tasks themselves never run. Tasks of a
+    sequential crew finish in order, so the n-th call is ``crew.tasks[n]``.
+    """
+
+    def __init__(self):
+        self.listeners = []
+        self.finished = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, output):
+        with self._lock:
+            index = self.finished
+            self.finished += 1
+        for listener in self.listeners:
+            listener(index, output)
+
+
+def on_task_finished(crew, listener):
+    """Call ``listener(index, output)`` whenever a task of ``crew`` finishes."""
+    if not isinstance(crew.task_callback, TaskDispatcher):
+        crew.task_callback = TaskDispatcher()
+    crew.task_callback.listeners.append(listener)
+
+
+def follow_tasks(crew, prefix):
+    """Emit ``task_started``/``task_finished`` for a crew about to be kicked off.
+
+    Tasks of a crew run one after another in the kickoff thread, so the task
+    that finished tells us which one starts next.
+    """
+    labels = [f"{prefix}: {task.agent.role}" for task in crew.tasks]
+
+    def finished(index, output):
+        emit("task_finished", task=labels[index], output=str(output.exported_output))
+        if index + 1 < len(labels):
+            current_task.set(labels[index + 1])
+            emit("task_started", task=labels[index + 1])
+
+    on_task_finished(crew, finished)
+    current_task.set(labels[0])
+    emit("task_started", task=labels[0])
+
+
+def stream(fn, *args, **kwargs):
+    """Run ``fn(None, *args, **kwargs)`` in a thread and yield its events.
+
+    The last event is ``{"type": "result", "output": ...}`` or
+    ``{"type": "error", "error": ...}``.
+    """
+    events = EventStream()
+
+    def run():
+        current_stream.set(events)
+        try:
+            output = fn(None, *args, **kwargs)
+        except Exception as e:
+            events.emit("error", error=e)
+        else:
+            events.emit("result", output=output)
+        finally:
+            events.close()
+
+    threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True).start()
+    yield from events
@@ -0,0 +1,196 @@
+"""Searchable history of every generated post.
+
+Each finished generation is appended to a local SQLite database: topic,
+platform, model and mode, the final text, the stored image, every task's
+intermediate output and the timings. Rows are never updated, and an FTS5
+index over topic and text backs the History page's search. Listing is
+keyset-paginated and only reads the columns a result list needs, so it stays
+fast with tens of thousands of entries; the full entry is read when one is
+opened.
+
+Results served from the result cache are not recorded again; their original
+run is already in the history.
+"""
+import contextvars
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from postpal import events, settings
+
+current_recording = contextvars.ContextVar("postpal_history_recording", default=None)
+
+_COLUMNS = (
+    "created_at", "platform", "topic", "model", "mode", "run_id",
+    "text", "image", "thumbnail", "tasks", "timings", "extra",
+)
+_SUMMARY = "id, created_at, platform, topic, model, mode, substr(text, 1, 240)"
+
+
+class Recording:
+    """Task outputs and timings of one platform's run, gathered from its events."""
+
+    def __init__(self):
+        self.tasks = []
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def on_event(self, event):
+        with self._lock:
+            if event["type"] == "task_started":
+                self._started[event["task"]] = time.time()
+            elif event["type"] == "task_finished":
+                started = self._started.pop(event["task"], None)
+                self.tasks.append({
+                    "task": event["task"],
+                    "output": event["output"],
+                    "seconds": round(time.time() - started, 3) if started else None,
+                })
+
+
+def _on_event(event):
+    recording = current_recording.get()
+    if recording is not None and event.get("task"):
+        recording.on_event(event)
+
+
+events.add_listener(_on_event)
+
+
+@contextmanager
+def recording():
+    """Collect the task outputs of the crews kicked off in this context."""
+    collected = Recording()
+    token = current_recording.set(collected)
+    try:
+        yield collected
+    finally:
+        current_recording.reset(token)
+
+
+class HistoryStore:
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " id INTEGER PRIMARY KEY, created_at REAL NOT NULL, platform TEXT NOT NULL, topic TEXT NOT NULL,"
+            " model TEXT, mode TEXT, run_id TEXT, text TEXT, image TEXT, thumbnail TEXT,"
+            " tasks TEXT, timings TEXT, extra TEXT);"
+            "CREATE INDEX IF NOT EXISTS entries_platform ON entries(platform, id);"
+            "CREATE INDEX IF NOT EXISTS entries_created ON entries(created_at);"
+        )
+        try:
+            self._conn.executescript(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5("
+                " topic, text, content='entries', content_rowid='id', tokenize='porter unicode61');"
+                "CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN"
+                " INSERT INTO entries_fts(rowid, topic, text) VALUES (new.id, new.topic, new.text);"
+                " END;"
+            )
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to substring matching.
+            self.full_text = False
+        self._conn.commit()
+
+    def add(self, platform, topic, text, model=None, mode=None, run_id=None, image=None, thumbnail=None,
+            tasks=(), timings=None, extra=None):
+        """Append one generated post and return its id."""
+        row = (
+            time.time(), platform, topic, model, mode, run_id, text, image, thumbnail,
+            json.dumps(list(tasks)), json.dumps(timings or {}), json.dumps(extra or {}),
+        )
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO entries ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})", row,
+            )
+        return cursor.lastrowid
+
+    def _where(self, query, platforms, since, until):
+        clauses, params = [], []
+        if query and query.strip():
+            if self.full_text:
+                clauses.append("entries.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+                params.append(fts_query(query) or '""')
+            else:
+                clauses.append("(entries.topic LIKE ? OR entries.text LIKE ?)")
+                params += [f"%{query.strip()}%"] * 2
+        if platforms:
+            clauses.append(f"entries.platform IN ({', '.join('?' * len(platforms))})")
+            params += list(platforms)
+        if since is not None:
+            clauses.append("entries.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("entries.created_at < ?")
+            params.append(until)
+        return " AND ".join(clauses) or "1", params
+
+    def search(self, query="", platforms=None, since=None, until=None, before=None, limit=20):
+        """Newest entries matching the filters, as summaries with a ``preview`` of the text.
+
+        ``query`` matches whole words of the topic or text (a trailing word is
+        matched as a prefix). Pass the last ``id`` of a page as ``before`` to
+        get the next one.
+        """
+        where, params = self._where(query, platforms, since, until)
+        if before is not None:
+            where += " AND entries.id < ?"
+            params.append(before)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_SUMMARY} FROM entries WHERE {where} ORDER BY entries.id DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [
+            {"id": r[0], "created_at": r[1], "platform": r[2], "topic": r[3], "model": r[4], "mode": r[5],
+             "preview": r[6] or ""}
+            for r in rows
+        ]
+
+    def count(self, query="", platforms=None, since=None, until=None):
+        where, params = self._where(query, platforms, since, until)
+        with self._lock:
+            return self._conn.execute(f"SELECT count(*) FROM entries WHERE {where}", params).fetchone()[0]
+
+    def get(self, entry_id):
+        """The full entry with ``id``, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT id, {', '.join(_COLUMNS)} FROM entries WHERE id = ?", (entry_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(zip(("id",) + _COLUMNS, row))
+        for name in ("tasks", "timings", "extra"):
+            entry[name] = json.loads(entry[name] or "null")
+        return entry
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query (every word must match, the last one as a prefix), or None."""
+    words = ["".join(c for c in word if c.isalnum()) for word in text.split()]
+    words = [word for word in words if word]
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def history():
+    """Return the process-wide history store, creating it on first use."""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = HistoryStore(settings.HISTORY_DB)
+        return _history
@@ -0,0 +1,56 @@
+"""Local storage for generated images.
+
+DALL·E only returns a temporary URL, so every image is downloaded once and
+stored under a content-addressed filename together with a thumbnail. Pages
+render the local files, which keeps working after the URL has expired and
+never sends the browser back to OpenAI.
+"""
+import hashlib
+import io
+import re
+
+from PIL import Image
+
+from postpal import settings
+from postpal.resources import http_session
+
+URL_PATTERN = re.compile(r"https?://[^\s)\"'<>\]]+")
+
+
+def find_url(text):
+    match = URL_PATTERN.search(text or "")
+    return match.group(0).rstrip(".,;:!?") if match else None
+
+
+def image_path(digest):
+    return settings.IMAGE_DIR / f"{digest}.png"
+
+
+def thumbnail_path(digest):
+    return settings.IMAGE_DIR / f"{digest}_thumb.jpg"
+
+
+def store_image(url, timeout=60):
+    """Download ``url`` once and return ``(image_path, thumbnail_path)``."""
+    response = http_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return store_image_bytes(response.content)
+
+
+def store_image_bytes(data):
+    digest = hashlib.sha256(data).hexdigest()
+    path, thumb = image_path(digest), thumbnail_path(digest)
+    settings.IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        image = Image.open(io.BytesIO(data))
+        # Write to a temporary name first so a concurrent reader never sees half a file.
+        tmp = path.with_suffix(".tmp")
+        image.save(tmp, format="PNG")
+        tmp.replace(path)
+    if not thumb.exists():
+        image = Image.open(path)
+        image.thumbnail((settings.THUMBNAIL_SIZE, settings.THUMBNAIL_SIZE))
+        tmp = thumb.with_suffix(".tmp")
+        image.convert("RGB").save(tmp, format="JPEG", quality=85)
+        tmp.replace(thumb)
+    return str(path), str(thumb)
@@ -0,0 +1,159 @@
+"""Background job engine for crew runs.
+
+Generation is submitted to a bounded worker pool and tracked by job id, so
+the Streamlit script thread only polls for status. Jobs live in the process,
+not in the session, which lets a page pick its result up again after a rerun
+or a browser refresh.
+"""
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from postpal import agentlog, events, ratelimit, settings
+from postpal.events import EventStream, current_stream
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobLimitError(RuntimeError):
+    """Raised when a session or the whole process has too many active jobs."""
+
+
+class Job:
+    def __init__(self, session_id, page, label):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.page = page
+        self.label = label
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "Waiting for a free worker..."
+        self.result = None
+        self.outputs = {}
+        self.events = EventStream()
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def update(self, progress=None, message=None):
+        """Report progress from inside the job function."""
+        if progress is not None:
+            self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def publish(self, name, value):
+        """Expose a partial result before the whole job has finished."""
+        self.outputs[name] = value
+
+
+class JobManager:
+    def __init__(self, max_workers, max_active, max_per_session, retention):
+        self.max_active = max_active
+        self.max_per_session = max_per_session
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="postpal-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session_id, page, label, fn, *args, **kwargs):
+        """Queue ``fn(job, *args, **kwargs)`` and return its Job."""
+        with self._lock:
+            self._prune()
+            active = [job for job in self._jobs.values() if job.active]
+            if len(active) >= self.max_active:
+                raise JobLimitError("The server is busy right now. Please try again in a minute.")
+            if sum(job.session_id == session_id for job in active) >= self.max_per_session:
+                raise JobLimitError(
+                    f"You already have {self.max_per_session} generations running. "
+                    "Wait for one to finish before starting another."
+                )
+            job = Job(session_id, page, label)
+            self._jobs[job.id] = job
+        # A fresh context per job keeps one job's event stream out of the next
+        # job that reuses the same worker thread.
+        self._executor.submit(contextvars.Context().run, self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, session_id=None):
+        with self._lock:
+            return [job for job in self._jobs.values() if session_id is None or job.session_id == session_id]
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.message = "Running..."
+        current_stream.set(job.events)
+        # Page runs are interactive and queue fairly against other sessions.
+        ratelimit.current_client.set((job.session_id, ratelimit.INTERACTIVE))
+        agentlog.current_session.set(job.session_id)
+        agentlog.log(logging.INFO, f"job started: {job.label}", job=job.id)
+        try:
+            job.result = fn(job, *args, **kwargs)
+        except Exception as exc:
+            agentlog.log(logging.ERROR, f"job failed: {exc!r}", job=job.id)
+            job.error = exc
+            job.status = FAILED
+        else:
+            job.progress = 1.0
+            job.status = SUCCEEDED
+        finally:
+            job.finished_at = time.time()
+            job.events.close()
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+def track_tasks(job, crews, start=0.0, end=1.0):
+    """Advance ``job`` progress as each task of ``crews`` completes, in any order."""
+    step = (end - start) / sum(len(crew.tasks) for crew in crews)
+    done = []
+    lock = threading.Lock()
+    for crew in crews:
+        def finished(index, output, crew=crew):
+            with lock:
+                done.append(crew.tasks[index])
+                job.update(start + step * len(done), f"Finished: {crew.tasks[index].agent.role}")
+        events.on_task_finished(crew, finished)
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def job_manager():
+    """Return the process-wide job manager, creating it on first use."""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager(
+                max_workers=settings.JOB_WORKERS,
+                max_active=settings.JOB_MAX_ACTIVE,
+                max_per_session=settings.JOB_MAX_PER_SESSION,
+                retention=settings.JOB_RETENTION,
+            )
+        return _job_manager
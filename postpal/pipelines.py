@@ -0,0 +1,590 @@
+"""Run the generator crews, with caching, outside of any particular page.
+
+Every function takes the running Job (or None for headless callers) as its
+first argument so it can be handed straight to ``job_manager().submit``.
+API keys are read from ``OPENAI_API_KEY`` and ``SERPER_API_KEY``.
+"""
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from postpal import agentlog, callbacks, checks, compaction, crews, events, history, settings, tracing, tweets
+from postpal.cache import cache_key, prompt_fingerprint, result_cache
+from postpal.images import find_url, store_image
+from postpal.jobs import track_tasks
+from postpal.platforms import FAST_PLATFORMS, PLATFORM_LABELS, PLATFORMS, STAGE_LABELS, VARIANT_PLATFORMS, downstream
+from postpal.resources import chat_model, scrape_tool, search_tool
+from postpal.topics import topic_index
+
+# The handlers look the calling run up from context, so every ChatOpenAI
+# can carry the same ones. Each run gets its own ChatOpenAI (see
+# resources.chat_model), so the agents' token counters go away with it.
+_callbacks = (callbacks.StreamingHandler(), callbacks.TracingHandler(), callbacks.LoggingHandler())
+
+
+def _llm(model, temperature=0):
+    return chat_model(model, temperature, os.environ["OPENAI_API_KEY"], _callbacks)
+
+
+def _fresh(build, model):
+    """A crew for re-running a stage: ``build(llm)`` at ``RERUN_TEMPERATURE``, told to differ."""
+    return crews.rerun_crew(build(_llm(model, settings.RERUN_TEMPERATURE)))
+
+
+TEXT_MODELS = {
+    "blog": crews.BLOG_MODEL,
+    "linkedin": crews.LINKEDIN_MODEL,
+    "twitter": crews.TWITTER_MODEL,
+}
+# Quality pipelines that start with a planning stage; they run stage by stage (see ``run_stages``).
+PLANNED_PLATFORMS = ("blog", "linkedin")
+_QUALITY_CREWS = {
+    "blog": crews.blog_crew,
+    "linkedin": crews.linkedin_crew,
+    "twitter": crews.twitter_crew,
+}
+
+
+def _research_tools(platform):
+    # Blog and LinkedIn only read the top two search results.
+    return [search_tool() if platform == "twitter" else search_tool(2), scrape_tool()]
+
+
+def build_crew(platform, shared_research=False, mode="quality"):
+    """Return ``(crew, llm)`` for a text platform, as used by its generator page."""
+    if platform not in TEXT_MODELS:
+        raise ValueError(f"Unknown platform: {platform!r}")
+    llm = _llm(TEXT_MODELS[platform])
+    if mode == "fast":
+        return crews.fast_crew(platform, llm, _research_tools(platform), shared_research), llm
+    return _QUALITY_CREWS[platform](llm, _research_tools(platform), shared_research), llm
+
+
+def _cached_kickoff(page, crew, llm, topic, inputs, bypass_cache, collect, extra="", valid=None, run_crew=None):
+    """Kick ``crew`` off unless an equivalent run is cached; return ``collect``'s dict.
+
+    ``extra`` is folded into the cache key for inputs beyond the topic, and
+    ``valid`` can reject both a cached value and a fresh one from being cached.
+    ``run_crew`` (see ``_fresh``) is kicked off in place of ``crew``, without
+    looking at the cache; the key still comes from ``crew`` and ``llm``, so
+    its output replaces the cached version for later runs.
+    """
+    fingerprint = prompt_fingerprint(crew.agents, crew.tasks)
+    if extra:
+        fingerprint = hashlib.sha256((fingerprint + extra).encode("utf-8")).hexdigest()
+    key = cache_key(page, topic, llm.model_name, llm.temperature, fingerprint)
+    with tracing.span("stage", STAGE_LABELS.get(page, page)) as stage:
+        cached = None if bypass_cache or run_crew else result_cache().get(key)
+        if cached and (valid is None or valid(cached)):
+            stage.attrs["cached"] = True
+            return {**cached, "from_cache": True}
+
+        stage.attrs["cached"] = False
+        crew = run_crew or crew
+        crew.step_callback = _record_step
+        events.follow_tasks(crew, STAGE_LABELS.get(page, page))
+        output = collect(crew, crew.kickoff(inputs=inputs))
+        if valid is None or valid(output):
+            result_cache().set(key, output)
+        return {**output, "from_cache": False}
+
+
+def _record_step(step_output):
+    tracing.record_step(step_output)
+    agentlog.log_step(step_output)
+
+
+def similar_research(topic, bypass_cache=False):
+    """Research notes of an earlier, near-identical topic, or None.
+
+    Returns ``(notes, source)`` where ``source`` describes the reused topic.
+    """
+    if bypass_cache:
+        return None
+    match = topic_index().find(topic)
+    if match is None:
+        return None
+    return match["notes"], {"topic": match["topic"], "kind": match["kind"], "similarity": match["similarity"]}
+
+
+def run_research(job, topic, bypass_cache=False, progress=(0.0, 1.0)):
+    """Run the shared research phase and return ``{"research", "from_cache", "scrape_tokens_saved"}``.
+
+    Notes of a near-duplicate topic are reused instead of researching again;
+    the result then names them in ``research_reused_from``.
+    """
+    reused = similar_research(topic, bypass_cache)
+    if reused:
+        notes, source = reused
+        return {"research": notes, "from_cache": True, "scrape_tokens_saved": 0, "research_reused_from": source}
+
+    llm = _llm(crews.RESEARCH_MODEL)
+    crew = crews.research_crew(llm, [search_tool(2), scrape_tool()])
+    if job:
+        track_tasks(job, [crew], *progress)
+    with compaction.session(topic) as scrapes:
+        output = _cached_kickoff(
+            "research", crew, llm, topic, {"topic": topic}, bypass_cache,
+            lambda crew, result: {"research": result},
+        )
+    if not output["from_cache"]:
+        topic_index().add("research", topic, output["research"])
+    return {**output, "scrape_tokens_saved": scrapes.tokens_saved}
+
+
+def _collect_image(crew, result):
+    url = find_url(result)
+    if url is None:
+        return {"image": result, "thumbnail": None}
+    image, thumbnail = store_image(url)
+    return {"image": image, "thumbnail": thumbnail}
+
+
+def _image_exists(output):
+    return bool(output.get("thumbnail")) and os.path.exists(output["image"]) and os.path.exists(output["thumbnail"])
+
+
+def run_instagram(job, theme, bypass_cache=False, track=True, rerun=None, previous=None):
+    """Generate the image and the caption for ``theme`` at the same time.
+
+    The image is downloaded and stored locally; an identical theme reuses
+    the stored image as long as its file is still on disk. ``rerun="image"``
+    or ``"caption"`` regenerates only that half, keeping the other half of
+    the ``previous`` result.
+    """
+    llm = _llm(crews.INSTAGRAM_MODEL)
+    image_crew, caption_crew = crews.instagram_crews(llm)
+    stale = downstream("instagram", rerun)
+    fresh = {
+        stage: _fresh(lambda llm: crews.instagram_crews(llm)[index], crews.INSTAGRAM_MODEL)
+        for index, stage in enumerate(("image", "caption")) if stage == rerun
+    }
+    if job and track:
+        track_tasks(job, [fresh.get("image", image_crew), fresh.get("caption", caption_crew)])
+    previous = previous or {}
+    inputs = {"theme": theme}
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="postpal-instagram") as pool:
+        if "image" not in stale and _image_exists(previous):
+            image = _kept({"image": previous["image"], "thumbnail": previous["thumbnail"]})
+        else:
+            image = events.submit(
+                pool, _cached_kickoff, "instagram-image", image_crew, llm, theme, inputs,
+                bypass_cache or "image" in stale, _collect_image, valid=_image_exists, run_crew=fresh.get("image"),
+            )
+        if "caption" not in stale and previous.get("caption"):
+            caption = _kept({"caption": previous["caption"]})
+        else:
+            caption = events.submit(
+                pool, _cached_kickoff, "instagram-caption", caption_crew, llm, theme, inputs,
+                bypass_cache or "caption" in stale, lambda crew, result: {"caption": result},
+                run_crew=fresh.get("caption"),
+            )
+        image = image if isinstance(image, dict) else image.result()
+        caption = caption if isinstance(caption, dict) else caption.result()
+    return {
+        "image": image["image"], "thumbnail": image["thumbnail"], "caption": caption["caption"],
+        "from_cache": image["from_cache"] and caption["from_cache"],
+        "stages": {"image": _stage_status(image), "caption": _stage_status(caption)},
+    }
+
+
+def _kept(output):
+    """A stage output carried over from the result being re-run."""
+    return {**output, "from_cache": True, "kept": True}
+
+
+def _stage_status(output):
+    if output.get("kept"):
+        return "kept"
+    return "cached" if output["from_cache"] else "ran"
+
+
+def run_platform(
+    job, platform, topic, bypass_cache=False, research=None, track=True, mode="quality", rerun=None, previous=None,
+):
+    """Generate one platform's post for ``topic``.
+
+    Blog, LinkedIn and Twitter results are ``{"result": ..., "mode": ...}``;
+    Instagram results are ``{"image", "thumbnail", "caption"}`` with local
+    file paths. Passing ``research`` skips the platform's own planning and
+    feeds the notes to its writer. ``mode="fast"`` uses the single-pass
+    crews (see ``run_fast``); Instagram has only one mode. Every result
+    also carries its ``duration_s`` and the ``scrape_tokens_saved`` by
+    compacting scraped pages. When a near-duplicate topic was researched
+    before, its notes are used as ``research`` and the result names them in
+    ``research_reused_from``. Fresh results are added to the history.
+
+    Every stage is cached on its own (see ``platforms.STAGE_GRAPH``);
+    ``rerun`` names a stage to regenerate together with everything
+    downstream of it. The stages upstream of it are taken from ``previous``,
+    the result being re-run (or from the cache when it lacks them), and so
+    are the research notes it was written from. Results list what happened
+    to each stage in ``stages``, and carry the ``topic`` and each stage's
+    text in ``stage_texts`` so a page can offer those re-runs.
+    """
+    with tracing.trace_run(platform, topic) as run, compaction.session(topic) as scrapes, \
+            history.recording() as recording:
+        run.attrs["mode"] = mode
+        if rerun:
+            run.attrs["rerun"] = rerun
+        output = _run_platform(job, platform, topic, bypass_cache, research, track, mode, rerun, previous)
+        output = {**output, "topic": topic, "duration_s": run.duration, "scrape_tokens_saved": scrapes.tokens_saved}
+        if not output["from_cache"]:
+            output["history_id"] = _record(platform, topic, research, output, recording)
+        return output
+
+
+def _record(platform, topic, research, output, recording, text=None, **extra):
+    """Append a fresh result to the history and return its id (None if that failed).
+
+    ``text`` overrides the post taken from ``output``; keyword arguments are
+    stored with the entry's other details.
+    """
+    instagram = platform == "instagram"
+    if text is None:
+        text = output["caption"] if instagram else output["result"]
+    extra.update(
+        (name, output[name])
+        for name in ("edited", "problems", "tweet_fixes", "research_reused_from", "scrape_tokens_saved")
+        if output.get(name) and name not in extra
+    )
+    if research is not None:
+        extra["research"] = research
+    try:
+        return history.history().add(
+            platform, topic, str(text),
+            model=crews.INSTAGRAM_MODEL if instagram else TEXT_MODELS[platform],
+            mode=output.get("mode", "quality"),
+            run_id=tracing.current_trace.get().run_id if tracing.current_trace.get() else None,
+            image=output.get("image") if instagram else None,
+            thumbnail=output.get("thumbnail") if instagram else None,
+            tasks=recording.tasks,
+            timings={"total_s": round(output["duration_s"], 3)},
+            extra=extra,
+        )
+    except sqlite3.Error:
+        # Like a lost trace, a lost history entry must never fail the generation.
+        return None
+
+
+def _run_platform(job, platform, topic, bypass_cache, research, track, mode, rerun, previous):
+    if platform == "instagram":
+        return run_instagram(job, topic, bypass_cache, track, rerun, previous)
+
+    if research is not None:
+        reused = None
+    elif previous is not None:
+        # A re-run keeps the notes the earlier result was written from, even
+        # if the topic index would pick other ones by now.
+        reused = (previous["notes"], previous["research_reused_from"]) if previous.get("notes") else None
+    else:
+        reused = similar_research(topic, bypass_cache)
+    if reused:
+        research, source = reused
+        output = _run_text_platform(job, platform, topic, bypass_cache, research, track, mode, rerun, previous)
+        return {**output, "research_reused_from": source, "notes": research}
+    return _run_text_platform(job, platform, topic, bypass_cache, research, track, mode, rerun, previous)
+
+
+def _run_text_platform(job, platform, topic, bypass_cache, research, track, mode, rerun, previous):
+    if mode == "fast" and platform in FAST_PLATFORMS:
+        return run_fast(job, platform, topic, bypass_cache, research, track, rerun, previous)
+    if platform in PLANNED_PLATFORMS:
+        return run_stages(job, platform, topic, bypass_cache, research, track, rerun, previous)
+
+    crew, llm = build_crew(platform, shared_research=research is not None)
+    fresh = None
+    if rerun == "tweet":
+        fresh = _fresh(
+            lambda llm: _QUALITY_CREWS[platform](llm, _research_tools(platform), research is not None),
+            TEXT_MODELS[platform],
+        )
+    if job and track:
+        track_tasks(job, [fresh or crew])
+    inputs = {"topic": topic}
+    if research is not None:
+        inputs["research"] = research
+    output = _cached_kickoff(
+        platform, crew, llm, topic, inputs, bypass_cache or "tweet" in downstream(platform, rerun),
+        lambda crew, result: {"result": result}, extra=research or "", run_crew=fresh,
+    )
+    output = {**output, "stages": {"tweet": _stage_status(output)}, "stage_texts": {"tweet": output["result"]}}
+    if platform == "twitter":
+        output = _finish_tweet(output, topic, research)
+    return {**output, "mode": "quality"}
+
+
+def run_stages(job, platform, topic, bypass_cache=False, research=None, track=True, rerun=None, previous=None):
+    """Run the Blog or LinkedIn quality pipeline one cached stage at a time.
+
+    plan -> write -> edit, each kicked off as its own crew and cached by its
+    inputs (the topic, plus the plan or the draft it reads), so regenerating
+    only runs the stages whose inputs changed, plus ``rerun`` and the stages
+    after it. ``rerun`` itself runs warmer and is asked for a different
+    version; earlier stages keep their text from ``previous``. With
+    ``research`` the plan stage is skipped and the writer reads the research
+    instead.
+    """
+    model = TEXT_MODELS[platform]
+    llm = _llm(model)
+    tools = _research_tools(platform)
+    shared_research = research is not None
+    stages = crews.stage_crews(platform, llm, tools, shared_research=shared_research)
+    if shared_research:
+        del stages["plan"]
+    fresh = {}
+    if rerun in stages:
+        fresh[rerun] = _fresh(lambda llm: crews.stage_crews(platform, llm, tools, shared_research)[rerun], model)
+    if job and track:
+        track_tasks(job, [fresh.get(stage, crew) for stage, crew in stages.items()])
+    stale = downstream(platform, rerun)
+    kept = (previous or {}).get("stage_texts", {})
+
+    def kickoff(stage, inputs, upstream=""):
+        if stage not in stale and stage in kept:
+            return _kept({"text": kept[stage]})
+        return _cached_kickoff(
+            f"{platform}-{stage}", stages[stage], llm, topic, {"topic": topic, **inputs},
+            bypass_cache or stage in stale, lambda crew, result: {"text": str(result)}, extra=upstream,
+            run_crew=fresh.get(stage),
+        )
+
+    outputs = {}
+    notes = research
+    if research is None:
+        outputs["plan"] = kickoff("plan", {})
+        notes = outputs["plan"]["text"]
+        if not outputs["plan"]["from_cache"]:
+            # The planner's notes are research a similar topic can reuse.
+            topic_index().add(f"{platform} plan", topic, notes)
+    outputs["write"] = kickoff("write", {"research": notes}, notes)
+    outputs["edit"] = kickoff("edit", {"draft": outputs["write"]["text"]}, outputs["write"]["text"])
+
+    result = {
+        "result": outputs["edit"]["text"],
+        "from_cache": all(output["from_cache"] for output in outputs.values()),
+        "stages": {stage: _stage_status(output) for stage, output in outputs.items()},
+        "stage_texts": {stage: output["text"] for stage, output in outputs.items()},
+        "mode": "quality",
+    }
+    if research is None:
+        result["plan"] = notes
+    return result
+
+
+def _finish_tweet(output, topic, research):
+    """Fix length, links and hashtags of a tweet locally (see ``tweets.finalize``).
+
+    Applied after the result cache, so it also covers cached drafts; link
+    checks and hashtag lists have their own cache.
+    """
+    tweet, fixes = tweets.finalize(output["result"], topic, research or "")
+    return {**output, "result": tweet, "tweet_fixes": fixes}
+
+
+def run_fast(job, platform, topic, bypass_cache=False, research=None, track=True, rerun=None, previous=None):
+    """Draft in one task, and only run the editor if the draft fails the checks.
+
+    The result has the quality mode's shape plus ``edited`` and the
+    ``problems`` the checks found in the draft. The draft counts as the
+    ``write`` stage (``tweet`` on Twitter) for ``rerun``; re-running only
+    the edit keeps the draft of ``previous``.
+    """
+    stale = downstream(platform, rerun)
+    draft_stage = "tweet" if platform == "twitter" else "write"
+    redraft = draft_stage in stale
+    kept = (previous or {}).get("stage_texts", {})
+    crew, llm = build_crew(platform, shared_research=research is not None, mode="fast")
+    fresh = {}
+    if rerun == draft_stage:
+        fresh[draft_stage] = _fresh(
+            lambda llm: crews.fast_crew(platform, llm, _research_tools(platform), research is not None),
+            TEXT_MODELS[platform],
+        )
+    elif rerun == "edit":
+        fresh["edit"] = _fresh(lambda llm: crews.edit_crew(platform, llm), TEXT_MODELS[platform])
+    if job and track:
+        track_tasks(job, [fresh.get(draft_stage, crew)])
+    inputs = {"topic": topic}
+    if research is not None:
+        inputs["research"] = research
+    if not redraft and draft_stage in kept:
+        draft = _kept({"result": kept[draft_stage]})
+    else:
+        draft = _cached_kickoff(
+            f"{platform}-fast", crew, llm, topic, inputs, bypass_cache or redraft,
+            lambda crew, result: {"result": result}, extra=research or "",
+            run_crew=fresh.get(draft_stage),
+        )
+    texts = {draft_stage: draft["result"]}
+    if platform == "twitter":
+        draft = _finish_tweet(draft, topic, research)
+    problems = checks.check_post(platform, draft["result"])
+    if not problems:
+        return {
+            **draft, "mode": "fast", "edited": False, "problems": [],
+            "stages": {draft_stage: _stage_status(draft)}, "stage_texts": texts,
+        }
+
+    edited = _cached_kickoff(
+        f"{platform}-fast-edit", crews.edit_crew(platform, llm), llm, topic,
+        {"topic": topic, "draft": draft["result"], "problems": "\n".join(f"- {p}" for p in problems)},
+        bypass_cache or redraft or "edit" in stale, lambda crew, result: {"result": result}, extra=draft["result"],
+        run_crew=fresh.get("edit"),
+    )
+    texts["edit"] = edited["result"]
+    if platform == "twitter":
+        edited = _finish_tweet(edited, topic, research)
+    return {
+        **edited, "from_cache": draft["from_cache"] and edited["from_cache"],
+        "mode": "fast", "edited": True, "problems": problems,
+        "stages": {draft_stage: _stage_status(draft), "edit": _stage_status(edited)},
+        "stage_texts": texts,
+    }
+
+
+def run_variants(job, platform, topic, count=3, bypass_cache=False):
+    """Write ``count`` variants of a post for A/B testing in one generation step.
+
+    LinkedIn and Twitter variants share one research pass (reused like any
+    other, see ``run_research``) and are drafted by a single task without
+    tools. Tweets then go through ``tweets.finalize``; LinkedIn posts are
+    checked but not edited, their ``problems`` are listed per variant.
+    Instagram writes ``count`` captions for one image. The result has a
+    ``variants`` list plus ``research`` or the image fields, and every
+    variant is added to the history.
+    """
+    if platform not in VARIANT_PLATFORMS:
+        raise ValueError(f"Variants are not supported for {platform!r}")
+    with tracing.trace_run(platform, topic) as run, compaction.session(topic) as scrapes, \
+            history.recording() as recording:
+        run.attrs["mode"] = "variants"
+        output = _run_variants(job, platform, topic, count, bypass_cache)
+        output = {
+            **output, "mode": "variants", "duration_s": run.duration, "scrape_tokens_saved": scrapes.tokens_saved,
+        }
+        if not output["from_cache"]:
+            research = output.get("research", {}).get("research")
+            output["history_ids"] = [
+                _record(
+                    platform, topic, research, output, recording, text=variant,
+                    variant=index + 1, variants=len(output["variants"]),
+                    problems=output["problems"][index], tweet_fixes=output["tweet_fixes"][index],
+                )
+                for index, variant in enumerate(output["variants"])
+            ]
+        return output
+
+
+def _run_variants(job, platform, topic, count, bypass_cache):
+    llm = _llm(crews.INSTAGRAM_MODEL if platform == "instagram" else TEXT_MODELS[platform])
+    crew = crews.variants_crew(platform, llm, count)
+
+    def complete(output):
+        # A short answer is still shown, but not cached.
+        return len(output["variants"]) == count
+
+    def collect(crew, result):
+        return {"variants": crews.split_variants(result)}
+
+    if platform == "instagram":
+        image_crew, _ = crews.instagram_crews(llm)
+        if job:
+            track_tasks(job, [image_crew, crew])
+        inputs = {"theme": topic}
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="postpal-instagram") as pool:
+            image = events.submit(
+                pool, _cached_kickoff, "instagram-image", image_crew, llm, topic, inputs, bypass_cache,
+                _collect_image, valid=_image_exists,
+            )
+            captions = events.submit(
+                pool, _cached_kickoff, "instagram-variants", crew, llm, topic, inputs, bypass_cache,
+                collect, valid=complete,
+            )
+            image, captions = image.result(), captions.result()
+        variants = captions["variants"]
+        return {
+            **image, "variants": variants, "problems": [[] for _ in variants], "tweet_fixes": [[] for _ in variants],
+            "from_cache": image["from_cache"] and captions["from_cache"],
+        }
+
+    if job:
+        job.update(0.0, "Researching the topic...")
+    research = run_research(job, topic, bypass_cache, progress=(0.0, 0.5))
+    if job:
+        job.publish("research", research)
+        track_tasks(job, [crew], 0.5, 1.0)
+    drafts = _cached_kickoff(
+        f"{platform}-variants", crew, llm, topic, {"topic": topic, "research": research["research"]}, bypass_cache,
+        collect, extra=research["research"], valid=complete,
+    )
+    variants, fixes = [], []
+    for draft in drafts["variants"]:
+        if platform == "twitter":
+            draft, changed = tweets.finalize(draft, topic, research["research"])
+        else:
+            changed = []
+        variants.append(draft)
+        fixes.append(changed)
+    output = {
+        "variants": variants,
+        "problems": [checks.check_post(platform, variant) for variant in variants],
+        "tweet_fixes": fixes,
+        "research": research,
+        "from_cache": research["from_cache"] and drafts["from_cache"],
+    }
+    if research.get("research_reused_from"):
+        output["research_reused_from"] = research["research_reused_from"]
+    return output
+
+
+def run_all_platforms(job, topic, platforms=PLATFORMS, bypass_cache=False, mode="quality"):
+    """Research once, then run every platform's writing chain concurrently.
+
+    Each platform's result is published on the job as soon as it is ready,
+    so callers can render it without waiting for the slowest chain.
+    """
+    with tracing.trace_run("all", topic):
+        return _run_all_platforms(job, topic, platforms, bypass_cache, mode)
+
+
+def _run_all_platforms(job, topic, platforms, bypass_cache, mode):
+    research = None
+    results = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=len(platforms), thread_name_prefix="postpal-chain") as pool:
+        def submit(platform, notes):
+            return events.submit(pool, run_platform, job, platform, topic, bypass_cache, notes, False, mode)
+
+        # Instagram does not use the shared research, so it runs alongside it.
+        futures = {submit(platform, None): platform for platform in platforms if platform == "instagram"}
+        writers = [platform for platform in platforms if platform != "instagram"]
+        if writers:
+            if job:
+                job.update(0.0, "Researching the topic...")
+            try:
+                research = run_research(job, topic, bypass_cache, progress=(0.0, 0.3))
+            except Exception as e:
+                for platform in writers:
+                    errors[platform] = e
+                    results[platform] = {"error": str(e), "from_cache": False}
+            else:
+                if job:
+                    job.publish("research", research)
+                futures.update({submit(platform, research["research"]): platform for platform in writers})
+
+        for future in as_completed(futures):
+            platform = futures[future]
+            try:
+                results[platform] = future.result()
+            except Exception as e:
+                errors[platform] = e
+                results[platform] = {"error": str(e), "from_cache": False}
+            if job:
+                job.publish(platform, results[platform])
+                job.update(0.3 + 0.7 * len(results) / len(platforms), f"Finished: {PLATFORM_LABELS[platform]}")
+
+    if errors and len(errors) == len(platforms):
+        raise next(iter(errors.values()))
+    return {"research": research, "platforms": results}
@@ -0,0 +1,83 @@
+"""Names and labels of the supported platforms.
+
+Kept free of heavy imports so pages can render their widgets without
+loading CrewAI.
+"""
+PLATFORMS = ("blog", "linkedin", "twitter", "instagram")
+
+PLATFORM_LABELS = {
+    "blog": "Blog post",
+    "linkedin": "LinkedIn post",
+    "twitter": "Tweet",
+    "instagram": "Instagram post",
+}
+
+# "quality" runs the full multi-agent crews; "fast" drafts in one pass and
+# only calls the editor when the draft fails the deterministic checks.
+MODES = ("quality", "fast")
+MODE_LABELS = {"quality": "Quality", "fast": "Fast"}
+# Platforms whose crews have a fast variant.
+FAST_PLATFORMS = ("blog", "linkedin", "twitter")
+
+# A/B variants: several drafts from one research pass in one generation step.
+VARIANT_PLATFORMS = ("linkedin", "twitter", "instagram")
+MAX_VARIANTS = 5
+
+# Stages of each pipeline and the stages whose output they read. Every
+# stage's output is cached by its inputs, so re-running one stage re-runs
+# only the stages downstream of it.
+STAGE_GRAPH = {
+    "blog": {"plan": (), "write": ("plan",), "edit": ("write",)},
+    "linkedin": {"plan": (), "write": ("plan",), "edit": ("write",)},
+    "twitter": {"tweet": ()},
+    "instagram": {"image": (), "caption": ()},
+}
+
+# Buttons offered under a finished post: (stage to re-run, label).
+RERUN_ACTIONS = {
+    "blog": (("edit", "Re-edit"), ("write", "Re-write from same plan")),
+    "linkedin": (("edit", "Re-edit"), ("write", "Re-write from same plan")),
+    "instagram": (("image", "New image, keep caption"), ("caption", "New caption, keep image")),
+}
+
+
+def downstream(platform, stage):
+    """``stage`` and every stage of ``platform`` that depends on it, directly or not."""
+    if stage is None:
+        return set()
+    graph = STAGE_GRAPH[platform]
+    stale = {stage}
+    changed = True
+    while changed:
+        changed = False
+        for name, inputs in graph.items():
+            if name not in stale and stale.intersection(inputs):
+                stale.add(name)
+                changed = True
+    return stale
+
+
+# Prefixes for the per-task sections of the event stream.
+STAGE_LABELS = {
+    "research": "Research",
+    "blog": "Blog",
+    "linkedin": "LinkedIn",
+    "twitter": "Twitter",
+    "blog-plan": "Blog (plan)",
+    "blog-write": "Blog (write)",
+    "blog-edit": "Blog (edit)",
+    "linkedin-plan": "LinkedIn (plan)",
+    "linkedin-write": "LinkedIn (write)",
+    "linkedin-edit": "LinkedIn (edit)",
+    "blog-fast": "Blog (fast)",
+    "linkedin-fast": "LinkedIn (fast)",
+    "twitter-fast": "Twitter (fast)",
+    "blog-fast-edit": "Blog (fast edit)",
+    "linkedin-fast-edit": "LinkedIn (fast edit)",
+    "twitter-fast-edit": "Twitter (fast edit)",
+    "linkedin-variants": "LinkedIn (variants)",
+    "twitter-variants": "Twitter (variants)",
+    "instagram-variants": "Instagram captions (variants)",
+    "instagram-image": "Instagram image",
+    "instagram-caption": "Instagram caption",
+}
@@ -0,0 +1,267 @@
+"""Process-wide scheduler for rate-limited APIs.
+
+Every OpenAI call (chat and images, through the shared httpx client) and
+every Serper search goes through a ``Limiter`` for its model or service
+before it is sent:
+
+- two token buckets enforce requests per minute and, for chat models,
+  estimated tokens per minute (see ``settings.RATE_LIMITS``);
+- waiting calls are served by priority first (interactive page runs before
+  batch work) and then round-robin across sessions, so one busy session
+  cannot starve the others;
+- a 429 pauses the whole resource for its ``Retry-After`` (or an
+  exponential backoff) with jitter, and the call is retried.
+
+Callers identify themselves with ``client(session, priority)``; the job
+engine does this for every page run. Queue depth, waits and 429s are kept
+per resource and exported with the other metrics.
+"""
+import contextvars
+import itertools
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from postpal import settings, tracing
+
+INTERACTIVE = 0
+BATCH = 1
+
+current_client = contextvars.ContextVar("postpal_ratelimit_client", default=("anonymous", INTERACTIVE))
+
+# Waits shorter than this are not worth a span in the trace.
+_TRACE_MIN_WAIT = 0.05
+
+
+@contextmanager
+def client(session, priority=INTERACTIVE):
+    """Attribute rate-limited calls made in this context to ``session``."""
+    token = current_client.set((session, priority))
+    try:
+        yield
+    finally:
+        current_client.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, per_minute, burst_seconds):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount, now):
+        """Seconds until ``amount`` can be taken (amounts above capacity wait for a full bucket)."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount):
+        self.level -= min(amount, self.capacity)
+
+
+class _Waiter:
+    __slots__ = ("session", "priority", "seq", "tokens")
+
+    def __init__(self, session, priority, seq, tokens):
+        self.session = session
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+
+
+class Limiter:
+    def __init__(self, name, rpm=None, tpm=None, burst_seconds=10):
+        self.name = name
+        self.requests = TokenBucket(rpm, burst_seconds) if rpm else None
+        self.tokens = TokenBucket(tpm, burst_seconds) if tpm else None
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        self._last_served = {}
+        self._paused_until = 0.0
+        self.granted = 0
+        self.rate_limited = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+
+    def _next(self):
+        # Highest priority first, then the session served longest ago, then FIFO.
+        return min(self._waiting, key=lambda w: (w.priority, self._last_served.get(w.session, 0.0), w.seq))
+
+    def _delay(self, tokens):
+        now = time.monotonic()
+        delays = [self._paused_until - now]
+        if self.requests:
+            delays.append(self.requests.delay(1, now))
+        if self.tokens and tokens:
+            delays.append(self.tokens.delay(tokens, now))
+        return max(delays)
+
+    def acquire(self, tokens=0):
+        """Block until this call may be sent; returns the seconds spent waiting."""
+        session, priority = current_client.get()
+        started = time.monotonic()
+        with self._cond:
+            waiter = _Waiter(session, priority, next(self._seq), tokens)
+            self._waiting.append(waiter)
+            try:
+                while True:
+                    delay = self._delay(tokens) if self._next() is waiter else None
+                    if delay is not None and delay <= 0:
+                        break
+                    self._cond.wait(delay)
+            finally:
+                self._waiting.remove(waiter)
+                self._cond.notify_all()
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens and tokens:
+                self.tokens.take(tokens)
+            now = time.monotonic()
+            self._last_served[session] = now
+            waited = now - started
+            self.granted += 1
+            self.wait_seconds += waited
+            self.max_wait = max(self.max_wait, waited)
+
+        if waited >= _TRACE_MIN_WAIT:
+            span = tracing.start_span("queue", self.name, wait_s=round(waited, 3))
+            span.start -= waited
+            tracing.end_span(span)
+        return waited
+
+    def pause(self, seconds):
+        """Hold every caller back for ``seconds``, e.g. after a 429."""
+        with self._cond:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "resource": self.name,
+                "queue_depth": len(self._waiting),
+                "granted": self.granted,
+                "rate_limited": self.rate_limited,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "avg_wait_s": round(self.wait_seconds / self.granted, 3) if self.granted else 0.0,
+                "max_wait_s": round(self.max_wait, 3),
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter(resource):
+    """The limiter for a model or service name, or None when it has no limits configured."""
+    if not resource:
+        return None
+    # Dated model names ("gpt-4o-mini-2024-07-18") share their family's limits.
+    name = next((n for n in sorted(settings.RATE_LIMITS, key=len, reverse=True) if resource.startswith(n)), None)
+    if name is None:
+        return None
+    with _limiters_lock:
+        if name not in _limiters:
+            limits = settings.RATE_LIMITS[name]
+            _limiters[name] = Limiter(
+                name, limits.get("rpm"), limits.get("tpm"), burst_seconds=settings.RATE_LIMIT_BURST_SECONDS,
+            )
+        return _limiters[name]
+
+
+def stats():
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [item.stats() for item in limiters]
+
+
+def retry_after(headers):
+    """Seconds to wait according to a 429's headers, or None."""
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                # An HTTP date; not worth parsing for the few seconds involved.
+                continue
+    return None
+
+
+def call(resource, send, tokens=0):
+    """``send()`` an HTTP request through ``resource``'s limiter, retrying on 429.
+
+    ``send`` must return a requests or httpx response and may be called
+    several times.
+    """
+    limit = limiter(resource)
+    if limit is None:
+        return send()
+    for attempt in itertools.count():
+        limit.acquire(tokens)
+        response = send()
+        if response.status_code != 429 or attempt >= settings.RATE_LIMIT_MAX_RETRIES:
+            return response
+        delay = retry_after(response.headers) or settings.RATE_LIMIT_BACKOFF * 2 ** attempt
+        limit.pause(delay * random.uniform(1.0, 1.5))
+        response.close()
+
+
+def chat_tokens(payload):
+    """Tokens a chat completion request counts against its model's limit.
+
+    The text of its messages (not the JSON around them), a few tokens of
+    overhead per message, and ``max_tokens`` or, when the request does not
+    set it, ``RATE_LIMIT_COMPLETION_TOKENS``.
+    """
+    messages = payload.get("messages") or []
+    texts = []
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        texts.append(str(content))
+    prompt = tracing.estimate_tokens("\n".join(texts), payload.get("model")) + 4 * len(messages)
+    completion = payload.get("max_tokens") or settings.RATE_LIMIT_COMPLETION_TOKENS
+    return prompt + completion
+
+
+class RateLimitedTransport:
+    """httpx transport wrapper that schedules OpenAI chat and image requests.
+
+    The model is read from the request body and the token cost of a chat
+    call is estimated with ``chat_tokens``.
+    """
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    def handle_request(self, request):
+        path = request.url.path
+        if not path.endswith(("/chat/completions", "/images/generations")):
+            return self._transport.handle_request(request)
+        try:
+            payload = json.loads(request.read())
+        except ValueError:
+            payload = {}
+        tokens = chat_tokens(payload) if path.endswith("/chat/completions") else 0
+        return call(payload.get("model"), lambda: self._transport.handle_request(request), tokens)
+
+    def close(self):
+        self._transport.close()
+
+    def __enter__(self):
+        self._transport.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._transport.__exit__(*exc)
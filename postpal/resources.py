@@ -0,0 +1,120 @@
+"""Process-wide clients, connection pools and tools.
+
+The OpenAI SDK client, HTTP sessions and tool objects are built once per
+process and shared by every session and job (ChatOpenAI instances are cheap
+and built per crew, over the shared HTTP client), so warm processes
+reuse keep-alive connections instead of paying a new TLS handshake per call.
+Everything here is safe to use from several threads at once, and the heavy
+client libraries are only imported when something first asks for them.
+"""
+import functools
+import os
+import threading
+
+from postpal import settings
+
+_lock = threading.Lock()
+
+
+def shared(fn):
+    """Like functools.cache, but builds each value only once under concurrent first calls."""
+    values = {}
+    lock = threading.RLock()
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        try:
+            return values[args]
+        except KeyError:
+            pass
+        with lock:
+            if args not in values:
+                values[args] = fn(*args)
+            return values[args]
+
+    return wrapper
+
+
+def configure_api_keys(openai_api_key, serper_api_key=None):
+    """Export the API keys for libraries that read them from the environment.
+
+    Only writes when a key actually changed, so reruns do not touch os.environ.
+    """
+    with _lock:
+        if os.environ.get("OPENAI_API_KEY") != openai_api_key:
+            os.environ["OPENAI_API_KEY"] = openai_api_key
+        if serper_api_key and os.environ.get("SERPER_API_KEY") != serper_api_key:
+            os.environ["SERPER_API_KEY"] = serper_api_key
+
+
+@shared
+def http_client():
+    """Pooled keep-alive client shared by every OpenAI call (chat and images).
+
+    Requests go through the rate-limit scheduler before they are sent.
+    """
+    import httpx
+
+    from postpal.ratelimit import RateLimitedTransport
+
+    transport = httpx.HTTPTransport(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_POOL_SIZE,
+            max_keepalive_connections=settings.HTTP_POOL_SIZE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+    return httpx.Client(timeout=settings.HTTP_TIMEOUT, transport=RateLimitedTransport(transport))
+
+
+@shared
+def http_session():
+    """Pooled keep-alive session for Serper, scraped sites and image downloads."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=settings.HTTP_POOL_SIZE, pool_maxsize=settings.HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@shared
+def openai_client(api_key):
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key, base_url=settings.OPENAI_BASE_URL, http_client=http_client())
+
+
+def chat_model(model, temperature, api_key, callbacks=()):
+    """A new ChatOpenAI over the shared HTTP client; build one per crew.
+
+    The instance itself is not shared: every CrewAI Agent appends a token
+    counter to its LLM's callbacks, so a process-wide instance would collect
+    one more handler per agent and run. ``callbacks`` must be process-wide
+    handlers that look up the calling run themselves (see
+    events.StreamingHandler), never per-run state.
+    """
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model, temperature=temperature, api_key=api_key, base_url=settings.OPENAI_BASE_URL,
+        http_client=http_client(), streaming=True, callbacks=list(callbacks),
+    )
+
+
+@shared
+def search_tool(n_results=None):
+    from postpal.tools import CachedSerperDevTool
+
+    if n_results is None:
+        return CachedSerperDevTool(search_url=settings.SERPER_URL)
+    return CachedSerperDevTool(search_url=settings.SERPER_URL, n_results=n_results)
+
+
+@shared
+def scrape_tool():
+    from postpal.tools import CachedScrapeWebsiteTool
+
+    return CachedScrapeWebsiteTool()
@@ -0,0 +1,105 @@
+"""Runtime settings for the generator pages.
+
+Everything here can be overridden through environment variables so the same
+code runs unchanged on Streamlit Cloud, in a container or on a laptop.
+"""
+import json
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.environ.get("POSTPAL_CACHE_DIR", ROOT_DIR / ".cache"))
+
+# --- Result cache (crew.kickoff outputs) ---
+RESULT_CACHE_TTL = int(os.environ.get("POSTPAL_RESULT_CACHE_TTL", 7 * 24 * 3600))
+RESULT_CACHE_MEMORY_ITEMS = int(os.environ.get("POSTPAL_RESULT_CACHE_MEMORY_ITEMS", 128))
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("POSTPAL_RESULT_CACHE_MAX_ENTRIES", 5000))
+
+# --- Topic index (reuse research for near-duplicate topics) ---
+# TF-IDF cosine similarity from 0 to 1; set above 1 to turn reuse off.
+TOPIC_SIMILARITY_THRESHOLD = float(os.environ.get("POSTPAL_TOPIC_SIMILARITY_THRESHOLD", 0.7))
+TOPIC_INDEX_MAX_ENTRIES = int(os.environ.get("POSTPAL_TOPIC_INDEX_MAX_ENTRIES", 5000))
+
+# --- Tool cache (Serper searches and website scrapes) ---
+SEARCH_CACHE_TTL = int(os.environ.get("POSTPAL_SEARCH_CACHE_TTL", 6 * 3600))
+SCRAPE_CACHE_TTL = int(os.environ.get("POSTPAL_SCRAPE_CACHE_TTL", 24 * 3600))
+# Scraped pages are cut down to the chunks most relevant to the topic.
+SCRAPE_TOKEN_BUDGET = int(os.environ.get("POSTPAL_SCRAPE_TOKEN_BUDGET", 1500))
+SCRAPE_CHUNK_TOKENS = int(os.environ.get("POSTPAL_SCRAPE_CHUNK_TOKENS", 150))
+TOOL_CACHE_MEMORY_ITEMS = int(os.environ.get("POSTPAL_TOOL_CACHE_MEMORY_ITEMS", 256))
+TOOL_CACHE_MAX_ENTRIES = int(os.environ.get("POSTPAL_TOOL_CACHE_MAX_ENTRIES", 20000))
+
+# --- Background jobs ---
+JOB_WORKERS = int(os.environ.get("POSTPAL_JOB_WORKERS", 4))
+JOB_MAX_ACTIVE = int(os.environ.get("POSTPAL_JOB_MAX_ACTIVE", 16))
+JOB_MAX_PER_SESSION = int(os.environ.get("POSTPAL_JOB_MAX_PER_SESSION", 2))
+JOB_RETENTION = int(os.environ.get("POSTPAL_JOB_RETENTION", 3600))
+
+# --- Generated images ---
+IMAGE_DIR = Path(os.environ.get("POSTPAL_IMAGE_DIR", CACHE_DIR / "images"))
+THUMBNAIL_SIZE = int(os.environ.get("POSTPAL_THUMBNAIL_SIZE", 512))
+
+# --- Tracing and metrics ---
+TRACE_DB = Path(os.environ.get("POSTPAL_TRACE_DB", CACHE_DIR / "traces.sqlite"))
+METRICS_FILE = Path(os.environ.get("POSTPAL_METRICS_FILE", CACHE_DIR / "metrics.prom"))
+TRACE_RETENTION_RUNS = int(os.environ.get("POSTPAL_TRACE_RETENTION_RUNS", 5000))
+# Minimum seconds between two refreshes of METRICS_FILE.
+METRICS_INTERVAL = float(os.environ.get("POSTPAL_METRICS_INTERVAL", 15))
+
+# --- Re-running one stage of a post ---
+# Crews normally run at temperature 0; a re-run stage runs warmer so it
+# actually comes back different.
+RERUN_TEMPERATURE = float(os.environ.get("POSTPAL_RERUN_TEMPERATURE", 0.8))
+
+# --- History of generated posts ---
+HISTORY_DB = Path(os.environ.get("POSTPAL_HISTORY_DB", CACHE_DIR / "history.sqlite"))
+HISTORY_PAGE_SIZE = int(os.environ.get("POSTPAL_HISTORY_PAGE_SIZE", 20))
+
+# --- Agent log (see postpal.agentlog) ---
+# DEBUG adds LLM calls, tool observations and task outputs to the INFO lines.
+LOG_LEVEL = os.environ.get("POSTPAL_LOG_LEVEL", "INFO").upper()
+# Level for copying records to stderr, or OFF.
+LOG_CONSOLE_LEVEL = os.environ.get("POSTPAL_LOG_CONSOLE_LEVEL", "WARNING").upper()
+LOG_FILE = Path(os.environ.get("POSTPAL_LOG_FILE", CACHE_DIR / "logs" / "agents.jsonl"))
+LOG_MAX_BYTES = int(os.environ.get("POSTPAL_LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get("POSTPAL_LOG_BACKUP_COUNT", 5))
+LOG_QUEUE_SIZE = int(os.environ.get("POSTPAL_LOG_QUEUE_SIZE", 10000))
+LOG_BUFFER_LINES = int(os.environ.get("POSTPAL_LOG_BUFFER_LINES", 500))
+LOG_BUFFER_SESSIONS = int(os.environ.get("POSTPAL_LOG_BUFFER_SESSIONS", 256))
+LOG_MAX_CHARS = int(os.environ.get("POSTPAL_LOG_MAX_CHARS", 2000))
+# Turn CrewAI's own verbose console output back on, for debugging prompts.
+CREW_VERBOSE = os.environ.get("POSTPAL_CREW_VERBOSE", "0") == "1"
+
+# --- Shared HTTP connections ---
+HTTP_POOL_SIZE = int(os.environ.get("POSTPAL_HTTP_POOL_SIZE", 32))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("POSTPAL_HTTP_KEEPALIVE_EXPIRY", 120))
+HTTP_TIMEOUT = float(os.environ.get("POSTPAL_HTTP_TIMEOUT", 120))
+
+# --- Rate limits (per process, see postpal.ratelimit) ---
+# Requests and tokens per minute per model, and requests per minute for
+# Serper. The model defaults are OpenAI's usage tier 2; a tier 1 account
+# (30k tokens/min for gpt-4o) should lower them, or one busy page will run
+# into 429s. Override or extend with JSON, e.g.
+# POSTPAL_RATE_LIMITS='{"gpt-4o": {"rpm": 500, "tpm": 30000}}'.
+RATE_LIMITS = {
+    "gpt-4o": {"rpm": 5000, "tpm": 450000},
+    "gpt-4o-mini": {"rpm": 5000, "tpm": 2000000},
+    "dall-e-3": {"rpm": 50},
+    "serper": {"rpm": 300},
+}
+RATE_LIMITS.update(json.loads(os.environ.get("POSTPAL_RATE_LIMITS", "{}")))
+# How many seconds' worth of calls may go out in one burst.
+RATE_LIMIT_BURST_SECONDS = float(os.environ.get("POSTPAL_RATE_LIMIT_BURST_SECONDS", 10))
+RATE_LIMIT_MAX_RETRIES = int(os.environ.get("POSTPAL_RATE_LIMIT_MAX_RETRIES", 5))
+# First backoff after a 429 without Retry-After; doubles on every retry.
+RATE_LIMIT_BACKOFF = float(os.environ.get("POSTPAL_RATE_LIMIT_BACKOFF", 1.0))
+# Completion tokens assumed per chat call when charging the tokens/min bucket.
+RATE_LIMIT_COMPLETION_TOKENS = int(os.environ.get("POSTPAL_RATE_LIMIT_COMPLETION_TOKENS", 500))
+
+# --- API endpoints (point these at local stubs to benchmark offline) ---
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL") or None
+SERPER_URL = os.environ.get("POSTPAL_SERPER_URL", "https://google.serper.dev/search")
+
+# --- Startup ---
+# Import CrewAI and friends in the background once a page has rendered.
+PREWARM = os.environ.get("POSTPAL_PREWARM", "1") != "0"
@@ -0,0 +1,77 @@
+"""Process-wide, deduplicating cache for research tool calls.
+
+Identical searches and scrapes are fetched once: concurrent callers asking
+for the same key wait on the single in-flight fetch instead of issuing their
+own request, and finished results are persisted so a restart does not start
+cold.
+"""
+import threading
+from concurrent.futures import Future
+
+from postpal import settings
+from postpal.cache import ResultCache
+from postpal.store import SqliteStore
+
+
+class ToolCache:
+    def __init__(self, cache):
+        self.cache = cache
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.deduplicated = 0
+
+    def get_or_fetch(self, key, fetch, ttl=None, cacheable=lambda value: True):
+        """Return the cached value for ``key``, calling ``fetch`` at most once."""
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.deduplicated += 1
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            if value is not None and cacheable(value):
+                self.cache.set(key, value, ttl=ttl)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self):
+        stats = self.cache.stats()
+        with self._lock:
+            stats["deduplicated"] = self.deduplicated
+            stats["inflight"] = len(self._inflight)
+        return stats
+
+
+_tool_cache = None
+_tool_cache_lock = threading.Lock()
+
+
+def tool_cache():
+    """Return the process-wide tool cache, creating it on first use."""
+    global _tool_cache
+    with _tool_cache_lock:
+        if _tool_cache is None:
+            store = SqliteStore(
+                settings.CACHE_DIR / "tools.sqlite",
+                table="tool_results",
+                max_entries=settings.TOOL_CACHE_MAX_ENTRIES,
+            )
+            _tool_cache = ToolCache(ResultCache(store, memory_items=settings.TOOL_CACHE_MEMORY_ITEMS))
+        return _tool_cache
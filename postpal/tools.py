@@ -0,0 +1,142 @@
+"""Tools shared by the generator crews.
+
+The research tools route their results through the shared tool cache and
+fetch over the process-wide keep-alive HTTP session instead of opening a new
+connection per call. Scraped pages are stripped of boilerplate and then
+compacted for the run's topic before an agent sees them.
+"""
+import json
+import os
+import re
+
+from bs4 import BeautifulSoup
+from crewai_tools import ScrapeWebsiteTool, SerperDevTool, tool
+
+from postpal import compaction, ratelimit, settings, tracing
+from postpal.resources import http_session, openai_client
+from postpal.tool_cache import tool_cache
+
+
+class CachedSerperDevTool(SerperDevTool):
+    def _run(self, **kwargs):
+        query = kwargs.get("search_query") or kwargs.get("query") or ""
+        key = f"serper|{self.search_url}|{self.n_results}|{' '.join(query.lower().split())}"
+        with tracing.span("tool", "serper search", query=query, fetched=False) as span:
+            def fetch_traced():
+                span.attrs["fetched"] = True
+                return self._search(query)
+            return tool_cache().get_or_fetch(
+                key,
+                fetch_traced,
+                ttl=settings.SEARCH_CACHE_TTL,
+                # Serper returns the raw error payload as a dict; only cache real results.
+                cacheable=lambda value: isinstance(value, str),
+            )
+
+    def _search(self, query):
+        # Same request and output format as SerperDevTool._run, over the pooled
+        # session and through the rate-limit scheduler.
+        response = ratelimit.call("serper", lambda: http_session().post(
+            self.search_url,
+            headers={"X-API-KEY": os.environ["SERPER_API_KEY"], "content-type": "application/json"},
+            data=json.dumps({"q": query}),
+            timeout=settings.HTTP_TIMEOUT,
+        ))
+        results = response.json()
+        if "organic" not in results:
+            return results
+        lines = []
+        for result in results["organic"][:self.n_results]:
+            try:
+                lines.append("\n".join([
+                    f"Title: {result['title']}",
+                    f"Link: {result['link']}",
+                    f"Snippet: {result['snippet']}",
+                    "---",
+                ]))
+            except KeyError:
+                continue
+        content = "\n".join(lines)
+        return f"\nSearch results: {content}\n"
+
+
+class CachedScrapeWebsiteTool(ScrapeWebsiteTool):
+    def _run(self, **kwargs):
+        url = (kwargs.get("website_url") or self.website_url or "").strip()
+        with tracing.span("tool", "website scrape", url=url, fetched=False) as span:
+            def fetch_traced():
+                span.attrs["fetched"] = True
+                return self._scrape(url)
+            page = tool_cache().get_or_fetch(f"scrape|v3|{url}", fetch_traced, ttl=settings.SCRAPE_CACHE_TTL)
+            text, span.attrs["tokens_raw"], span.attrs["tokens_kept"] = compaction.compact(
+                page["text"], tokens_raw=page["tokens_raw"],
+            )
+            return text
+
+    def _scrape(self, url):
+        # Same request as ScrapeWebsiteTool._run, over the pooled session, but
+        # without the page's boilerplate and with paragraphs kept apart.
+        page = http_session().get(url, timeout=15, headers=getattr(self, "headers", None), cookies=getattr(self, "cookies", None) or {})
+        page.encoding = page.apparent_encoding
+        soup = BeautifulSoup(page.text, "html.parser")
+        # What ScrapeWebsiteTool would have handed the agent, to count the saving against.
+        raw = " ".join(soup.get_text(" ").split())
+        return {"text": main_text(soup), "tokens_raw": tracing.estimate_tokens(raw)}
+
+
+# Elements that never hold the article itself.
+BOILERPLATE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "svg", "button")
+BOILERPLATE_HINTS = re.compile(
+    r"cookie|consent|banner|newsletter|subscribe|promo|advert|sponsor|share|social|related|comment|"
+    r"sidebar|breadcrumb|menu|popup|modal|footer|navbar",
+    re.IGNORECASE,
+)
+BLOCK_TAGS = ("p", "li", "h1", "h2", "h3", "h4", "blockquote", "pre", "td")
+
+
+def main_text(html):
+    """The readable text of a page (markup or a parsed soup, which is modified), boilerplate removed."""
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, "html.parser")
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+    for element in soup.find_all(attrs={"class": True}) + soup.find_all(attrs={"id": True}):
+        if element.decomposed:
+            continue
+        hints = " ".join(element.get("class") or []) + " " + (element.get("id") or "")
+        if BOILERPLATE_HINTS.search(hints) and element.name not in ("body", "html", "main", "article"):
+            element.decompose()
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+    blocks = [
+        " ".join(block.get_text(" ").split())
+        for block in root.find_all(BLOCK_TAGS)
+        if not block.find(BLOCK_TAGS)
+    ]
+    if not blocks:
+        blocks = [line.strip() for line in root.get_text("\n").split("\n")]
+    return "\n\n".join(block for block in blocks if block)
+
+
+@tool
+def generate_image(query: str) -> str:
+    """
+    Generates an image using DALL-E based on chapter content and character details.
+    """
+    # This function runs inside a background job, where the API key has
+    # already been set as an environment variable.
+    client = openai_client(os.environ.get("OPENAI_API_KEY"))
+
+    try:
+        with tracing.span("image", "dall-e-3", cost_usd=tracing.IMAGE_PRICES["dall-e-3"]):
+            response = client.images.generate(
+                model="dall-e-3",
+                prompt=f"Create a realistic image of: {query}. Style: Focus on lifelike details, accurate lighting, and natural textures, with a realistic color palette. The scene should capture the true essence of the description, ensuring it looks as if it could exist in the real world.",
+                size="1024x1024",
+                quality="standard",
+                n=1,
+            )
+        image_url = response.data[0].url
+        return image_url
+    except Exception as e:
+        # Streamlit calls are not available from the worker thread, so the
+        # error travels back to the page as the task output instead.
+        return f"Failed to generate image: {e}"
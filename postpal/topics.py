@@ -0,0 +1,190 @@
+"""Index of past research, so near-duplicate topics can reuse it.
+
+"future of AI" and "The Future of Artificial Intelligence" should not each
+pay for a research pass. Research notes (from the shared research crew and
+from the Blog/LinkedIn planners) are stored with their topic, and a new
+topic is compared against them with TF-IDF cosine similarity over
+normalized terms, after expanding acronyms that match a phrase on the
+other side ("AI" against "artificial intelligence"). Similar wording is
+not enough on its own: every content term of either topic must also appear
+in the other, apart from generic framing words like "guide" or "trends", so
+"future of AI in healthcare" does not get notes that never covered
+healthcare. Everything runs locally.
+
+An exact repeat of a topic (after normalization) scores 1.0, so a page
+whose own result is not cached yet still reuses research another page
+already did for the same topic.
+"""
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from postpal import settings
+from postpal.cache import normalize_topic
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or the this to was what when where "
+    "which who why will with about into over your you our their vs versus latest new".split()
+)
+# Words that frame a topic without changing what has to be researched; they
+# may differ between two topics that share their notes.
+GENERIC_TERMS = frozenset(
+    "guide tips trends ideas overview introduction intro basics future benefits importance impact role "
+    "ways best practices explained beginners complete ultimate today".split()
+)
+
+
+def _stem(word):
+    for suffix in ("ies", "es", "s"):
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            return word[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+_GENERIC_STEMS = frozenset(_stem(word) for word in GENERIC_TERMS)
+
+
+def topic_terms(topic):
+    """Stemmed content words of a topic, in order."""
+    return [_stem(w) for w in re.findall(r"[a-z0-9]+", normalize_topic(topic)) if w not in STOPWORDS]
+
+
+def covers(terms, other):
+    """True if every non-generic term of ``terms`` is also in ``other``."""
+    return set(terms) - _GENERIC_STEMS <= set(other)
+
+
+def expand_acronyms(terms, other):
+    """Replace short terms that are the initials of a 2-3 word phrase in ``other`` by that phrase."""
+    phrases = {}
+    for size in (2, 3):
+        for start in range(len(other) - size + 1):
+            phrase = other[start:start + size]
+            phrases.setdefault("".join(word[0] for word in phrase), phrase)
+    expanded = []
+    for term in terms:
+        phrase = phrases.get(term) if 2 <= len(term) <= 3 and term not in other else None
+        expanded.extend(phrase or [term])
+    return expanded
+
+
+class TopicIndex:
+    def __init__(self, path, max_entries=None, ttl=None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS topics ("
+            " id INTEGER PRIMARY KEY, kind TEXT, topic TEXT, normalized TEXT, terms TEXT,"
+            " notes TEXT, created_at REAL)"
+        )
+        self._conn.commit()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            rows = self._conn.execute(
+                "SELECT id, kind, topic, normalized, terms, notes, created_at FROM topics ORDER BY id"
+            ).fetchall()
+            self._entries = [
+                {"id": r[0], "kind": r[1], "topic": r[2], "normalized": r[3], "terms": json.loads(r[4]),
+                 "notes": r[5], "created_at": r[6]}
+                for r in rows
+            ]
+        return self._entries
+
+    def add(self, kind, topic, notes):
+        """Remember ``notes`` researched for ``topic``; ``kind`` says where they came from."""
+        if not notes or not str(notes).strip():
+            return
+        entry = {
+            "kind": kind, "topic": topic, "normalized": normalize_topic(topic),
+            "terms": topic_terms(topic), "notes": str(notes), "created_at": time.time(),
+        }
+        with self._lock, self._conn:
+            entries = self._load()
+            cursor = self._conn.execute(
+                "INSERT INTO topics (kind, topic, normalized, terms, notes, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (entry["kind"], entry["topic"], entry["normalized"], json.dumps(entry["terms"]),
+                 entry["notes"], entry["created_at"]),
+            )
+            entries.append({**entry, "id": cursor.lastrowid})
+            if self.max_entries and len(entries) > self.max_entries:
+                dropped = entries[: len(entries) - self.max_entries]
+                del entries[: len(dropped)]
+                self._conn.execute("DELETE FROM topics WHERE id <= ?", (dropped[-1]["id"],))
+
+    def find(self, topic, threshold=None):
+        """The most similar earlier research for ``topic`` at or above ``threshold``, or None.
+
+        Returns ``{"topic", "kind", "notes", "similarity"}``.
+        """
+        threshold = settings.TOPIC_SIMILARITY_THRESHOLD if threshold is None else threshold
+        normalized = normalize_topic(topic)
+        query = topic_terms(topic)
+        if not query:
+            return None
+        with self._lock:
+            now = time.time()
+            entries = [
+                e for e in self._load()
+                if not self.ttl or e["created_at"] + self.ttl > now
+            ]
+        if not entries:
+            return None
+
+        documents = len(entries) + 1
+        frequency = Counter(term for e in entries for term in set(e["terms"]))
+        frequency.update(set(query))
+
+        def vector(terms):
+            return {
+                term: count * (math.log((1 + documents) / (1 + frequency[term])) + 1)
+                for term, count in Counter(terms).items()
+            }
+
+        def cosine(a, b):
+            dot = sum(w * b[t] for t, w in a.items() if t in b)
+            norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+            return dot / norm if norm else 0.0
+
+        best, best_score = None, 0.0
+        # Newest first, so equally similar entries resolve to the freshest notes.
+        for entry in reversed(entries):
+            if entry["normalized"] == normalized:
+                score = 1.0
+            else:
+                ours = expand_acronyms(query, entry["terms"])
+                theirs = expand_acronyms(entry["terms"], query)
+                if not (covers(ours, theirs) and covers(theirs, ours)):
+                    continue
+                score = cosine(vector(ours), vector(theirs))
+            if score > best_score:
+                best, best_score = entry, score
+        if best is None or best_score < threshold:
+            return None
+        return {"topic": best["topic"], "kind": best["kind"], "notes": best["notes"], "similarity": round(best_score, 3)}
+
+
+_topic_index = None
+_topic_index_lock = threading.Lock()
+
+
+def topic_index():
+    """Return the process-wide topic index, creating it on first use."""
+    global _topic_index
+    with _topic_index_lock:
+        if _topic_index is None:
+            _topic_index = TopicIndex(
+                settings.CACHE_DIR / "topics.sqlite",
+                max_entries=settings.TOPIC_INDEX_MAX_ENTRIES,
+                ttl=settings.RESULT_CACHE_TTL,
+            )
+        return _topic_index
@@ -0,0 +1,437 @@
+"""Per-run tracing and metrics.
+
+A run (one page generation, one fan-out, one batch row) is a tree of timed
+spans: crew stages, tasks, agent steps, LLM calls with token counts and
+estimated cost, searches, scrapes and image generations. Spans are collected
+in memory while the run is going and written to SQLite in one go when it
+ends; the Prometheus text file is then refreshed by a background thread, at
+most once every ``METRICS_INTERVAL`` seconds.
+"""
+import atexit
+import contextvars
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from postpal import events, settings
+
+# USD per million prompt / completion tokens.
+PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+# USD per standard 1024x1024 image.
+IMAGE_PRICES = {"dall-e-3": 0.04}
+
+current_trace = contextvars.ContextVar("postpal_trace", default=None)
+current_span = contextvars.ContextVar("postpal_span", default=None)
+_last_step = contextvars.ContextVar("postpal_last_step", default=None)
+
+
+class Span:
+    def __init__(self, trace, kind, name, parent, attrs):
+        self.trace = trace
+        self.id = uuid.uuid4().hex[:16]
+        self.parent = parent
+        self.parent_id = parent.id if parent else None
+        self.kind = kind
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self.end = None
+
+    @property
+    def duration(self):
+        return (self.end or time.time()) - self.start
+
+
+class Trace:
+    def __init__(self, page, topic):
+        self.run_id = uuid.uuid4().hex
+        self.page = page
+        self.topic = topic
+        self.status = "ok"
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+
+def start_span(kind, name, **attrs):
+    """Open a span under the current one. Without an active trace it is not recorded."""
+    trace = current_trace.get()
+    span = Span(trace, kind, name, current_span.get(), attrs)
+    if trace is not None:
+        trace.add(span)
+    return span
+
+
+def end_span(span, **attrs):
+    span.attrs.update(attrs)
+    span.end = time.time()
+
+
+@contextmanager
+def span(kind, name, **attrs):
+    span = start_span(kind, name, **attrs)
+    token = current_span.set(span)
+    try:
+        yield span
+    except Exception as e:
+        span.attrs["error"] = str(e)
+        raise
+    finally:
+        _end_unfinished(span)
+        current_span.reset(token)
+        end_span(span)
+
+
+def _end_unfinished(span):
+    """End the task spans a failed crew left open below ``span``."""
+    unfinished = []
+    open_span = current_span.get()
+    while open_span is not None and open_span is not span:
+        unfinished.append(open_span)
+        open_span = open_span.parent
+    if open_span is None:
+        return
+    for task in unfinished:
+        end_span(task, error=span.attrs.get("error", "unfinished"))
+
+
+@contextmanager
+def trace_run(page, topic):
+    """Trace a whole run, or just a ``chain`` span when called inside another run."""
+    if current_trace.get() is not None:
+        with span("chain", page) as chain:
+            yield chain
+        return
+
+    trace = Trace(page, topic)
+    token = current_trace.set(trace)
+    try:
+        with span("run", page, topic=topic) as root:
+            yield root
+    except Exception:
+        trace.status = "error"
+        raise
+    finally:
+        current_trace.reset(token)
+        try:
+            trace_store().save(trace)
+            refresh_metrics_file()
+        except (sqlite3.Error, OSError):
+            # Losing a trace must never fail the generation it describes.
+            pass
+
+
+# --- Task and agent step spans, driven by the event stream ---
+def _on_event(event):
+    if event["type"] == "task_started":
+        task = start_span("task", event["task"])
+        current_span.set(task)
+        _last_step.set(task.start)
+    elif event["type"] == "task_finished":
+        task = current_span.get()
+        if task is not None and task.kind == "task":
+            end_span(task)
+            current_span.set(task.parent)
+
+
+events.add_listener(_on_event)
+
+
+def record_step(step_output):
+    """Crew ``step_callback``: one span per agent step since the previous one."""
+    started = _last_step.get() or time.time()
+    if isinstance(step_output, list):
+        name = ", ".join(getattr(action, "tool", "tool") for action, _ in step_output if hasattr(action, "tool"))
+        name = f"step: {name or 'tool'}"
+    else:
+        name = "step: final answer"
+    step = start_span("step", name)
+    step.start = started
+    end_span(step)
+    _last_step.set(step.end)
+
+
+# --- LLM calls ---
+def estimate_tokens(text, model=None):
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model or "gpt-4o")
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        return len(encoding.encode(text))
+    except Exception:
+        # tiktoken missing, or offline and unable to fetch its encoding files.
+        return max(1, len(text) // 4)
+
+
+def llm_cost(model, prompt_tokens, completion_tokens):
+    for name, (prompt_price, completion_price) in sorted(PRICES.items(), key=lambda item: -len(item[0])):
+        if model and model.startswith(name):
+            return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+    return 0.0
+
+
+# --- Storage ---
+class TraceStore:
+    def __init__(self, path, retention_runs=None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_runs = retention_runs
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY, page TEXT, topic TEXT, status TEXT,"
+            " start REAL, end REAL, duration REAL,"
+            " prompt_tokens INTEGER, completion_tokens INTEGER, cost_usd REAL);"
+            "CREATE INDEX IF NOT EXISTS runs_page_start ON runs(page, start);"
+            "CREATE TABLE IF NOT EXISTS spans ("
+            " run_id TEXT, span_id TEXT, parent_id TEXT, kind TEXT, name TEXT,"
+            " start REAL, end REAL, duration REAL, attrs TEXT);"
+            "CREATE INDEX IF NOT EXISTS spans_run ON spans(run_id);"
+        )
+
+    def save(self, trace):
+        spans = [s for s in trace.spans if s.end is not None]
+        root = next(s for s in spans if s.kind == "run")
+        llm_spans = [s for s in spans if s.kind == "llm"]
+        totals = (
+            sum(s.attrs.get("prompt_tokens", 0) for s in llm_spans),
+            sum(s.attrs.get("completion_tokens", 0) for s in llm_spans),
+            sum(s.attrs.get("cost_usd", 0.0) for s in spans),
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (trace.run_id, trace.page, trace.topic, trace.status,
+                 root.start, root.end, root.duration, *totals),
+            )
+            self._conn.executemany(
+                "INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(trace.run_id, s.id, s.parent_id, s.kind, s.name, s.start, s.end, s.duration,
+                  json.dumps(s.attrs, default=str)) for s in spans],
+            )
+            if self.retention_runs:
+                old = "SELECT run_id FROM runs ORDER BY start DESC LIMIT -1 OFFSET ?"
+                self._conn.execute(f"DELETE FROM spans WHERE run_id IN ({old})", (self.retention_runs,))
+                self._conn.execute(f"DELETE FROM runs WHERE run_id IN ({old})", (self.retention_runs,))
+
+    def recent_runs(self, limit=50, page=None):
+        query = "SELECT * FROM runs"
+        args = []
+        if page:
+            query += " WHERE page = ?"
+            args.append(page)
+        query += " ORDER BY start DESC LIMIT ?"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, (*args, limit))]
+
+    def spans(self, run_id):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM spans WHERE run_id = ? ORDER BY start", (run_id,)).fetchall()
+        return [{**dict(row), "attrs": json.loads(row["attrs"])} for row in rows]
+
+    def page_stats(self):
+        """Latency percentiles, token usage and cost per page over the stored runs."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page, status, duration, prompt_tokens, completion_tokens, cost_usd FROM runs"
+            ).fetchall()
+        pages = {}
+        for row in rows:
+            pages.setdefault(row["page"], []).append(row)
+        stats = []
+        for page, runs in sorted(pages.items()):
+            durations = [r["duration"] for r in runs if r["status"] == "ok"] or [0.0]
+            stats.append({
+                "page": page,
+                "runs": len(runs),
+                "errors": sum(r["status"] != "ok" for r in runs),
+                "p50_s": percentile(durations, 50),
+                "p95_s": percentile(durations, 95),
+                "duration_sum_s": sum(durations),
+                "prompt_tokens": sum(r["prompt_tokens"] for r in runs),
+                "completion_tokens": sum(r["completion_tokens"] for r in runs),
+                "cost_usd": sum(r["cost_usd"] for r in runs),
+            })
+        return stats
+
+    def scrape_stats(self):
+        """Scraped tokens before and after compaction, per page."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT runs.page AS page, COUNT(*) AS scrapes,"
+                " SUM(json_extract(spans.attrs, '$.tokens_raw')) AS tokens_raw,"
+                " SUM(json_extract(spans.attrs, '$.tokens_kept')) AS tokens_kept"
+                " FROM spans JOIN runs ON spans.run_id = runs.run_id"
+                " WHERE spans.kind = 'tool' AND spans.name = 'website scrape'"
+                " AND json_extract(spans.attrs, '$.tokens_raw') IS NOT NULL"
+                " GROUP BY runs.page ORDER BY runs.page"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def span_stats(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, COUNT(*) AS count, SUM(duration) AS total FROM spans GROUP BY kind"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def percentile(values, pct):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def prometheus_text(store=None):
+    """Render the stored metrics in the Prometheus text exposition format."""
+    # ratelimit records its queue waits as spans, so it imports this module.
+    from postpal import ratelimit
+
+    store = store or trace_store()
+    lines = [
+        "# HELP postpal_runs_total Generation runs by page.",
+        "# TYPE postpal_runs_total counter",
+    ]
+    stats = store.page_stats()
+    for s in stats:
+        lines.append(f'postpal_runs_total{{page="{s["page"]}",status="ok"}} {s["runs"] - s["errors"]}')
+        lines.append(f'postpal_runs_total{{page="{s["page"]}",status="error"}} {s["errors"]}')
+    lines += [
+        "# HELP postpal_run_duration_seconds End-to-end latency of successful runs.",
+        "# TYPE postpal_run_duration_seconds summary",
+    ]
+    for s in stats:
+        lines.append(f'postpal_run_duration_seconds{{page="{s["page"]}",quantile="0.5"}} {s["p50_s"]:.3f}')
+        lines.append(f'postpal_run_duration_seconds{{page="{s["page"]}",quantile="0.95"}} {s["p95_s"]:.3f}')
+        lines.append(f'postpal_run_duration_seconds_sum{{page="{s["page"]}"}} {s["duration_sum_s"]:.3f}')
+        lines.append(f'postpal_run_duration_seconds_count{{page="{s["page"]}"}} {s["runs"] - s["errors"]}')
+    lines += [
+        "# HELP postpal_llm_tokens_total LLM tokens used, by page and kind.",
+        "# TYPE postpal_llm_tokens_total counter",
+    ]
+    for s in stats:
+        lines.append(f'postpal_llm_tokens_total{{page="{s["page"]}",kind="prompt"}} {s["prompt_tokens"]}')
+        lines.append(f'postpal_llm_tokens_total{{page="{s["page"]}",kind="completion"}} {s["completion_tokens"]}')
+    lines += [
+        "# HELP postpal_cost_usd_total Estimated API cost in US dollars.",
+        "# TYPE postpal_cost_usd_total counter",
+    ]
+    for s in stats:
+        lines.append(f'postpal_cost_usd_total{{page="{s["page"]}"}} {s["cost_usd"]:.6f}')
+    lines += [
+        "# HELP postpal_scrape_tokens_total Scraped page tokens before (raw) and after (kept) compaction.",
+        "# TYPE postpal_scrape_tokens_total counter",
+    ]
+    for s in store.scrape_stats():
+        lines.append(f'postpal_scrape_tokens_total{{page="{s["page"]}",kind="raw"}} {s["tokens_raw"]}')
+        lines.append(f'postpal_scrape_tokens_total{{page="{s["page"]}",kind="kept"}} {s["tokens_kept"]}')
+    limits = ratelimit.stats()
+    lines += [
+        "# HELP postpal_ratelimit_queue_depth Calls currently waiting for a rate-limited resource.",
+        "# TYPE postpal_ratelimit_queue_depth gauge",
+    ]
+    lines += [f'postpal_ratelimit_queue_depth{{resource="{r["resource"]}"}} {r["queue_depth"]}' for r in limits]
+    lines += [
+        "# HELP postpal_ratelimit_wait_seconds Time calls spent queued for a rate-limited resource.",
+        "# TYPE postpal_ratelimit_wait_seconds summary",
+    ]
+    for r in limits:
+        lines.append(f'postpal_ratelimit_wait_seconds_sum{{resource="{r["resource"]}"}} {r["wait_seconds"]:.3f}')
+        lines.append(f'postpal_ratelimit_wait_seconds_count{{resource="{r["resource"]}"}} {r["granted"]}')
+    lines += [
+        "# HELP postpal_ratelimit_429_total Responses rejected with 429 and retried.",
+        "# TYPE postpal_ratelimit_429_total counter",
+    ]
+    lines += [f'postpal_ratelimit_429_total{{resource="{r["resource"]}"}} {r["rate_limited"]}' for r in limits]
+    lines += [
+        "# HELP postpal_span_duration_seconds Time spent per span kind.",
+        "# TYPE postpal_span_duration_seconds summary",
+    ]
+    for s in store.span_stats():
+        lines.append(f'postpal_span_duration_seconds_sum{{kind="{s["kind"]}"}} {s["total"] or 0:.3f}')
+        lines.append(f'postpal_span_duration_seconds_count{{kind="{s["kind"]}"}} {s["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path=None):
+    """Refresh the metrics file, e.g. for the node_exporter textfile collector."""
+    path = Path(path or settings.METRICS_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A temporary file of its own, so concurrent writers never rename each other's.
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False,
+    ) as tmp:
+        tmp.write(prometheus_text())
+    try:
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+
+_metrics_pending = threading.Event()
+_metrics_thread = None
+_metrics_thread_lock = threading.Lock()
+
+
+def _write_pending_metrics():
+    if _metrics_pending.is_set():
+        _metrics_pending.clear()
+        try:
+            write_metrics_file()
+        except (sqlite3.Error, OSError):
+            pass
+
+
+def _metrics_writer():
+    while True:
+        _metrics_pending.wait()
+        _write_pending_metrics()
+        time.sleep(settings.METRICS_INTERVAL)
+
+
+def refresh_metrics_file():
+    """Ask the background writer to refresh the metrics file; returns at once.
+
+    Runs finishing within ``METRICS_INTERVAL`` of each other share one refresh.
+    """
+    global _metrics_thread
+    _metrics_pending.set()
+    if _metrics_thread is None:
+        with _metrics_thread_lock:
+            if _metrics_thread is None:
+                _metrics_thread = threading.Thread(target=_metrics_writer, name="postpal-metrics", daemon=True)
+                _metrics_thread.start()
+                # Headless runs exit right after their last trace; write it out.
+                atexit.register(_write_pending_metrics)
+
+
+_trace_store = None
+_trace_store_lock = threading.Lock()
+
+
+def trace_store():
+    """Return the process-wide trace store, creating it on first use."""
+    global _trace_store
+    with _trace_store_lock:
+        if _trace_store is None:
+            _trace_store = TraceStore(settings.TRACE_DB, settings.TRACE_RETENTION_RUNS)
+        return _trace_store
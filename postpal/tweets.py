@@ -0,0 +1,177 @@
+"""Deterministic finishing of tweets.
+
+The writer agent drafts the tweet; length, links and hashtags are then fixed
+locally instead of by a second agent:
+
+- links are checked (well formed, and answering an HTTP request); broken
+  ones are dropped and, if none is left, the first working link from the
+  research notes is used;
+- hashtags already in the draft are merged with the topic's hashtag list,
+  which is built once per topic from the topic and the research notes and
+  kept in the tool cache; numbers like "#1" do not count as hashtags, and a
+  tweet still short of hashtags says so in its fixes;
+- the tweet is cut down to ``checks.TWEET_MAX_CHARS`` by dropping extra
+  hashtags first and then shortening the text at a word boundary.
+"""
+import re
+from collections import Counter
+from urllib.parse import urlparse
+
+from postpal import checks, settings
+from postpal.cache import normalize_topic
+from postpal.tool_cache import tool_cache
+from postpal.topics import STOPWORDS
+
+MAX_TOPIC_HASHTAGS = 10
+LINK_TIMEOUT = 5
+
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\((https?://[^)\s]+)\)")
+_LINK = re.compile(r"https?://[^\s<>\"')\]]+")
+# "#1" is a number, not a hashtag.
+_HASHTAG = re.compile(r"(?<![\w#])#(?!\d+\b)(\w+)")
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_KEYWORDS = re.compile(r"keywords?\b[^:\n]*:\s*(.+)", re.IGNORECASE)
+# Quotes, labels and agent notes a model sometimes wraps around its answer.
+_LABEL = re.compile(r"^\s*(\*\*)?(final )?tweet(\*\*)?\s*:\s*(\*\*)?", re.IGNORECASE)
+_LEFTOVER = re.compile(r"^\s*(Thought|Action|Action Input|Observation):.*$", re.MULTILINE)
+
+
+def _camel(words):
+    return "".join(word[:1].upper() + word[1:] for word in words)
+
+
+def topic_hashtags(topic, notes=""):
+    """Hashtags for ``topic``, most specific first; computed once per topic and cached.
+
+    Taken from hashtags and SEO keywords in the research notes, then from
+    the topic itself (as a phrase, then word by word), and topped up with
+    the words the notes use most.
+    """
+    def build():
+        candidates = list(_HASHTAG.findall(notes or ""))
+        for line in _KEYWORDS.findall(notes or ""):
+            for keyword in re.split(r"[,;]", line):
+                words = _WORD.findall(keyword)
+                if 1 <= len(words) <= 3:
+                    candidates.append(_camel(words))
+        words = [w for w in _WORD.findall(topic) if w.lower() not in STOPWORDS]
+        if 2 <= len(words) <= 3:
+            candidates.append(_camel(words))
+        candidates += [_camel([w]) for w in words if len(w) > 2]
+        counts = Counter(
+            w.lower() for w in _WORD.findall(_LINK.sub("", notes or ""))
+            if len(w) > 3 and w.isalpha() and w.lower() not in STOPWORDS
+        )
+        candidates += [_camel([w]) for w, _ in counts.most_common(MAX_TOPIC_HASHTAGS)]
+
+        tags, seen = [], set()
+        for tag in candidates:
+            if tag.lower() not in seen and not tag.isdigit():
+                seen.add(tag.lower())
+                tags.append(f"#{tag}")
+        return tags[:MAX_TOPIC_HASHTAGS]
+
+    return tool_cache().get_or_fetch(
+        f"hashtags|v2|{normalize_topic(topic)}", build, ttl=settings.SEARCH_CACHE_TTL,
+        cacheable=bool,
+    )
+
+
+def link_works(url):
+    """True if ``url`` is a well-formed http(s) link that answers without an error status."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or "." not in parsed.netloc:
+        return False
+
+    def fetch():
+        # Imported here so the module loads without requests installed.
+        from requests import RequestException
+
+        from postpal.resources import http_session
+
+        try:
+            response = http_session().head(url, timeout=LINK_TIMEOUT, allow_redirects=True)
+            if response.status_code in (403, 405, 501):
+                # Some servers refuse HEAD; ask for the page itself.
+                response = http_session().get(url, timeout=LINK_TIMEOUT, stream=True)
+                response.close()
+            return response.status_code < 400
+        except RequestException:
+            return False
+
+    return tool_cache().get_or_fetch(f"link|{url}", fetch, ttl=settings.SCRAPE_CACHE_TTL)
+
+
+def _links(text):
+    return [link.rstrip(".,;:!?") for link in _LINK.findall(text or "")]
+
+
+# Text a shortened tweet keeps at the least, before its link and hashtags go.
+_MIN_BODY_CHARS = 40
+
+
+def _shorten(text, limit):
+    if len(text) <= limit:
+        return text
+    cut = text[: max(0, limit - 1)].rsplit(" ", 1)[0].rstrip(" ,;:-")
+    return f"{cut}…"
+
+
+def finalize(draft, topic, notes=""):
+    """Return ``(tweet, fixes)``: the draft made ready to post and what was changed."""
+    fixes = []
+    text = str(draft).rsplit("Final Answer:", 1)[-1]
+    text = _LEFTOVER.sub("", text).strip()
+    text = _LABEL.sub("", text).strip().strip('"“”').strip()
+    text = _MARKDOWN_LINK.sub(r"\1 \2", text)
+
+    link = None
+    for candidate in _links(text):
+        text = text.replace(candidate, "")
+        if link is None and link_works(candidate):
+            link = candidate
+        elif link is None:
+            fixes.append(f"dropped broken link {candidate}")
+    if link is None:
+        link = next((candidate for candidate in _links(notes) if link_works(candidate)), None)
+        if link:
+            fixes.append("added a link from the research")
+
+    written = [f"#{tag}" for tag in _HASHTAG.findall(text)]
+    text = _HASHTAG.sub("", text)
+    low, high = checks.TWEET_HASHTAGS
+    tags, seen = [], set()
+    for tag in written + topic_hashtags(topic, notes):
+        if tag.lower() not in seen:
+            seen.add(tag.lower())
+            tags.append(tag)
+    tags = tags[:high]
+    if len(tags) < low:
+        fixes.append(f"found only {len(tags)} of the {low} hashtags wanted")
+
+    text = re.sub(r"\s+([.,;:!?])", r"\1", " ".join(text.split()))
+
+    def assemble(body, tags):
+        tweet = f"{body} {link}" if link else body
+        return f"{tweet}\n\n{' '.join(tags)}" if tags else tweet
+
+    tweet = assemble(text, tags)
+    while len(tweet) > checks.TWEET_MAX_CHARS and len(tags) > low:
+        tags = tags[:-1]
+        tweet = assemble(text, tags)
+    if len(tweet) > checks.TWEET_MAX_CHARS:
+        # The link and hashtags must leave room for some of the text: give up
+        # the remaining hashtags first, then the link.
+        def room():
+            return checks.TWEET_MAX_CHARS - (len(assemble(text, tags)) - len(text))
+
+        while room() < _MIN_BODY_CHARS and tags:
+            tags = tags[:-1]
+        if room() < _MIN_BODY_CHARS and link:
+            fixes.append(f"dropped link {link}, too long to fit")
+            link = None
+        tweet = assemble(_shorten(text, room()), tags)
+        fixes.append(f"shortened to {checks.TWEET_MAX_CHARS} characters")
+    if [tag.lower() for tag in tags] != [tag.lower() for tag in written]:
+        fixes.append(f"hashtags merged ({len(written)} written, {len(tags)} used)")
+    return tweet, fixes
@@ -0,0 +1,221 @@
+"""Streamlit widgets shared by the generator pages."""
+import os
+import time
+import uuid
+
+import streamlit as st
+
+from postpal import agentlog
+from postpal.cache import result_cache
+from postpal.jobs import JobLimitError, job_manager
+from postpal.platforms import MAX_VARIANTS, MODE_LABELS, MODES, RERUN_ACTIONS, STAGE_GRAPH
+from postpal.resources import configure_api_keys
+from postpal.tool_cache import tool_cache
+
+
+def cache_controls():
+    """Render the cache toggle and hit/miss counters in the sidebar.
+
+    Returns True when the user asked to bypass the result cache.
+    """
+    with st.sidebar:
+        st.divider()
+        bypass = st.checkbox(
+            "Bypass cache",
+            value=False,
+            help="Always run the agents, even if this topic (or research for a very similar one) was generated recently.",
+        )
+        stats = result_cache().stats()
+        st.caption(
+            f"Result cache: {stats['hits']} hits "
+            f"({stats['memory_hits']} memory, {stats['disk_hits']} disk), "
+            f"{stats['misses']} misses, hit rate {stats['hit_rate']:.0%}"
+        )
+        tools = tool_cache().stats()
+        st.caption(
+            f"Search/scrape cache: {tools['hits']} hits, {tools['misses']} misses, "
+            f"{tools['deduplicated']} duplicate fetches avoided"
+        )
+    return bypass
+
+
+def session_id():
+    if "postpal_session_id" not in st.session_state:
+        st.session_state["postpal_session_id"] = uuid.uuid4().hex
+    return st.session_state["postpal_session_id"]
+
+
+def submit_job(page, label, fn, *args, **kwargs):
+    """Start ``fn`` as a background job for this page, or show why it cannot run."""
+    try:
+        job = job_manager().submit(session_id(), page, label, fn, *args, **kwargs)
+    except JobLimitError as e:
+        st.error(str(e))
+        return None
+    st.session_state[f"postpal_job_{page}"] = job.id
+    # Keeping the id in the URL lets a refreshed tab find its job again.
+    st.query_params["job"] = job.id
+    return job
+
+
+def submit_generation(page, label, pipeline, *args, serper=True, **kwargs):
+    """Submit ``postpal.pipelines.<pipeline>`` as this page's job, with the API keys from the secrets.
+
+    ``serper=False`` is for pipelines that never search, so the Serper key
+    is not required.
+    """
+    # Imported here rather than at the top so a page renders without loading CrewAI.
+    from postpal import pipelines
+
+    configure_api_keys(st.secrets["openai_api_key"], st.secrets["serper_api_key"] if serper else None)
+    return submit_job(page, label, getattr(pipelines, pipeline), *args, **kwargs)
+
+
+def current_job(page):
+    """Return the latest job started from ``page`` in this browser tab, if any."""
+    job_id = st.session_state.get(f"postpal_job_{page}") or st.query_params.get("job")
+    job = job_manager().get(job_id) if job_id else None
+    if job is None or job.page != page:
+        return None
+    st.session_state[f"postpal_job_{page}"] = job.id
+    return job
+
+
+def poll_job(job, interval=1.0):
+    """Show progress of an unfinished job and rerun the page until it is done."""
+    if not job.active:
+        return
+    st.progress(job.progress, text=f"{job.message} ({job.elapsed:.0f}s)")
+    time.sleep(interval)
+    st.rerun()
+
+
+def streaming_controls():
+    """Render the streaming toggle in the sidebar and return its value."""
+    with st.sidebar:
+        return st.checkbox(
+            "Stream agent output",
+            value=True,
+            help="Show what each agent writes while it is writing it.",
+        )
+
+
+def mode_controls():
+    """Render the quality/fast toggle in the sidebar and return the chosen mode."""
+    with st.sidebar:
+        return st.radio(
+            "Mode",
+            MODES,
+            format_func=MODE_LABELS.get,
+            horizontal=True,
+            help=(
+                "Quality runs the full team of agents (planner, writer, editor). "
+                "Fast drafts and self-edits in one pass, and only calls the editor "
+                "when the draft fails length, hashtag or structure checks."
+            ),
+        )
+
+
+def variant_controls():
+    """Render the variants slider in the sidebar and return how many drafts to write."""
+    with st.sidebar:
+        return st.slider(
+            "Variants",
+            1,
+            MAX_VARIANTS,
+            1,
+            help=(
+                "Write several versions for A/B testing. They share one research pass and are "
+                "drafted together in a single step, so the mode setting does not apply."
+            ),
+        )
+
+
+def run_summary(output):
+    """One line saying which mode produced ``output`` and how long it took."""
+    mode = output.get("mode", "quality")
+    parts = [f"{len(output['variants'])} variants" if mode == "variants" else f"{MODE_LABELS[mode]} mode"]
+    if "duration_s" in output:
+        parts.append(f"{output['duration_s']:.1f}s")
+    if mode != "variants" and output.get("tweet_fixes"):
+        parts.append(f"fixed locally: {', '.join(output['tweet_fixes'])}")
+    if mode == "fast":
+        parts.append(
+            f"editor fixed: {' '.join(output['problems'])}" if output.get("edited")
+            else "editor skipped, draft passed all checks"
+        )
+    stages = output.get("stages") or {}
+    reused = [stage for stage, status in stages.items() if status in ("cached", "kept")]
+    if reused and len(reused) < len(stages):
+        parts.append(f"reused {', '.join(reused)}, re-ran {', '.join(s for s in stages if s not in reused)}")
+    source = output.get("research_reused_from")
+    if source:
+        parts.append(f"research reused from \"{source['topic']}\" (similarity {source['similarity']:.2f})")
+    if output.get("scrape_tokens_saved"):
+        parts.append(f"{output['scrape_tokens_saved']:,} scraped tokens trimmed")
+    return " · ".join(parts)
+
+
+def show_task_outputs(job):
+    """One section per task: live tokens while it runs, its final output once done."""
+    for label, entry in list(job.events.tasks.items()):
+        with st.expander(f"{'✅' if entry['done'] else '⏳'} {label}", expanded=not entry["done"]):
+            st.markdown(entry["output"] if entry["done"] else entry["text"] or "_Thinking..._")
+
+
+def show_agent_log():
+    """The agent log of this browser session: tasks, tool calls and failures, newest last."""
+    lines = agentlog.session_lines(session_id())
+    with st.expander(f"Agent log ({len(lines)} lines)"):
+        if agentlog.dropped():
+            st.caption(f"{agentlog.dropped():,} records were dropped from the log files because the writer fell behind.")
+        st.code("\n".join(lines) or "Nothing logged yet.", language="text")
+
+
+def show_image(output):
+    """Render a stored Instagram image from disk, falling back to the raw agent output."""
+    if output.get("thumbnail") and os.path.exists(output["thumbnail"]):
+        st.image(output["thumbnail"], caption="AI-Generated Image")
+        with open(output["image"], "rb") as f:
+            st.download_button(
+                "Download full-size image", f.read(),
+                file_name=os.path.basename(output["image"]), mime="image/png", key=output["image"],
+            )
+    else:
+        st.warning("Could not retrieve the generated image.")
+        st.write(output["image"])
+
+
+def rerun_controls(platform, output):
+    """Buttons that regenerate one stage of ``output`` and what follows it.
+
+    Only stages that ``output`` went through, along with the stages they
+    read from, are offered: a fast-mode post that was never edited has no
+    "Re-edit", and one written without a plan has no "Re-write from same
+    plan". Returns the stage to re-run, or None.
+    """
+    stages = output.get("stages") or {}
+    graph = STAGE_GRAPH.get(platform, {})
+    actions = [
+        (stage, label) for stage, label in RERUN_ACTIONS.get(platform, ())
+        if stage in stages and all(upstream in stages for upstream in graph.get(stage, ()))
+    ]
+    if not actions:
+        return None
+    columns = st.columns(len(actions))
+    for column, (stage, label) in zip(columns, actions):
+        if column.button(label, key=f"postpal_rerun_{platform}_{stage}"):
+            return stage
+    return None
+
+
+def show_variants(output):
+    """One tab per variant, with what was fixed or is still wrong in it."""
+    tabs = st.tabs([f"Variant {index + 1}" for index in range(len(output["variants"]))])
+    for tab, variant, problems, fixes in zip(tabs, output["variants"], output["problems"], output["tweet_fixes"]):
+        with tab:
+            st.markdown(variant)
+            if fixes:
+                st.caption(f"Fixed locally: {', '.join(fixes)}")
+            for problem in problems:
+                st.warning(problem)
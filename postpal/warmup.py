@@ -0,0 +1,50 @@
+"""Deferred loading of the generation stack.
+
+CrewAI, crewai_tools, LangChain and the OpenAI SDK take seconds to import,
+so pages never import them at module level. Instead ``prewarm()`` is called
+once the page has been painted and imports them in a background thread;
+by the time the user clicks "Generate" they are usually ready.
+"""
+import importlib
+import sys
+import threading
+import time
+
+from postpal import settings
+
+HEAVY_MODULES = ("crewai", "crewai_tools", "langchain_openai", "openai", "postpal.pipelines")
+
+# Seconds spent importing each module in the pre-warm thread.
+import_times = {}
+
+_thread = None
+_lock = threading.Lock()
+
+
+def _import_all():
+    for name in HEAVY_MODULES:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # The real import in the job will raise a proper error; warming is best effort.
+            continue
+        import_times[name] = time.perf_counter() - started
+
+
+def prewarm():
+    """Start importing the heavy modules in the background, once per process.
+
+    Disabled with ``POSTPAL_PREWARM=0``.
+    """
+    global _thread
+    if not settings.PREWARM:
+        return
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_import_all, name="postpal-prewarm", daemon=True)
+            _thread.start()
+
+
+def is_warm():
+    return all(name in sys.modules for name in HEAVY_MODULES)
@@ -1,4 +1,5 @@
 import streamlit as st
+from postpal.warmup import prewarm
 
 st.set_page_config(
     page_title="SocioBot: AI Content Generation Platform",
@@ -20,6 +21,9 @@ Use the navigation panel on the left to select a content generator:
 - **Blog Post Generator:** Generate a complete blog post from a topic, including a content plan, the written article, and an edited final version.
 - **LinkedIn Post Generator:** Craft a professional and insightful LinkedIn post on any topic.
 - **Twitter Post Generator:** Create a concise and impactful tweet, complete with relevant hashtags.
+- **All Platforms Generator:** Research a topic once and get a blog post, LinkedIn post, tweet and Instagram post for it in parallel.
+- **Performance:** See where generation time, tokens and money go, per page and for a single run.
+- **History:** Search and reopen every post generated so far, without running the agents again.
 
 **How to get started?**
 
@@ -29,3 +33,6 @@ Use the navigation panel on the left to select a content generator:
 
 This tool is designed to streamline your content creation process, making it faster and more efficient. Let's get started!
 """)
+
+# Start loading CrewAI now that the page is on screen, so the first generation does not wait for it.
+prewarm()
@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import time; keep every cache, index and log of the
+# test run out of the real cache directory.
+os.environ["POSTPAL_CACHE_DIR"] = tempfile.mkdtemp(prefix="postpal-tests-")
+os.environ.setdefault("POSTPAL_LOG_CONSOLE_LEVEL", "OFF")
+# CrewAI ships anonymous telemetry; keep the tests offline.
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    """Local OpenAI and Serper stand-ins (see benchmarks.stubs) for tests that kick off real crews."""
+    pytest.importorskip("crewai")
+    from benchmarks.stubs import StubConfig, StubServer
+    from postpal import settings
+
+    config = StubConfig(
+        llm_latency=0, token_rate=100000, completion_tokens=20, tool_steps=0,
+        image_latency=0, search_latency=0, scrape_latency=0, page_words=100,
+    )
+    with StubServer(config) as server:
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-stub")
+        monkeypatch.setenv("SERPER_API_KEY", "stub")
+        monkeypatch.setattr(settings, "OPENAI_BASE_URL", f"{server.url}/v1")
+        monkeypatch.setattr(settings, "SERPER_URL", f"{server.url}/search")
+        yield server
@@ -0,0 +1,34 @@
+import logging
+
+import pytest
+
+from postpal import agentlog
+
+
+def test_session_lines_are_kept_per_session():
+    token = agentlog.current_session.set("session-a")
+    try:
+        agentlog.log(logging.INFO, "hello from a")
+    finally:
+        agentlog.current_session.reset(token)
+    assert agentlog.session_lines("session-a")[-1].endswith("hello from a")
+    assert agentlog.session_lines("session-b") == []
+
+
+def test_crewai_console_output_goes_to_the_log(capsys):
+    pytest.importorskip("crewai")
+    from crewai.utilities.printer import Printer
+    from crewai_tools import ScrapeWebsiteTool
+
+    import postpal.crews  # noqa: F401  (installs the capture)
+
+    token = agentlog.current_session.set("session-crewai")
+    try:
+        Printer().print(content="\n\ntool failed\n", color="red")
+        ScrapeWebsiteTool().run(website_url="not a url")
+    except Exception:
+        pass
+    finally:
+        agentlog.current_session.reset(token)
+    assert capsys.readouterr().out == ""
+    assert any(line.endswith("crewai: tool failed") for line in agentlog.session_lines("session-crewai"))
@@ -0,0 +1,32 @@
+from postpal import checks
+
+TWEET = "Quantum computers are getting useful https://example.com/q\n\n#Quantum #Computing #Tech"
+
+
+def test_good_tweet_passes():
+    assert checks.check_tweet(TWEET) == []
+
+
+def test_tweet_problems_are_listed():
+    problems = checks.check_tweet("x" * 300 + " #1 #2 #3")
+    assert any("Shorten" in p for p in problems)
+    assert any("hashtags (it has 0)" in p for p in problems)
+    assert any("link" in p for p in problems)
+
+
+def test_numbers_are_not_hashtags():
+    assert checks.hashtags("The #1 tip of 2024: #AI and #a1, not #2024") == ["#AI", "#a1"]
+
+
+def test_agent_leftovers_are_flagged():
+    assert checks.check_tweet(TWEET + "\nThought: done") != []
+
+
+def test_blog_needs_title_and_sections():
+    problems = checks.check_blog("Just a paragraph.")
+    assert any("title" in p for p in problems)
+    assert any("sections" in p for p in problems)
+
+
+def test_word_count_ignores_links():
+    assert checks.word_count("Read this https://example.com/a-b-c now") == 3
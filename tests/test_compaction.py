@@ -0,0 +1,58 @@
+from postpal import compaction
+
+PAGE = "\n\n".join([
+    "Accept cookies to continue browsing this website today.",
+    "Quantum computing uses qubits that can hold superpositions of states at once.",
+    "Subscribe to our newsletter for weekly updates about everything.",
+    "Error correction remains the main obstacle for useful quantum computing hardware.",
+])
+
+
+def test_bm25_ranks_matching_documents_first():
+    scores = compaction.bm25_scores("quantum computing", ["cookies and footers", "quantum computing with qubits"])
+    assert scores[1] > scores[0] == 0
+
+
+def test_chunk_keeps_track_of_source_passages():
+    chunks = compaction.chunk(["one two three", "four five six", "seven eight nine"], chunk_tokens=5)
+    assert [sources for _, sources in chunks] == [{0}, {1}, {2}]
+    assert compaction.chunk(["one two three", "four five six"], chunk_tokens=1000) == [
+        ("one two three four five six", {0, 1}),
+    ]
+
+
+def test_session_keeps_relevant_chunks_within_budget():
+    session = compaction.Session("quantum computing", token_budget=25, chunk_tokens=20)
+    compacted, before, after = session.compact(PAGE)
+    assert "qubits" in compacted
+    assert "cookies" not in compacted
+    assert after <= 25 < before
+    assert session.tokens_saved == before - after
+
+
+def test_session_drops_passages_already_shown():
+    session = compaction.Session("quantum computing", token_budget=1000, chunk_tokens=50)
+    first, _, _ = session.compact(PAGE)
+    second, _, _ = session.compact(PAGE)
+    assert "qubits" in first
+    assert "qubits" not in second
+    assert second.startswith("(Nothing new on this page")
+
+
+def test_compact_outside_a_session_returns_the_text():
+    text, before, after = compaction.compact(PAGE)
+    assert text == PAGE and before == after
+
+
+def test_raw_tokens_count_the_page_before_boilerplate_removal(stub_api):
+    from postpal.tools import CachedScrapeWebsiteTool
+
+    tool = CachedScrapeWebsiteTool()
+    url = f"{stub_api.url}/site/compaction.html"
+    with compaction.session("growth platform", token_budget=10_000) as session:
+        text = tool._run(website_url=url)
+    page = tool._scrape(url)
+    assert "cookies" not in text
+    assert page["tokens_raw"] > compaction.tracing.estimate_tokens(page["text"])
+    assert session.tokens_in == page["tokens_raw"]
+    assert session.tokens_saved == page["tokens_raw"] - compaction.tracing.estimate_tokens(text)
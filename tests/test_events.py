@@ -0,0 +1,45 @@
+from postpal import events
+
+
+def test_stream_yields_events_then_the_result():
+    def run(job, topic):
+        events.emit("token", task="Blog: Writer", text=topic)
+        return "done"
+
+    stream = list(events.stream(run, "ai"))
+    assert [event["type"] for event in stream] == ["token", "result"]
+    assert stream[-1]["output"] == "done"
+
+
+def test_task_events_fire_when_a_real_crew_runs(stub_api):
+    from crewai import Agent, Crew, Task
+
+    from postpal.resources import chat_model
+    from postpal.settings import CREW_VERBOSE
+
+    def kickoff(job):
+        llm = chat_model("gpt-4o", 0, "sk-stub")
+        agents = [
+            Agent(role=role, goal="Write about {topic}", backstory="A writer.", llm=llm, allow_delegation=False)
+            for role in ("Planner", "Writer")
+        ]
+        tasks = [
+            Task(description=f"{agent.role} step for {{topic}}", expected_output="Text.", agent=agent)
+            for agent in agents
+        ]
+        crew = Crew(agents=agents, tasks=tasks, verbose=CREW_VERBOSE)
+        finished = []
+        events.on_task_finished(crew, lambda index, output: finished.append(index))
+        events.follow_tasks(crew, "Test")
+        crew.kickoff(inputs={"topic": "tide pools"})
+        return finished
+
+    stream = list(events.stream(kickoff))
+    tasks = [(event["type"], event["task"]) for event in stream if event["type"].startswith("task_")]
+    assert tasks == [
+        ("task_started", "Test: Planner"),
+        ("task_finished", "Test: Planner"),
+        ("task_started", "Test: Writer"),
+        ("task_finished", "Test: Writer"),
+    ]
+    assert stream[-1] == {**stream[-1], "type": "result", "output": [0, 1]}
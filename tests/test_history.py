@@ -0,0 +1,68 @@
+import pytest
+
+from postpal import events
+from postpal.history import HistoryStore, fts_query, history, recording
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite")
+    store.add("blog", "Electric cars", "Batteries are getting cheaper.", model="gpt-4o", tasks=[{"task": "write"}])
+    store.add("twitter", "Electric bikes", "Cities love e-bikes.")
+    store.add("linkedin", "Remote work", "Hybrid teams and office costs.")
+    return store
+
+
+def test_fts_query():
+    assert fts_query("electric car's") == '"electric" "cars"*'
+    assert fts_query("  !! ") is None
+
+
+def test_search_matches_words_and_prefixes(store):
+    if not store.full_text:
+        pytest.skip("SQLite built without FTS5")
+    assert [r["topic"] for r in store.search("electric")] == ["Electric bikes", "Electric cars"]
+    assert [r["topic"] for r in store.search("battery")] == ["Electric cars"]
+    assert [r["topic"] for r in store.search("electric bi")] == ["Electric bikes"]
+    assert store.search("nothing like this") == []
+
+
+def test_filters_and_count(store):
+    assert [r["platform"] for r in store.search(platforms=["blog", "twitter"])] == ["twitter", "blog"]
+    assert store.count() == 3
+    assert store.count(platforms=["linkedin"]) == 1
+    assert store.count(since=0, until=1) == 0
+
+
+def test_keyset_pagination(store):
+    first = store.search(limit=2)
+    second = store.search(before=first[-1]["id"], limit=2)
+    assert [r["topic"] for r in first + second] == ["Remote work", "Electric bikes", "Electric cars"]
+
+
+def test_get_returns_the_full_entry(store):
+    entry_id = store.search("batteries")[0]["id"]
+    entry = store.get(entry_id)
+    assert entry["text"] == "Batteries are getting cheaper."
+    assert entry["tasks"] == [{"task": "write"}]
+    assert store.get(10_000) is None
+
+
+def test_recording_collects_finished_tasks():
+    with recording() as collected:
+        events.emit("task_started", task="Blog (write): Writer")
+        events.emit("token", task="Blog (write): Writer", text="Dra")
+        events.emit("task_finished", task="Blog (write): Writer", output="Draft")
+    events.emit("task_finished", task="Blog (edit): Editor", output="Not recorded")
+    assert [(task["task"], task["output"]) for task in collected.tasks] == [("Blog (write): Writer", "Draft")]
+    assert collected.tasks[0]["seconds"] is not None
+
+
+def test_run_platform_stores_every_task_output(stub_api):
+    from postpal.pipelines import run_platform
+
+    output = run_platform(None, "blog", "history of tide pool research", bypass_cache=True)
+    entry = history().get(output["history_id"])
+    assert [task["task"].split(":")[0] for task in entry["tasks"]] == ["Blog (plan)", "Blog (write)", "Blog (edit)"]
+    assert all(task["output"] and task["seconds"] is not None for task in entry["tasks"])
+    assert entry["text"] == output["result"]
@@ -0,0 +1,30 @@
+import threading
+
+import pytest
+
+from postpal.jobs import SUCCEEDED, Job, JobLimitError, JobManager
+
+
+def test_jobs_run_and_limits_apply_per_session():
+    manager = JobManager(max_workers=2, max_active=3, max_per_session=1, retention=60)
+    release = threading.Event()
+    job = manager.submit("a", "blog", "Blog post", lambda job: release.wait(5) and "done")
+    with pytest.raises(JobLimitError):
+        manager.submit("a", "blog", "Blog post", lambda job: None)
+    other = manager.submit("b", "blog", "Blog post", lambda job: "other")
+    release.set()
+    for item in (job, other):
+        while item.active:
+            threading.Event().wait(0.01)
+    assert (job.status, job.result, job.progress) == (SUCCEEDED, "done", 1.0)
+
+
+def test_progress_moves_with_every_finished_task(stub_api):
+    from postpal.pipelines import run_platform
+
+    job = Job("session", "blog", "Blog post")
+    updates = []
+    update = job.update
+    job.update = lambda progress=None, message=None: updates.append(progress) or update(progress, message)
+    run_platform(job, "blog", "progress of tide pool research", bypass_cache=True)
+    assert updates == pytest.approx([1 / 3, 2 / 3, 1.0])
@@ -0,0 +1,14 @@
+from postpal import events
+
+
+def test_instagram_runs_alongside_the_shared_research(stub_api):
+    from postpal.pipelines import run_all_platforms
+
+    stub_api.config.llm_latency = 0.05
+    stream = list(events.stream(run_all_platforms, "tide pool ecology", ("twitter", "instagram"), True))
+    assert stream[-1]["type"] == "result"
+    assert set(stream[-1]["output"]["platforms"]) == {"twitter", "instagram"}
+
+    tasks = [(event["type"], event["task"].split(":")[0]) for event in stream if event["type"].startswith("task_")]
+    assert tasks.index(("task_started", "Instagram image")) < tasks.index(("task_finished", "Research"))
+    assert tasks.index(("task_finished", "Research")) < tasks.index(("task_started", "Twitter"))
@@ -0,0 +1,14 @@
+from postpal.platforms import RERUN_ACTIONS, STAGE_GRAPH, downstream
+
+
+def test_downstream_includes_every_dependent_stage():
+    assert downstream("blog", "plan") == {"plan", "write", "edit"}
+    assert downstream("blog", "edit") == {"edit"}
+    assert downstream("instagram", "image") == {"image"}
+    assert downstream("blog", None) == set()
+
+
+def test_rerun_actions_name_known_stages():
+    for platform, actions in RERUN_ACTIONS.items():
+        for stage, _ in actions:
+            assert stage in STAGE_GRAPH[platform]
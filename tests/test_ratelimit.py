@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from postpal import ratelimit, settings
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = ratelimit.TokenBucket(per_minute=60, burst_seconds=2)
+    now = time.monotonic()
+    assert bucket.delay(2, now) == 0
+    bucket.take(2)
+    assert bucket.delay(1, now) == pytest.approx(1.0, abs=0.01)
+    # Amounts above the capacity wait for a full bucket instead of forever.
+    assert bucket.delay(100, now) == pytest.approx(2.0, abs=0.01)
+
+
+def test_waiters_are_served_by_priority_then_round_robin():
+    limiter = ratelimit.Limiter("test", rpm=1200, burst_seconds=0.05)
+    limiter.acquire()
+    served = []
+
+    def wait(session, priority):
+        with ratelimit.client(session, priority):
+            limiter.acquire()
+        served.append(session)
+
+    threads = []
+    for session, priority in (("batch", ratelimit.BATCH), ("a", 0), ("a", 0), ("b", 0)):
+        threads.append(threading.Thread(target=wait, args=(session, priority)))
+        threads[-1].start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join(5)
+    assert served == ["a", "b", "a", "batch"]
+    assert limiter.stats()["granted"] == 5
+
+
+def test_retry_after_headers():
+    assert ratelimit.retry_after({"retry-after-ms": "250"}) == 0.25
+    assert ratelimit.retry_after({"retry-after": "2"}) == 2.0
+    assert ratelimit.retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
+    assert ratelimit.retry_after({}) is None
+
+
+def test_call_retries_429_and_pauses_the_resource(monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMITS, "test-model", {"rpm": 6000})
+    responses = [Response(429, {"retry-after-ms": "10"}), Response(429, {"retry-after-ms": "10"}), Response(200)]
+    response = ratelimit.call("test-model-2024", lambda: responses.pop(0))
+    assert response.status_code == 200
+    assert ratelimit.limiter("test-model").stats()["rate_limited"] == 2
+
+
+def test_call_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMITS, "test-busy", {"rpm": 6000})
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_RETRIES", 1)
+    sent = []
+    response = ratelimit.call("test-busy", lambda: sent.append(1) or Response(429, {"retry-after-ms": "1"}))
+    assert response.status_code == 429
+    assert len(sent) == 2
+
+
+def test_unlimited_resources_are_sent_directly():
+    assert ratelimit.limiter("unknown-model") is None
+    assert ratelimit.call("unknown-model", lambda: Response(200)).status_code == 200
+
+
+def test_chat_tokens_count_message_text_not_json(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_COMPLETION_TOKENS", 500)
+    payload = {
+        "model": "gpt-4o",
+        "messages": [
+            {"role": "system", "content": "word " * 400},
+            {"role": "user", "content": [{"type": "text", "text": "word " * 100}]},
+        ],
+    }
+    tokens = ratelimit.chat_tokens(payload)
+    assert 500 + 400 <= tokens <= 500 + 700
+    assert ratelimit.chat_tokens({**payload, "max_tokens": 50}) == tokens - 450
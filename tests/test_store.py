@@ -0,0 +1,60 @@
+import time
+
+from postpal.cache import ResultCache, cache_key, normalize_topic
+from postpal.store import SqliteStore
+
+
+def test_store_round_trips_json(tmp_path):
+    store = SqliteStore(tmp_path / "store.sqlite")
+    store.set("key", {"result": "text", "items": [1, 2]})
+    assert store.get("key") == {"result": "text", "items": [1, 2]}
+    assert store.get("missing") is None
+
+
+def test_store_expires_entries(tmp_path):
+    store = SqliteStore(tmp_path / "store.sqlite")
+    store.set("short", "value", ttl=0.05)
+    store.set("long", "value", ttl=60)
+    time.sleep(0.1)
+    assert store.get("short") is None
+    assert store.get("long") == "value"
+    assert len(store) == 1
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = SqliteStore(tmp_path / "store.sqlite", max_entries=2)
+    store.set("a", 1)
+    time.sleep(0.01)
+    store.set("b", 2)
+    time.sleep(0.01)
+    store.get("a")
+    time.sleep(0.01)
+    store.set("c", 3)
+    assert store.get("b") is None
+    assert store.get("a") == 1
+    assert store.get("c") == 3
+
+
+def test_result_cache_serves_memory_then_disk(tmp_path):
+    store = SqliteStore(tmp_path / "store.sqlite")
+    cache = ResultCache(store, memory_items=1)
+    cache.set("a", "first")
+    cache.set("b", "second")
+    assert cache.get("b") == "second"
+    assert cache.get("a") == "first"
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_result_cache_expires_memory_entries(tmp_path):
+    cache = ResultCache(SqliteStore(tmp_path / "store.sqlite"), ttl=0.05)
+    cache.set("a", "value")
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_cache_key_ignores_topic_formatting():
+    assert normalize_topic("  The Future of  AI ") == normalize_topic("the future of ai")
+    assert cache_key("blog", "Future of AI", "gpt-4o", 0, "x") == cache_key("blog", " future of ai", "gpt-4o", 0, "x")
+    assert cache_key("blog", "Future of AI", "gpt-4o", 0, "x") != cache_key("linkedin", "Future of AI", "gpt-4o", 0, "x")
@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from postpal.cache import ResultCache
+from postpal.store import SqliteStore
+from postpal.tool_cache import ToolCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ToolCache(ResultCache(SqliteStore(tmp_path / "tools.sqlite")))
+
+
+def test_concurrent_callers_share_one_fetch(cache):
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "results"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get_or_fetch, "search|ai", fetch) for _ in range(8)]
+        time.sleep(0.2)
+        release.set()
+        assert [f.result() for f in futures] == ["results"] * 8
+    assert len(calls) == 1
+    assert cache.stats()["deduplicated"] == 7
+    assert cache.stats()["inflight"] == 0
+
+
+def test_finished_results_are_cached(cache):
+    calls = []
+    cache.get_or_fetch("key", lambda: calls.append(1) or "value")
+    assert cache.get_or_fetch("key", lambda: calls.append(1) or "other") == "value"
+    assert len(calls) == 1
+
+
+def test_uncacheable_results_are_fetched_again(cache):
+    calls = []
+    for _ in range(2):
+        cache.get_or_fetch("key", lambda: calls.append(1) or "", cacheable=bool)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter_and_are_not_cached(cache):
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("search failed")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(cache.get_or_fetch, "key", fail) for _ in range(3)]
+        time.sleep(0.2)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+    assert cache.get_or_fetch("key", lambda: "recovered") == "recovered"
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from postpal.topics import TopicIndex, expand_acronyms, topic_terms
+
+
+@pytest.fixture
+def index(tmp_path):
+    return TopicIndex(tmp_path / "topics.sqlite")
+
+
+def test_topic_terms_drop_stopwords_and_plurals():
+    assert topic_terms("The Future of Electric Cars") == ["future", "electric", "car"]
+
+
+def test_acronyms_expand_to_phrases_of_the_other_topic():
+    assert expand_acronyms(["future", "ai"], ["future", "artificial", "intelligence"]) == [
+        "future", "artificial", "intelligence",
+    ]
+    assert expand_acronyms(["ai"], ["art", "history"]) == ["ai"]
+
+
+def test_rephrased_topic_reuses_notes(index):
+    index.add("research", "The Future of Artificial Intelligence", "notes")
+    match = index.find("future of AI")
+    assert match["notes"] == "notes"
+    assert match["similarity"] >= 0.7
+
+
+def test_extra_distinctive_term_is_not_covered(index):
+    index.add("research", "The Future of Artificial Intelligence", "notes")
+    assert index.find("future of AI in healthcare") is None
+    index.add("research", "AI in healthcare", "healthcare notes")
+    assert index.find("future of AI in healthcare")["notes"] == "healthcare notes"
+
+
+def test_generic_framing_words_may_differ(index):
+    index.add("research", "remote work best practices", "notes")
+    assert index.find("best practices for remote work")["notes"] == "notes"
+    assert index.find("remote work security") is None
+
+
+def test_exact_topic_is_reused(index):
+    index.add("research", "Remote work", "notes")
+    match = index.find("remote work")
+    assert match["notes"] == "notes"
+    assert match["similarity"] == 1.0
+
+
+def test_newest_notes_win_and_old_ones_expire(tmp_path):
+    index = TopicIndex(tmp_path / "topics.sqlite", ttl=0.2)
+    index.add("research", "electric cars future", "old")
+    index.add("blog plan", "the electric cars future", "new")
+    assert index.find("future of electric cars")["notes"] == "new"
+    time.sleep(0.3)
+    assert index.find("future of electric cars") is None
+
+
+def test_index_is_bounded(tmp_path):
+    index = TopicIndex(tmp_path / "topics.sqlite", max_entries=2)
+    for topic in ("solar panels", "wind turbines", "heat pumps"):
+        index.add("research", f"{topic} guide", topic)
+    assert index.find("solar panels") is None
+    assert index.find("heat pumps")["notes"] == "heat pumps"
+    assert len(TopicIndex(tmp_path / "topics.sqlite")._load()) == 2
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from postpal import tracing
+
+
+def test_concurrent_runs_finish_and_metrics_file_is_written(tmp_path):
+    def run(index):
+        with tracing.trace_run("blog", f"topic {index}"):
+            pass
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(run, range(40)))
+
+    path = tmp_path / "metrics.prom"
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda _: tracing.write_metrics_file(path), range(40)))
+    assert 'postpal_runs_total{page="blog",status="ok"}' in path.read_text()
+    assert [p.name for p in tmp_path.iterdir()] == ["metrics.prom"]
+
+
+def test_failed_runs_are_counted_as_errors(tmp_path):
+    try:
+        with tracing.trace_run("twitter", "topic"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    stats = {s["page"]: s for s in tracing.trace_store().page_stats()}
+    assert stats["twitter"]["errors"] >= 1
+
+
+def test_llm_cost_uses_the_model_family():
+    assert tracing.llm_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0) == 0.15
+    assert tracing.llm_cost("gpt-4o", 0, 1_000_000) == 10.00
+    assert tracing.llm_cost("unknown", 1000, 1000) == 0.0
+
+
+def test_tasks_left_open_by_a_failed_crew_are_stored_as_errors():
+    from postpal import events
+
+    try:
+        with tracing.trace_run("blog", "failing topic") as root:
+            events.emit("task_started", task="Blog (write): Writer")
+            raise RuntimeError("model unavailable")
+    except RuntimeError:
+        pass
+    spans = tracing.trace_store().spans(root.trace.run_id)
+    task = next(s for s in spans if s["kind"] == "task")
+    assert task["name"] == "Blog (write): Writer"
+    assert task["attrs"]["error"] == "model unavailable"
+    assert tracing.current_span.get() is None
+
+
+def test_stub_run_stores_a_span_per_task(stub_api):
+    from postpal.pipelines import run_platform
+
+    run_platform(None, "blog", "tracing tide pool research", bypass_cache=True)
+    run_id = tracing.trace_store().recent_runs(limit=1, page="blog")[0]["run_id"]
+    tasks = [s for s in tracing.trace_store().spans(run_id) if s["kind"] == "task"]
+    assert [s["name"].split(":")[0] for s in tasks] == ["Blog (plan)", "Blog (write)", "Blog (edit)"]
+    assert all(s["duration"] is not None for s in tasks)
@@ -0,0 +1,77 @@
+import pytest
+
+from postpal import checks, tweets
+
+NOTES = "Keywords: quantum computing, qubits\nSee https://good.example.com/report and https://dead.example.com/x"
+
+
+@pytest.fixture(autouse=True)
+def links(monkeypatch):
+    monkeypatch.setattr(tweets, "link_works", lambda url: "dead" not in url)
+
+
+def test_finalize_cleans_agent_output():
+    tweet, _ = tweets.finalize(
+        'Thought: I know the answer\nFinal Answer: "Qubits are here https://good.example.com/a #Quantum #Qubits #Physics"',
+        "quantum computing", NOTES,
+    )
+    assert tweet.startswith("Qubits are here https://good.example.com/a")
+    assert "Thought" not in tweet and '"' not in tweet
+    assert checks.check_tweet(tweet) == []
+
+
+def test_broken_links_are_replaced_from_the_notes():
+    tweet, fixes = tweets.finalize("Big news https://dead.example.com/y", "quantum computing", NOTES)
+    assert "dead.example.com" not in tweet
+    assert "https://good.example.com/report" in tweet
+    assert "dropped broken link https://dead.example.com/y" in fixes
+    assert "added a link from the research" in fixes
+
+
+def test_hashtags_are_merged_with_the_topic_list():
+    tweet, fixes = tweets.finalize("Qubits explained https://good.example.com/a #Qubits", "quantum computing", NOTES)
+    low, high = checks.TWEET_HASHTAGS
+    assert low <= len(checks.hashtags(tweet)) <= high
+    assert checks.hashtags(tweet)[0] == "#Qubits"
+    assert any(fix.startswith("hashtags merged") for fix in fixes)
+
+
+def test_numbers_are_not_taken_for_hashtags():
+    tweet, _ = tweets.finalize("The #1 reason to learn qubits https://good.example.com/a", "quantum computing", NOTES)
+    assert "The #1 reason" in tweet
+    assert "#1" not in checks.hashtags(tweet)
+
+
+def test_hashtag_shortfall_is_reported():
+    tweet, fixes = tweets.finalize("Go https://good.example.com/a", "robotics", "")
+    assert checks.hashtags(tweet) == ["#Robotics"]
+    assert "found only 1 of the 3 hashtags wanted" in fixes
+
+
+def test_long_tweets_are_cut_to_the_limit():
+    tweet, fixes = tweets.finalize("word " * 100 + "https://good.example.com/a", "quantum computing", NOTES)
+    assert len(tweet) <= checks.TWEET_MAX_CHARS
+    assert "https://good.example.com/a" in tweet
+    assert f"shortened to {checks.TWEET_MAX_CHARS} characters" in fixes
+
+
+def test_hashtags_and_link_give_way_to_the_text():
+    link = "https://good.example.com/" + "a" * 200
+    tweet, fixes = tweets.finalize("word " * 100 + link, "quantum computing", NOTES)
+    assert len(tweet) <= checks.TWEET_MAX_CHARS
+    assert tweet.startswith("word word")
+    assert link in tweet
+    assert checks.hashtags(tweet) == []
+
+    link = "https://good.example.com/" + "a" * 300
+    tweet, fixes = tweets.finalize("word " * 100 + link, "quantum computing", NOTES)
+    assert len(tweet) <= checks.TWEET_MAX_CHARS
+    assert link not in tweet
+    assert f"dropped link {link}, too long to fit" in fixes
+
+
+def test_merged_hashtag_count_is_what_the_tweet_keeps():
+    tweet, fixes = tweets.finalize("word " * 100 + "https://good.example.com/a #Qubits", "quantum computing", NOTES)
+    low, _ = checks.TWEET_HASHTAGS
+    assert len(checks.hashtags(tweet)) == low
+    assert f"hashtags merged (1 written, {low} used)" in fixes